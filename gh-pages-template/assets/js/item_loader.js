@@ -226,6 +226,13 @@ let types_dict = {
  */
 let content_section_ids = Object.values(types_dict).map(type_config => type_config['section_id'])
 
+/**
+ * Maximum number of titles scored with the Levenshtein distance for a search.
+ *
+ * @type {number}
+ */
+let search_candidate_limit = 200
+
 /**
  * Currently selected theme category.
  *
@@ -334,22 +341,24 @@ let set_content_sections_hidden = function (hidden) {
 
 
 /**
- * Fetch the page count for a database category.
+ * Fetch the page file names for a database category.
+ *
+ * Page numbers stay with a range of titles between updates, so the display order comes from the `pages.json` buckets.
  *
  * @param {string} type Database category key from `types_dict`.
- * @returns {number} Total available pages.
+ * @returns {string[]} Page file names, in display order.
  */
-let load_total_pages = function (type) {
-    let total_pages = 1
+let load_page_files = function (type) {
+    let page_files = []
     request_json({
         async: false,
         url: `${types_dict[type]['base_url']}pages.json`,
         success: function (result) {
-            total_pages = result['pages']
+            page_files = result['buckets'].map(bucket => `all_page_${bucket['page']}.json`)
         }
     })
 
-    return total_pages
+    return page_files
 }
 
 
@@ -358,11 +367,11 @@ let load_total_pages = function (type) {
  *
  * @param {string} type Database category key from `types_dict`.
  * @param {HTMLElement} item_type_container Container that receives item cards.
- * @param {number} total_pages Total available pages.
+ * @param {string[]} page_files Page file names, in display order.
  * @returns {void}
  */
-let append_load_more_controls = function (type, item_type_container, total_pages) {
-    let page = 1
+let append_load_more_controls = function (type, item_type_container, page_files) {
+    let page = 0
 
     let load_more_button_container = document.createElement("div")
     load_more_button_container.className = "d-flex justify-content-center"
@@ -391,9 +400,9 @@ let append_load_more_controls = function (type, item_type_container, total_pages
     })
 
     load_more_button.addEventListener("click", function() {
-        if (page <= total_pages) {
+        if (page < page_files.length) {
             request_json({
-                url: `${types_dict[type]['base_url']}all_page_${page}.json`,
+                url: `${types_dict[type]['base_url']}${page_files[page]}`,
                 success: function (result) {
                     populate_results(type, result, item_type_container)
                 },
@@ -401,7 +410,7 @@ let append_load_more_controls = function (type, item_type_container, total_pages
 
             page += 1
         }
-        if (page > total_pages) {
+        if (page >= page_files.length) {
             load_more_button.classList.add("d-none")
             load_more_button.disabled = true
         }
@@ -424,11 +433,11 @@ let initialize_type_loader = function (type) {
 
     types_dict[type]['initialized'] = true
 
-    let total_pages = load_total_pages(type)
+    let page_files = load_page_files(type)
     let item_type_container = document.createElement("div")
     types_dict[type]['container'].appendChild(item_type_container)
 
-    append_load_more_controls(type, item_type_container, total_pages)
+    append_load_more_controls(type, item_type_container, page_files)
 }
 
 
@@ -676,7 +685,7 @@ let get_search_form_data = function () {
 
 
 /**
- * Load and cache all searchable items for a database category.
+ * Load and cache all searchable items for a database category from its index.
  *
  * @param {string} type Database category key from `types_dict`.
  * @returns {void}
@@ -686,26 +695,92 @@ let load_search_items = function (type) {
         return
     }
 
-    let page = 1
-    let total_pages = load_total_pages(type)
-
-    while (page <= total_pages) {
-        request_json({
-            async: false,
-            url: `${types_dict[type]['base_url']}all_page_${page}.json`,
-            success: function (result) {
-                for (let item of result) {
-                    types_dict[type]['all_search_items'].push(item)
-                }
+    // the index holds every item of the category, so searching only needs one request
+    request_json({
+        async: false,
+        url: `${types_dict[type]['base_url']}all_index.json`,
+        success: function (result) {
+            for (let row of result['items']) {
+                let item = {}
+                result['fields'].forEach(function (field, index) {
+                    item[field] = row[index]
+                })
+                types_dict[type]['all_search_items'].push(item)
             }
-        })
-        page += 1
+        }
+    })
+    request_json({
+        async: false,
+        url: `${types_dict[type]['base_url']}search_index.json`,
+        success: function (result) {
+            types_dict[type]['search_index'] = result
+        }
+    })
+}
+
+
+/**
+ * Normalize a search term the same way the daily update normalizes indexed titles.
+ *
+ * @param {string} text Text to normalize.
+ * @returns {string} Lowercase text without accents, with punctuation runs replaced by a single space.
+ */
+let normalize_search_text = function (text) {
+    return text.normalize("NFKD").toLowerCase().replaceAll(/\p{M}/gu, "").replaceAll(/[^\p{L}\p{N}]+/gu, " ").trim()
+}
+
+
+/**
+ * Return the trigrams of normalized text, padded with a space like the indexed titles.
+ *
+ * @param {string} text Normalized text.
+ * @returns {Set<string>} Distinct trigrams.
+ */
+let get_search_trigrams = function (text) {
+    let padded = ` ${text} `
+    let trigrams = new Set()
+    for (let index = 0; index < padded.length - 2; index++) {
+        trigrams.add(padded.slice(index, index + 3))
+    }
+
+    return trigrams
+}
+
+
+/**
+ * Select the indexed titles that share the most trigrams with a search term.
+ *
+ * Every title is a candidate when the term shares no trigram with any title, like very short terms, so those
+ * searches are scored the same way as before the search index existed.
+ *
+ * @param {string} type Database category key from `types_dict`.
+ * @param {string} search_term Normalized search text.
+ * @returns {number[]} Index positions of the candidates, best matches first.
+ */
+let get_search_candidates = function (type, search_term) {
+    let trigram_postings = types_dict[type]['search_index']['trigrams']
+    let hits = new Map()
+    for (let trigram of get_search_trigrams(search_term)) {
+        // postings are delta encoded positions
+        let position = 0
+        for (let delta of trigram_postings[trigram] || []) {
+            position += delta
+            hits.set(position, (hits.get(position) || 0) + 1)
+        }
     }
+
+    if (hits.size === 0) {
+        return types_dict[type]['search_index']['titles'].map((title, position) => position)
+    }
+
+    return Array.from(hits.keys())
+        .sort((a, b) => hits.get(b) - hits.get(a) || a - b)
+        .slice(0, search_candidate_limit)
 }
 
 
 /**
- * Score cached items against a search term.
+ * Score the search candidates of a category against a search term.
  *
  * @param {string} type Database category key from `types_dict`.
  * @param {string} search_term Search text.
@@ -713,9 +788,11 @@ let load_search_items = function (type) {
  */
 let get_search_results = function (type, search_term) {
     let result = []
-    let normalized_search_term = search_term.toLowerCase()
-    for (let item of types_dict[type]['all_search_items']) {
-        item['score'] = globalThis.levenshteinDistance(normalized_search_term, item['title'].toLowerCase())
+    let normalized_search_term = normalize_search_text(search_term)
+    let titles = types_dict[type]['search_index']['titles']
+    for (let position of get_search_candidates(type, normalized_search_term)) {
+        let item = types_dict[type]['all_search_items'][position]
+        item['score'] = globalThis.levenshteinDistance(normalized_search_term, titles[position])
         if (item['score'] >= 40) {
             result.push(item)
         }
@@ -794,14 +871,17 @@ globalThis.themerrItemLoader = {
     content_section_ids,
     get_active_type,
     get_json_response,
+    get_search_candidates,
     get_search_form_data,
     get_search_results,
+    get_search_trigrams,
     get_type_from_hash,
     get_type_section,
     initialize_theme_type_cards,
     initialize_type_loader,
+    load_page_files,
     load_search_items,
-    load_total_pages,
+    normalize_search_text,
     normalize_theme_type,
     on_document_ready,
     populate_results,
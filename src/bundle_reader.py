@@ -0,0 +1,264 @@
+"""Memory mapped lookups in the per-database item bundles written by the daily update."""
+
+# standard imports
+import json
+import mmap
+import os
+import re
+import struct
+from typing import Iterable, Optional, Union
+
+
+BUNDLE_FILENAME = 'bundle.ndjson'
+BUNDLE_INDEX_FILENAME = 'bundle_index.bin'
+BUNDLE_IMDB_INDEX_FILENAME = 'bundle_imdb_index.bin'
+INDEX_RECORD = struct.Struct('<QQI')  # key, byte offset and length of a bundle line
+INDEX_KEY = struct.Struct('<Q')
+ITEM_ID_PATTERN = re.compile(r'[0-9]+')
+IMDB_ID_PATTERN = re.compile(r'tt([0-9]+)')
+
+
+def _map_file(path: str) -> Union[mmap.mmap, bytes]:
+    """
+    Memory map a file for reading.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+
+    Returns
+    -------
+    Union[mmap.mmap, bytes]
+        Read only memory map of the file. Empty files can not be mapped, so they are returned as empty bytes.
+    """
+    with open(file=path, mode='rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class BundleIndex:
+    """
+    Sorted index of fixed width records, searched in place.
+
+    Only the key of each probed record is unpacked, so a lookup reads ``O(log n)`` keys and nothing else.
+    """
+
+    def __init__(self, data: Union[mmap.mmap, bytes]):
+        """
+        Initialize the index.
+
+        Parameters
+        ----------
+        data : Union[mmap.mmap, bytes]
+            Index records, sorted by key.
+        """
+        self.data = data
+        self.count = len(data) // INDEX_RECORD.size
+
+    def find(self, key: int, lo: int = 0) -> tuple[Optional[tuple[int, int]], int]:
+        """
+        Find the record of a key with a binary search.
+
+        Parameters
+        ----------
+        key : int
+            Key to find.
+        lo : int
+            First record to consider. Batched lookups of ascending keys pass the position of the previous key.
+
+        Returns
+        -------
+        tuple[Optional[tuple[int, int]], int]
+            Offset and length of the bundle line, or ``None`` when the key is missing, and the position of the first
+            record with a key that is not smaller than the key.
+        """
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if INDEX_KEY.unpack_from(self.data, mid * INDEX_RECORD.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < self.count:
+            record_key, offset, length = INDEX_RECORD.unpack_from(self.data, lo * INDEX_RECORD.size)
+            if record_key == key:
+                return (offset, length), lo
+        return None, lo
+
+
+class BundleReader:
+    """
+    Reader for the bundle of one database, such as ``movies`` on the site or ``.cache/bundle/movies`` after an update.
+
+    The bundle and its indexes are memory mapped, so opening a reader does not read them, and each lookup only
+    decodes the bundle line of the item it returns.
+
+    Examples
+    --------
+    >>> with BundleReader(directory='.cache/bundle/movies') as reader:  # doctest: +SKIP
+    ...     reader.get_by_imdb_id(imdb_id='tt0113189')['title']
+    'GoldenEye'
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open the bundle of a database.
+
+        Parameters
+        ----------
+        directory : str
+            Directory that contains the bundle files of a database.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the bundle or its id index does not exist.
+        """
+        self._maps = []
+        self.bundle = self._open(path=os.path.join(directory, BUNDLE_FILENAME))
+        self.index = BundleIndex(data=self._open(path=os.path.join(directory, BUNDLE_INDEX_FILENAME)))
+
+        imdb_index_file = os.path.join(directory, BUNDLE_IMDB_INDEX_FILENAME)
+        self.imdb_index = None
+        if os.path.isfile(imdb_index_file):  # only movies have an IMDb index
+            self.imdb_index = BundleIndex(data=self._open(path=imdb_index_file))
+
+    def _open(self, path: str) -> Union[mmap.mmap, bytes]:
+        """Memory map a bundle file, and keep the map so the reader can close it."""
+        data = _map_file(path=path)
+        self._maps.append(data)
+        return data
+
+    def close(self) -> None:
+        """Close the memory maps of the bundle files."""
+        for data in self._maps:
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self._maps = []
+
+    def __enter__(self) -> 'BundleReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.index.count
+
+    def _decode(self, location: tuple[int, int]) -> dict:
+        """Decode the bundle line at an offset and length."""
+        offset, length = location
+        return json.loads(self.bundle[offset:offset + length])
+
+    @staticmethod
+    def _get_imdb_key(imdb_id: str) -> Optional[int]:
+        """Return the index key of an IMDb id, or ``None`` when it is not a valid IMDb id."""
+        match = IMDB_ID_PATTERN.fullmatch(str(imdb_id))
+        return int(match.group(1)) if match else None
+
+    def _get_many(self, index: Optional[BundleIndex], keys: dict) -> dict:
+        """
+        Look up many keys in one pass over an index.
+
+        Keys are searched in ascending order, and each search starts at the position of the previous key.
+
+        Parameters
+        ----------
+        index : Optional[BundleIndex]
+            Index to search.
+        keys : dict
+            Requested ids, by index key.
+
+        Returns
+        -------
+        dict
+            Items by requested id. Missing items are left out.
+        """
+        items = {}
+        if index is None:
+            return items
+
+        lo = 0
+        for key in sorted(keys):
+            location, lo = index.find(key=key, lo=lo)
+            if location is not None:
+                item = self._decode(location=location)
+                for requested_id in keys[key]:
+                    items[requested_id] = item
+        return items
+
+    def get(self, item_id: Union[int, str]) -> Optional[dict]:
+        """
+        Return the item with an id.
+
+        Parameters
+        ----------
+        item_id : Union[int, str]
+            Provider id of the item.
+
+        Returns
+        -------
+        Optional[dict]
+            Item data, or ``None`` when the item is not in the bundle.
+        """
+        return self.get_many(item_ids=[item_id]).get(item_id)
+
+    def get_by_imdb_id(self, imdb_id: str) -> Optional[dict]:
+        """
+        Return the movie with an IMDb id.
+
+        Parameters
+        ----------
+        imdb_id : str
+            IMDb id, such as ``tt0113189``.
+
+        Returns
+        -------
+        Optional[dict]
+            Item data, or ``None`` when the movie is not in the bundle or the bundle has no IMDb index.
+        """
+        return self.get_many_by_imdb_id(imdb_ids=[imdb_id]).get(imdb_id)
+
+    def get_many(self, item_ids: Iterable[Union[int, str]]) -> dict:
+        """
+        Return the items with many ids in one call.
+
+        Parameters
+        ----------
+        item_ids : Iterable[Union[int, str]]
+            Provider ids of the items.
+
+        Returns
+        -------
+        dict
+            Item data by requested id. Ids that are missing or not numeric are left out.
+        """
+        keys = {}
+        for item_id in item_ids:
+            if ITEM_ID_PATTERN.fullmatch(str(item_id)):
+                keys.setdefault(int(item_id), []).append(item_id)
+        return self._get_many(index=self.index, keys=keys)
+
+    def get_many_by_imdb_id(self, imdb_ids: Iterable[str]) -> dict:
+        """
+        Return the movies with many IMDb ids in one call.
+
+        Parameters
+        ----------
+        imdb_ids : Iterable[str]
+            IMDb ids of the movies.
+
+        Returns
+        -------
+        dict
+            Item data by requested IMDb id. Ids that are missing or not valid IMDb ids are left out.
+        """
+        keys = {}
+        for imdb_id in imdb_ids:
+            key = self._get_imdb_key(imdb_id=imdb_id)
+            if key is not None:
+                keys.setdefault(key, []).append(imdb_id)
+        return self._get_many(index=self.imdb_index, keys=keys)
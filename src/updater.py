@@ -1,21 +1,34 @@
 # standard imports
 import argparse
+from array import array
 import base64
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import copy
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+from itertools import chain
+import gzip
+import hashlib
 from html import escape
+import http.cookiejar
+import io
 import json
-from operator import itemgetter
 import os
 from queue import Queue
 import re
+import struct
 import sys
+import tempfile
 import threading
 import time
 from typing import Callable, Optional, Union
 from threading import Lock
-from urllib.parse import quote
+import unicodedata
+from urllib.parse import quote, urlencode
 
 # lib imports
 from googleapiclient.discovery import build
@@ -23,20 +36,28 @@ from googleapiclient.errors import HttpError
 from igdb.wrapper import IGDBWrapper
 import isodate
 import requests
-import matplotlib
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from requests.adapters import HTTPAdapter, Retry
+import numpy as np
+
+# optional imports
+try:
+    import brotli
+except ImportError:  # brotli siblings are only written when the package is installed
+    brotli = None
 
 # load env
 from dotenv import load_dotenv
 load_dotenv()
 
-# setup matplotlib
-matplotlib.use('Agg')
-
 # args placeholder
 args = None
 
+# matplotlib lock
+matplotlib_lock = Lock()
+
+# change feed lock, queue workers append remove events concurrently
+change_feed_lock = Lock()
+
 # databases
 databases = {
     'game': {
@@ -84,6 +105,12 @@ databases = {
         'title': 'Movies',
         'type': 'movie',
         'api_endpoint': 'movie',
+        'changes_endpoint': 'movie/changes',
+        'volatile_fields': {
+            'popularity': 'metrics',
+            'vote_average': 'metrics',
+            'vote_count': 'metrics',
+        },
     },
     'movie_collection': {
         'all_items': [],
@@ -91,6 +118,11 @@ databases = {
         'title': 'Movie Collections',
         'type': 'movie_collection',
         'api_endpoint': 'collection',
+        'volatile_fields': {
+            'parts.popularity': 'exclude',
+            'parts.vote_average': 'exclude',
+            'parts.vote_count': 'exclude',
+        },
     },
     'tv_show': {
         'all_items': [],
@@ -98,9 +130,22 @@ databases = {
         'title': 'TV Shows',
         'type': 'tv_show',
         'api_endpoint': 'tv',
+        'changes_endpoint': 'tv/changes',
+        'volatile_fields': {
+            'popularity': 'metrics',
+            'vote_average': 'metrics',
+            'vote_count': 'metrics',
+        },
     },
 }
 imdb_path = os.path.join('database', 'movies', 'imdb')
+daily_update_state_file = os.path.join('database', 'daily_update.json')
+# the response cache is kept between runs by the workflow cache, outside of the database branch
+response_cache_file = os.path.join('.cache', 'response_cache.json')
+legacy_response_cache_file = os.path.join('database', 'response_cache.json')
+compression_manifest_file = os.path.join('database', 'compression_manifest.json')
+# the bundles are only published with the site, and kept between runs by the workflow cache
+bundle_path = os.path.join('.cache', 'bundle')
 
 AVATAR_SIZE = 96
 TOP_CONTRIBUTORS_LIMIT = 5
@@ -185,6 +230,67 @@ DEPRECATED_CONTRIBUTOR_IMAGE_OUTPUTS = tuple(
     os.path.join(category, TOP_CONTRIBUTORS_FILENAME)
     for category in CONTRIBUTOR_CATEGORIES
 )
+PLOT_RENDERERS = ('svg', 'matplotlib')
+PLOT_WIDTH = 720
+PLOT_HEIGHT = 288
+PLOT_MARGINS = (40, 24, 72, 72)  # top, right, bottom, left
+PLOT_MAX_DATE_TICKS = 8
+PLOT_MAX_VALUE_TICKS = 6
+PLOT_DATE_TICK_DAYS = (1, 2, 7, 14)
+PLOT_DATE_TICK_MONTHS = (1, 2, 3, 6, 12, 24, 60, 120)
+PLOT_LINE_COLOR = '#1f77b4'
+PLOT_TEXT_COLOR = '#777'
+PLOT_GRID_COLOR = '#404040'
+OUTPUT_STAGE_WORKERS = 8
+DEFAULT_ITEMS_MEMORY_CAP_MIB = 256  # collected items of a database above this estimate are spilled to disk
+ITEM_ROW_OVERHEAD = 24  # bytes of column slots for each collected item
+ITEM_DETAILS_OVERHEAD = 160  # bytes of dictionary slots and tuples of the details collected for each item
+SPILL_BATCH_FRACTION = 8  # collected items are spilled in batches of at least this fraction of the memory cap
+SPILL_READ_SIZE = 1024 * 1024  # bytes of spilled items read back at a time
+PAGE_TARGET_SIZE = 10  # items per page when a page is created or split
+PAGE_MIN_SIZE = 5  # smaller pages are merged into the previous page
+PAGE_MAX_SIZE = 20  # larger pages are split
+PAGE_FILE_PATTERN = re.compile(r'all_page_(\d+)\.json')
+INDEX_FILENAME = 'all_index.json'
+INDEX_FIELDS = ('id', 'title', 'year', 'imdb_id', 'youtube_id')
+SEARCH_INDEX_FILENAME = 'search_index.json'
+MANIFEST_FILENAME = 'manifest.json'
+THEMES_FILENAME = 'themes.json'
+THEMES_FIELDS = ('id', 'imdb_id', 'youtube_id', 'edited')
+BUNDLE_FILENAME = 'bundle.ndjson'
+BUNDLE_INDEX_FILENAME = 'bundle_index.bin'
+BUNDLE_IMDB_INDEX_FILENAME = 'bundle_imdb_index.bin'
+BUNDLE_INDEX_RECORD = struct.Struct('<QQI')  # key, byte offset and length of a bundle line
+BUNDLE_MANIFEST_HASH_FILENAME = 'bundle_manifest.sha256'
+COMPRESSED_EXTENSIONS = ('.json', '.svg')  # output files that get precompressed siblings
+COMPRESSED_SUFFIXES = ('gz', 'br')  # sibling suffixes, removed with their file even when brotli is not installed
+GZIP_COMPRESSION_LEVEL = 9
+BROTLI_COMPRESSION_QUALITY = 9  # the maximum quality is too slow for a full refresh of every item file
+SEARCH_SEPARATOR_PATTERN = re.compile(r'[\W_]+')
+CHANGES_DIRNAME = 'changes'
+CHANGE_FEED_PENDING_DIRNAME = 'pending'  # events of each run, merged into the daily files by the daily update
+CHANGE_FEED_DAY_PATTERN = re.compile(r'(\d{4}-\d{2})-\d{2}\.jsonl')
+YOUTUBE_VIDEO_ID_PATTERN = re.compile(r'(?:youtube\.com/(?:watch\?v=|embed/|v/)|youtu\.be/)([a-zA-Z0-9_-]{11})')
+IGDB_BATCH_SIZE = 500  # maximum results per IGDB query
+TMDB_API_URL = 'https://api.themoviedb.org/3'
+PROVIDER_CONCURRENCY = {  # concurrent items per metadata provider, sized to each provider's rate limit
+    'igdb': 4,
+    'tmdb': 40,
+}
+TMDB_CHANGES_MAX_DAYS = 14  # TMDB change lists only accept a 14 day window
+DEFAULT_FULL_REFRESH_DAYS = 7
+HTTP_HOST_POLICIES = {  # per host (connect timeout, read timeout, connection retries)
+    'api.github.com': (5, 15, 2),
+    'api.igdb.com': (5, 30, 2),
+    'api.themoviedb.org': (5, 30, 2),
+    'avatars.githubusercontent.com': (5, 15, 2),
+    'id.twitch.tv': (5, 15, 2),
+}
+DEFAULT_HTTP_HOST_POLICY = (5, 30, 1)
+RESPONSE_CACHE_VERSION = 2  # bump when the response cache format changes
+RESPONSE_CACHE_MAX_ENTRIES = 100000
+RATE_LIMIT_STATUSES = (429, 503)  # statuses that mean the provider is throttling requests
+RATE_LIMIT_MAX_DELAY = 60  # longest server-given delay that is honored, in seconds
 DATABASE_URL_PATTERNS = {
     'game': r'https://www\.igdb\.com/games/(.+)/*.*',
     'game_collection': r'https://www\.igdb\.com/collections/(.+)/*.*',
@@ -194,9 +300,6 @@ DATABASE_URL_PATTERNS = {
     'tv_show': r'https://www\.themoviedb\.org/tv/(\d+)-*.*',
 }
 
-# setup queue
-queue = Queue()
-
 
 @dataclass
 class ContributorProfile:
@@ -215,9 +318,14 @@ class TopContributor:
 
 
 class RateLimiter:
-    """Rate limiter to control API request frequency."""
+    """
+    Token bucket rate limiter to control API request frequency.
+
+    Tokens refill at ``max_requests_per_second`` up to ``burst`` tokens. Callers reserve their tokens under the lock
+    and sleep outside it, so waiting threads do not serialize behind a sleeping lock holder.
+    """
 
-    def __init__(self, max_requests_per_second: float):
+    def __init__(self, max_requests_per_second: float, burst: int = 1, recovery_step: float = 1.0):
         """
         Initialize rate limiter.
 
@@ -225,27 +333,777 @@ class RateLimiter:
         ----------
         max_requests_per_second : float
             Maximum number of requests allowed per second.
+        burst : int
+            Maximum number of requests allowed at once after the limiter has been idle.
+        recovery_step : float
+            Requests per second added back for each healthy response after the limiter was throttled.
         """
+        self.base_requests_per_second = max_requests_per_second
+        self.min_requests_per_second = max_requests_per_second / 8
+        self.recovery_step = recovery_step
         self.max_requests_per_second = max_requests_per_second
         self.min_interval = 1.0 / max_requests_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill_time = 0.0
         self.last_request_time = 0
         self.lock = Lock()
 
-    def wait(self):
-        """Wait if necessary to maintain rate limit."""
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill. Must be called with the lock held."""
+        elapsed = now - self.last_refill_time
+        self.tokens = min(self.burst, self.tokens + elapsed * self.max_requests_per_second)
+        self.last_refill_time = now
+
+    def _set_rate(self, max_requests_per_second: float) -> None:
+        """Change the request rate. Must be called with the lock held."""
+        self._refill(now=time.time())
+        self.max_requests_per_second = max_requests_per_second
+        self.min_interval = 1.0 / max_requests_per_second
+
+    def _reserve(self, cost: float) -> float:
+        """
+        Reserve tokens for a request.
+
+        Parameters
+        ----------
+        cost : float
+            Number of tokens used by the request.
+
+        Returns
+        -------
+        float
+            Seconds to wait before the request may be made.
+        """
         with self.lock:
             now = time.time()
-            time_since_last = now - self.last_request_time
-            if time_since_last < self.min_interval:
-                time.sleep(self.min_interval - time_since_last)
-            self.last_request_time = time.time()
+            self._refill(now=now)
+
+            # a negative balance is owed by requests that already hold a reservation
+            self.tokens -= cost
+            delay = max(0.0, -self.tokens * self.min_interval)
+            self.last_request_time = now + delay
+        return delay
+
+    def hold(self, delay: float) -> None:
+        """
+        Hold off every request for a delay, without changing the request rate.
+
+        Parameters
+        ----------
+        delay : float
+            Seconds until the next request may be made.
+        """
+        with self.lock:
+            self._refill(now=time.time())
+            # owe enough tokens that the next request is reserved after the delay
+            self.tokens = min(self.tokens, 1 - delay * self.max_requests_per_second)
+
+    def throttle(self, delay: Optional[float] = None) -> None:
+        """
+        Halve the request rate after the provider throttled a request.
+
+        Parameters
+        ----------
+        delay : Optional[float]
+            Seconds to hold off every request, usually from the ``Retry-After`` header.
+        """
+        with self.lock:
+            self._set_rate(max(self.min_requests_per_second, self.max_requests_per_second / 2))
+        if delay:
+            self.hold(delay=delay)
+
+    def recover(self) -> None:
+        """Raise the request rate by one step towards the configured rate after a healthy response."""
+        with self.lock:
+            if self.max_requests_per_second < self.base_requests_per_second:
+                self._set_rate(min(self.base_requests_per_second, self.max_requests_per_second + self.recovery_step))
+
+    def wait(self, cost: float = 1):
+        """
+        Wait if necessary to maintain rate limit.
+
+        Parameters
+        ----------
+        cost : float
+            Number of tokens used by the request.
+        """
+        delay = self._reserve(cost=cost)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class QueueLane(Queue):
+    """Scheduling lane for the database items of a single metadata provider."""
+
+    def __init__(self, name: str, worker_count: int, on_item_done: Optional[Callable[[str], None]] = None):
+        """
+        Initialize a scheduling lane.
+
+        Parameters
+        ----------
+        name : str
+            Name of the provider served by the lane.
+        worker_count : int
+            Number of worker threads that process the lane.
+        on_item_done : Optional[Callable[[str], None]]
+            Called with the item type after each item is processed.
+        """
+        super().__init__()
+        self.name = name
+        self.worker_count = worker_count
+        self.on_item_done = on_item_done
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.failed_ids = defaultdict(set)  # ids of the items that were not refreshed, by item type
+        self.metrics_lock = Lock()
+
+    def record(self, item: tuple, seconds: float, failed: bool, refreshed: bool) -> None:
+        """
+        Record a processed item in the lane metrics.
+
+        Parameters
+        ----------
+        item : tuple
+            Processed queue item.
+        seconds : float
+            Time spent processing the item.
+        failed : bool
+            Whether processing the item raised an error.
+        refreshed : bool
+            Whether the item was refreshed from its provider.
+        """
+        with self.metrics_lock:
+            self.processed += 1
+            self.failed += int(failed)
+            self.busy_seconds += seconds
+            if not refreshed:
+                self.failed_ids[item[0]].add(str(item[1]))
+
+    def item_done(self, item_type: str) -> None:
+        """Report a processed item of a database item type."""
+        if self.on_item_done:
+            self.on_item_done(item_type)
+
+
+class ProviderQueue:
+    """
+    Queue that routes database items to a separate lane for each metadata provider.
+
+    The queue also counts the pending items of each database item type, so the outputs of a database can be written as
+    soon as its last item is processed, while items of the other databases are still being refreshed.
+    """
+
+    def __init__(self, concurrency: Optional[dict] = None):
+        """
+        Initialize the provider lanes.
+
+        Parameters
+        ----------
+        concurrency : Optional[dict]
+            Mapping of provider name to lane worker count. Defaults to ``PROVIDER_CONCURRENCY``.
+        """
+        self.lanes = {
+            provider: QueueLane(name=provider, worker_count=worker_count, on_item_done=self.item_done)
+            for provider, worker_count in (concurrency or PROVIDER_CONCURRENCY).items()
+        }
+        self.pending = defaultdict(int)
+        self.closed = set()
+        self.pending_lock = Lock()
+        self.on_complete = None  # called with the item type once every item of that type is processed
+
+    def put(self, item: tuple) -> None:
+        """Add a database item to the lane of its provider."""
+        with self.pending_lock:
+            self.pending[item[0]] += 1
+        self.lanes[_get_item_provider(item_type=item[0])].put(item)
+
+    def item_done(self, item_type: str) -> None:
+        """
+        Record a processed item of a database item type.
+
+        Parameters
+        ----------
+        item_type : str
+            Database item type of the processed item.
+        """
+        with self.pending_lock:
+            self.pending[item_type] -= 1
+            complete = item_type in self.closed and not self.pending[item_type]
+        if complete:
+            self._complete(item_type=item_type)
+
+    def close(self, item_type: str) -> None:
+        """
+        Record that every item of a database item type was queued.
+
+        Parameters
+        ----------
+        item_type : str
+            Database item type that will not receive more items.
+        """
+        with self.pending_lock:
+            self.closed.add(item_type)
+            complete = not self.pending[item_type]
+        if complete:
+            self._complete(item_type=item_type)
+
+    def _complete(self, item_type: str) -> None:
+        """Report that every item of a database item type was processed."""
+        if self.on_complete:
+            self.on_complete(item_type)
+
+    def join(self) -> None:
+        """Block until every lane has processed its items."""
+        for lane in self.lanes.values():
+            lane.join()
+
+    def pop_failed_ids(self) -> dict:
+        """
+        Return the ids of the items that were not refreshed since the last call, and forget them.
+
+        Returns
+        -------
+        dict
+            Mapping of item type to a sorted list of item ids.
+        """
+        failed_ids = defaultdict(set)
+        for lane in self.lanes.values():
+            with lane.metrics_lock:
+                for item_type, item_ids in lane.failed_ids.items():
+                    failed_ids[item_type].update(item_ids)
+                lane.failed_ids.clear()
+        return {item_type: sorted(item_ids) for item_type, item_ids in sorted(failed_ids.items())}
 
 
 # Rate limiters for different APIs
+# no burst: both providers count requests in short windows, so bursting could exceed the limit
 tmdb_limiter = RateLimiter(max_requests_per_second=40)  # TMDB allows 40 requests/second
 igdb_limiter = RateLimiter(max_requests_per_second=4)   # IGDB allows 4 requests/second
 
 
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter with a keep-alive connection pool, a default timeout and a connection retry budget."""
+
+    def __init__(self, pool_size: int, timeout: tuple[float, float], retries: int):
+        """
+        Initialize the adapter.
+
+        Parameters
+        ----------
+        pool_size : int
+            Maximum number of kept-alive connections per host.
+        timeout : tuple[float, float]
+            Connect and read timeout used when a request does not set one.
+        retries : int
+            Number of times a failed connection is retried. Requests that reached the server are not retried.
+        """
+        self.timeout = timeout
+        super().__init__(
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, connect=retries, read=0, status=0, other=0, backoff_factor=0.5),
+        )
+
+    def send(self, request: requests.PreparedRequest, timeout=None, **kwargs) -> requests.Response:
+        """Send a request, applying the adapter's timeout when the request does not set one."""
+        return super().send(request, timeout=timeout or self.timeout, **kwargs)
+
+    def stats(self) -> dict:
+        """
+        Get the connection pool counters of each host.
+
+        Returns
+        -------
+        dict
+            Mapping of host to the number of requests sent and connections opened.
+        """
+        stats = defaultdict(lambda: {'requests': 0, 'connections': 0})
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                stats[pool.host]['requests'] += pool.num_requests
+                stats[pool.host]['connections'] += pool.num_connections
+        return stats
+
+
+class HTTPTransport:
+    """
+    Long-lived HTTP sessions shared by every provider.
+
+    Sessions for all providers share one pooled adapter per host, so keep-alive connections are reused across
+    providers and worker threads. Sessions do not store cookies, and their headers and parameters are never modified
+    after they are created, so requests of one thread never change the requests of another.
+    """
+
+    def __init__(self, pool_size: int):
+        """
+        Initialize the transport.
+
+        Parameters
+        ----------
+        pool_size : int
+            Maximum number of kept-alive connections per host, normally the number of worker threads.
+        """
+        self.pool_size = pool_size
+        self.adapters = {
+            host: PooledHTTPAdapter(pool_size=pool_size, timeout=(connect, read), retries=retries)
+            for host, (connect, read, retries) in HTTP_HOST_POLICIES.items()
+        }
+        connect, read, retries = DEFAULT_HTTP_HOST_POLICY
+        self.default_adapter = PooledHTTPAdapter(pool_size=pool_size, timeout=(connect, read), retries=retries)
+        self.sessions = {}
+        self.lock = Lock()
+
+    def session(self, name: str, headers: Optional[dict] = None, params: Optional[dict] = None) -> requests.Session:
+        """
+        Get the shared session of a provider, creating it on first use.
+
+        Parameters
+        ----------
+        name : str
+            Name of the provider.
+        headers : Optional[dict]
+            Headers sent with every request of the session.
+        params : Optional[dict]
+            Query parameters sent with every request of the session.
+
+        Returns
+        -------
+        requests.Session
+            Shared session. A different session is returned when the headers or parameters change.
+        """
+        key = (name, tuple(sorted((headers or {}).items())), tuple(sorted((params or {}).items())))
+        with self.lock:
+            if key not in self.sessions:
+                session = requests.Session()
+                # no provider needs cookies, and a shared cookie jar would change with every response
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                session.headers.update(headers or {})
+                session.params.update(params or {})
+                session.mount('http://', self.default_adapter)
+                session.mount('https://', self.default_adapter)
+                for host, adapter in self.adapters.items():
+                    session.mount(f'https://{host}/', adapter)
+                self.sessions[key] = session
+            return self.sessions[key]
+
+    def stats(self) -> dict:
+        """
+        Get the connection reuse counters of each host.
+
+        Returns
+        -------
+        dict
+            Mapping of host to the number of requests sent, connections opened and requests on reused connections.
+        """
+        stats = {}
+        for adapter in (*self.adapters.values(), self.default_adapter):
+            for host, counts in adapter.stats().items():
+                stats[host] = {**counts, 'reused': counts['requests'] - counts['connections']}
+        return dict(sorted(stats.items()))
+
+    def print_stats(self) -> None:
+        """Print the connection reuse counters of each host."""
+        for host, counts in self.stats().items():
+            print(f'{host}: {counts["requests"]} requests on {counts["connections"]} connections '
+                  f'({counts["reused"]} reused)')
+
+
+class OutputWriter:
+    """
+    Writer that only replaces output files when their content changed.
+
+    Content is serialized in memory and compared with the existing file. Changed files are written to a temporary
+    file and renamed over the original, so readers never see a partially written file.
+
+    When compression is enabled, JSON and SVG files also get ``.gz`` siblings, and ``.br`` siblings when brotli is
+    installed, so mirrors and the static host can serve precompressed content. Siblings are only compressed again when
+    their file changed, and their sizes are recorded in a manifest.
+    """
+
+    def __init__(self, compress: bool = False, manifest_path: Optional[str] = None):
+        """
+        Initialize the writer.
+
+        Parameters
+        ----------
+        compress : bool
+            Whether to write compressed siblings of JSON and SVG files.
+        manifest_path : Optional[str]
+            Path of the compressed size manifest. Manifest paths are relative to its directory.
+        """
+        self.written = 0
+        self.skipped = 0
+        self.compressed = 0
+        self.removed = 0
+        self.compress = compress
+        self.manifest_path = manifest_path
+        self.manifest = {}
+        self.lock = Lock()
+
+    @staticmethod
+    def _is_unchanged(path: str, data: bytes) -> bool:
+        """Return whether a file already has the given content."""
+        try:
+            if os.path.getsize(path) != len(data):
+                return False
+            with open(file=path, mode='rb') as existing_f:
+                return existing_f.read() == data
+        except OSError:
+            return False
+
+    @staticmethod
+    def _replace(path: str, data: bytes) -> None:
+        """Atomically replace a file with new content."""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(name=directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, mode='wb') as temp_f:
+                temp_f.write(data)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def get_compressors() -> dict:
+        """Return the available compressors, by file suffix."""
+        compressors = {
+            # no timestamp in the gzip header, so the compressed file only changes with the content
+            'gz': partial(gzip.compress, compresslevel=GZIP_COMPRESSION_LEVEL, mtime=0),
+        }
+        if brotli is not None:
+            compressors['br'] = partial(brotli.compress, quality=BROTLI_COMPRESSION_QUALITY)
+        return compressors
+
+    def write(self, path: str, content: Union[str, bytes], compress: Optional[bool] = None) -> bool:
+        """
+        Write a file if its content changed.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+        content : Union[str, bytes]
+            New file content. Text is encoded as UTF-8.
+        compress : Optional[bool]
+            Whether to write compressed siblings. Defaults to the writer setting for JSON and SVG files.
+
+        Returns
+        -------
+        bool
+            Whether the file was written.
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        changed = not self._is_unchanged(path=path, data=data)
+        if changed:
+            self._replace(path=path, data=data)
+
+        with self.lock:
+            if changed:
+                self.written += 1
+            else:
+                self.skipped += 1
+
+        if compress is None:
+            compress = self.compress and path.endswith(COMPRESSED_EXTENSIONS)
+        if compress:
+            self._write_compressed(path=path, data=data, changed=changed)
+
+        return changed
+
+    def _write_compressed(self, path: str, data: bytes, changed: bool) -> None:
+        """
+        Write the compressed siblings of a file and record their sizes.
+
+        Compression runs in the writing thread. Files are written by the queue workers and the output stage threads,
+        so siblings are already compressed in parallel.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+        data : bytes
+            File content.
+        changed : bool
+            Whether the file changed. Siblings of unchanged files are only written when they are missing.
+        """
+        sizes = {'size': len(data)}
+        for suffix, compressor in self.get_compressors().items():
+            sibling_path = f'{path}.{suffix}'
+            if changed or not os.path.exists(sibling_path):
+                compressed = compressor(data)
+                self._replace(path=sibling_path, data=compressed)
+                sizes[suffix] = len(compressed)
+                with self.lock:
+                    self.compressed += 1
+            else:
+                sizes[suffix] = os.path.getsize(sibling_path)
+
+        if self.manifest_path:
+            key = os.path.relpath(path, os.path.dirname(self.manifest_path)).replace(os.sep, '/')
+            with self.lock:
+                self.manifest[key] = sizes
+
+    def remove(self, path: str) -> bool:
+        """
+        Remove an output file together with its compressed siblings and its compressed size manifest entry.
+
+        Every removal of a published file goes through the writer, so the static host never keeps serving a
+        precompressed copy of a deleted file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+
+        Returns
+        -------
+        bool
+            Whether the file existed.
+        """
+        existed = False
+        for file_path in [path] + [f'{path}.{suffix}' for suffix in COMPRESSED_SUFFIXES]:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                continue
+            existed = existed or file_path == path
+
+        with self.lock:
+            if existed:
+                self.removed += 1
+            if self.manifest_path:
+                key = os.path.relpath(path, os.path.dirname(self.manifest_path)).replace(os.sep, '/')
+                self.manifest.pop(key, None)
+        return existed
+
+    def load_manifest(self) -> None:
+        """Load the compressed sizes recorded by the previous run, for files that are not written again."""
+        try:
+            with open(file=self.manifest_path, mode='r') as manifest_f:
+                manifest = json.load(fp=manifest_f)
+        except (OSError, TypeError, json.JSONDecodeError):
+            return
+
+        if isinstance(manifest, dict):
+            self.manifest.update(manifest)
+
+    def save_manifest(self) -> None:
+        """Write the compressed size manifest, without entries for files that no longer exist."""
+        if not self.compress or not self.manifest_path:
+            return
+
+        root = os.path.dirname(self.manifest_path)
+        manifest = {
+            key: sizes for key, sizes in sorted(self.manifest.items())
+            if os.path.exists(os.path.join(root, key))
+        }
+        self.write(
+            path=self.manifest_path,
+            # one entry per line, so git diffs of the manifest stay small
+            content=json.dumps(manifest, indent=0, separators=(',', ':'), sort_keys=True),
+            compress=False,
+        )
+
+    def write_json(self, path: str, obj: object, **kwargs) -> bool:
+        """
+        Write a JSON file if its content changed.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+        obj : object
+            Object to serialize.
+        **kwargs
+            Keyword arguments for ``json.dumps``.
+
+        Returns
+        -------
+        bool
+            Whether the file was written.
+        """
+        return self.write(path=path, content=json.dumps(obj, **kwargs))
+
+    def print_stats(self) -> None:
+        """Print the number of files written, skipped and removed."""
+        print(f'Output files: {self.written} written and {self.skipped} unchanged, {self.removed} removed')
+        if self.compress:
+            print(f'Compressed files: {self.compressed} written with {", ".join(self.get_compressors())}')
+
+
+class ResponseCache:
+    """
+    On-disk cache of provider response validators and body hashes.
+
+    Entries are written sorted by key, so the file only changes where responses do. Each entry records the run in
+    which it was last used, and the least recently used entries are evicted once the cache is full.
+
+    Changed responses are only stored once the item files that hold them are written, so a failed write never makes
+    a later run skip the item as unchanged.
+    """
+
+    def __init__(self, path: str, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        """
+        Initialize the response cache.
+
+        Parameters
+        ----------
+        path : str
+            Path of the cache file.
+        max_entries : int
+            Maximum number of cached responses.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = {}
+        self.pending = {}
+        self.run = 1
+        self.unchanged = 0
+        self.changed = 0
+        self.lock = Lock()
+
+    def load(self) -> None:
+        """Load the cache file, ignoring files that are missing, invalid or written in another format version."""
+        try:
+            with open(file=self.path, mode='r') as cache_f:
+                data = json.load(fp=cache_f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print_github_warning(f'Ignoring unreadable response cache {self.path}: {e}')
+            return
+
+        if not isinstance(data, dict) or data.get('version') != RESPONSE_CACHE_VERSION:
+            print_github_warning(f'Ignoring response cache {self.path} with an unsupported format version')
+            return
+
+        with self.lock:
+            self.entries = data.get('entries', {})
+            self.run = data.get('run', 0) + 1
+            self._evict()
+
+    def save(self) -> None:
+        """Write the cache file."""
+        with self.lock:
+            self._evict()
+            data = {'version': RESPONSE_CACHE_VERSION, 'run': self.run, 'entries': self.entries}
+        # the cache is not published, so it is never compressed
+        output_writer.write(
+            path=self.path,
+            content=json.dumps(data, separators=(',', ':'), sort_keys=True),
+            compress=False,
+        )
+
+    def get(self, key: str) -> dict:
+        """
+        Get a cached response and mark it as used in this run.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the response.
+
+        Returns
+        -------
+        dict
+            Cached validators and body hash, or an empty dictionary when the response is not cached.
+        """
+        with self.lock:
+            if key not in self.entries:
+                return {}
+            self.entries[key]['used'] = self.run
+            return dict(self.entries[key])
+
+    def not_modified(self, key: str) -> None:
+        """
+        Record that the provider reported a cached response as not modified.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the response.
+        """
+        with self.lock:
+            self.unchanged += 1
+            if key in self.entries:
+                self.entries[key]['used'] = self.run
+
+    def update(self, key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> bool:
+        """
+        Store a response.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the response.
+        body : bytes
+            Response body, or the part of it that is stored in the database.
+        etag : Optional[str]
+            ``ETag`` validator of the response.
+        last_modified : Optional[str]
+            ``Last-Modified`` validator of the response.
+
+        Returns
+        -------
+        bool
+            Whether the body is identical to the cached response. Changed responses are kept aside until ``commit``.
+        """
+        entry = {'body_hash': hashlib.sha256(body).hexdigest(), 'used': self.run}
+        if etag:
+            entry['etag'] = etag
+        if last_modified:
+            entry['last_modified'] = last_modified
+
+        with self.lock:
+            unchanged = self.entries.get(key, {}).get('body_hash') == entry['body_hash']
+            if unchanged:
+                self.entries[key] = entry
+                self.unchanged += 1
+            else:
+                self.pending[key] = entry
+                self.changed += 1
+        return unchanged
+
+    def commit(self, key: str) -> None:
+        """
+        Store a changed response once the item files that hold it are written.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the response.
+        """
+        with self.lock:
+            entry = self.pending.pop(key, None)
+            if entry is not None:
+                self.entries[key] = entry
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries over the size cap. Must be called with the lock held."""
+        excess = len(self.entries) - self.max_entries
+        if excess <= 0:
+            return
+        for key in sorted(self.entries, key=lambda k: (self.entries[k].get('used', 0), k))[:excess]:
+            del self.entries[key]
+
+
+# setup queue
+queue = ProviderQueue()
+worker_queue = None  # queue served by the started worker threads
+
+# shared HTTP transport, with a kept-alive connection for every worker thread
+transport = HTTPTransport(pool_size=sum(PROVIDER_CONCURRENCY.values()))
+youtube_services = threading.local()  # YouTube API clients are not thread safe, so each thread builds its own
+response_cache = None  # provider response cache, only used by daily updates
+output_writer = OutputWriter()
+
+
 def print_github_warning(message: str) -> None:
     """
     Print a warning message.
@@ -282,24 +1140,23 @@ def print_github_error(message: str) -> None:
 
 def create_github_session() -> requests.Session:
     """
-    Create a GitHub API session.
+    Get the shared GitHub API session.
 
     Returns
     -------
     requests.Session
         Session configured with GitHub headers and an optional token.
     """
-    session = requests.Session()
-    session.headers.update({
+    headers = {
         'Accept': 'application/vnd.github+json',
         'User-Agent': 'ThemerrDB contributor image generator',
-    })
+    }
 
     token = os.environ.get('GITHUB_TOKEN')
     if token:
-        session.headers.update({'Authorization': f'Bearer {token}'})
+        headers['Authorization'] = f'Bearer {token}'
 
-    return session
+    return transport.session(name='github', headers=headers)
 
 
 def get_contributor_total(contributor: dict) -> int:
@@ -733,9 +1590,7 @@ def remove_deprecated_top_contributor_images(database_root: str) -> None:
         Root directory containing category database folders.
     """
     for output in DEPRECATED_CONTRIBUTOR_IMAGE_OUTPUTS:
-        output_file = os.path.join(database_root, output)
-        if os.path.exists(output_file):
-            os.remove(output_file)
+        output_writer.remove(path=os.path.join(database_root, output))
 
 
 def build_top_contributor_images(
@@ -794,7 +1649,6 @@ def build_top_contributor_images(
         })
 
         output_file = os.path.join(database_root, section['output'])
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
         contributor_json = render_top_contributor_json(
             title=section['title'],
@@ -802,15 +1656,10 @@ def build_top_contributor_images(
             contributors=contributors,
         )
         json_file = os.path.splitext(output_file)[0] + JSON_EXTENSION
-        with open(json_file, 'w', encoding='utf-8') as contributor_f:
-            contributor_f.write(contributor_json)
+        output_writer.write(path=json_file, content=contributor_json)
 
     output_file = os.path.join(database_root, TOP_CONTRIBUTORS_FILENAME)
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-
-    svg = render_top_contributor_svg(sections=sections)
-    with open(output_file, 'w', encoding='utf-8') as contributor_f:
-        contributor_f.write(svg)
+    output_writer.write(path=output_file, content=render_top_contributor_svg(sections=sections))
 
     remove_deprecated_top_contributor_images(database_root=database_root)
 
@@ -856,10 +1705,42 @@ def igdb_authorization(client_id: str, client_secret: str) -> dict:
 
     token_url = 'https://id.twitch.tv/oauth2/token'
 
-    authorization = requests.post(url=token_url, data=auth_headers).json()
+    authorization = transport.session(name='twitch').post(url=token_url, data=auth_headers).json()
     return authorization
 
 
+class PooledIGDBWrapper(IGDBWrapper):
+    """
+    IGDB wrapper that sends requests over the shared HTTP transport.
+
+    The request is built with the private ``_build_url`` and ``_compose_request`` methods of the wrapper, so
+    ``igdb-api-v4`` is pinned, and a unit test fails when the pinned version or these methods change.
+    """
+
+    def api_request(self, endpoint: str, query: str) -> bytes:
+        """
+        Request an IGDB endpoint.
+
+        Parameters
+        ----------
+        endpoint : str
+            IGDB endpoint to query.
+        query : str
+            Apicalypse query.
+
+        Returns
+        -------
+        bytes
+            Raw response body.
+        """
+        response = transport.session(name='igdb').post(
+            IGDBWrapper._build_url(endpoint),
+            **self._compose_request(query),
+        )
+        response.raise_for_status()
+        return response.content
+
+
 wrapper = None
 
 
@@ -871,7 +1752,7 @@ def get_igdb_wrapper() -> IGDBWrapper:
             client_id=os.getenv("TWITCH_CLIENT_ID"),
             client_secret=os.getenv("TWITCH_CLIENT_SECRET")
         )
-        wrapper = IGDBWrapper(client_id=os.getenv("TWITCH_CLIENT_ID"), auth_token=auth.get('access_token'))
+        wrapper = PooledIGDBWrapper(client_id=os.getenv("TWITCH_CLIENT_ID"), auth_token=auth.get('access_token'))
 
     return wrapper
 
@@ -881,24 +1762,31 @@ def requests_loop(url: str,
                   method: Callable = requests.get,
                   max_tries: int = 3,
                   allow_statuses: list = [requests.codes.ok],
-                  no_retry_statuses: list = []) -> requests.Response:
+                  no_retry_statuses: list = [],
+                  limiter: Optional[RateLimiter] = None) -> requests.Response:
+    limiter = limiter or tmdb_limiter
     count = 1
     response = None
     while count <= max_tries:
         print(f'Processing {url} ... (attempt {count} of {max_tries})')
         try:
-            tmdb_limiter.wait()  # Apply TMDB rate limiting
+            limiter.wait()  # Apply provider rate limiting
             response = method(url=url, headers=headers)
         except (requests.exceptions.RequestException, Exception) as e:
             print_github_error(f'Error processing {url} - {e}')
         else:
-            if response.status_code in allow_statuses:
+            if _apply_rate_limit_feedback(limiter=limiter, url=url, response=response, default_delay=2**count):
+                # the limiter holds off every request to the provider, so there is no need to sleep here
+                count += 1
+                continue
+
+            if _is_final_response(
+                    url=url,
+                    response=response,
+                    allow_statuses=allow_statuses,
+                    no_retry_statuses=no_retry_statuses,
+            ):
                 return response
-            elif response.status_code in no_retry_statuses:
-                print_github_error(f'Permanent error for {url} - {response.status_code}, not retrying')
-                return response
-            else:
-                print_github_warning(f'Error processing {url} - {response.status_code}')
 
         time.sleep(2**count)
         count += 1
@@ -906,57 +1794,503 @@ def requests_loop(url: str,
     return response
 
 
-def process_queue() -> None:
-    """
-    Add items to the queue.
-    This is an endless loop to add items to the queue.
-    Examples
-    --------
-    >>> threads = threading.Thread(target=process_queue, daemon=True)
-    ...
+def _get_retry_after(response: requests.Response) -> Optional[float]:
     """
-    while True:
-        item = queue.get()
-        try:
-            queue_handler(item=item)  # process the item from the queue
+    Get the delay requested by a provider's rate limit headers.
+
+    Parameters
+    ----------
+    response : requests.Response
+        Response to inspect.
+
+    Returns
+    -------
+    Optional[float]
+        Seconds to wait before the next request, or ``None`` when the response does not ask for a delay.
+    """
+    headers = getattr(response, 'headers', None) or {}
+    retry_after = headers.get('Retry-After')
+    reset = headers.get('X-RateLimit-Reset') if headers.get('X-RateLimit-Remaining') == '0' else None
+
+    delay = None
+    if isinstance(retry_after, str):
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                print_github_warning(f'Ignoring invalid Retry-After header: {retry_after}')
+    elif isinstance(reset, str):
+        try:
+            delay = float(reset)
+        except ValueError:
+            print_github_warning(f'Ignoring invalid X-RateLimit-Reset header: {reset}')
+        else:
+            if delay > time.time() / 2:
+                delay -= time.time()  # the reset is an epoch timestamp
+
+    if delay is None:
+        return None
+    return min(max(delay, 0.0), RATE_LIMIT_MAX_DELAY)
+
+
+def _apply_rate_limit_feedback(limiter: RateLimiter,
+                               url: str,
+                               response: requests.Response,
+                               default_delay: float) -> bool:
+    """
+    Adjust a provider's rate limiter from a response.
+
+    Throttled responses halve the limiter's rate and hold off requests for the server-given delay, while healthy
+    responses raise the rate back towards the configured rate.
+
+    Parameters
+    ----------
+    limiter : RateLimiter
+        Rate limiter of the provider that sent the response.
+    url : str
+        Requested URL.
+    response : requests.Response
+        Response from the provider.
+    default_delay : float
+        Seconds to hold off requests when a throttled response does not give a delay.
+
+    Returns
+    -------
+    bool
+        Whether the provider throttled the request.
+    """
+    delay = _get_retry_after(response=response)
+    if response.status_code in RATE_LIMIT_STATUSES:
+        delay = default_delay if delay is None else delay
+        print_github_warning(f'Rate limited processing {url} - {response.status_code}, retrying in {delay:.1f}s')
+        limiter.throttle(delay=delay)
+        return True
+
+    if response.status_code < 500:
+        limiter.recover()
+    if delay:
+        limiter.hold(delay=delay)  # the provider reports that the rate limit is used up
+    return False
+
+
+def _is_final_response(url: str, response: requests.Response, allow_statuses: list, no_retry_statuses: list) -> bool:
+    """Return whether a request loop should stop and return the response."""
+    if response.status_code in allow_statuses:
+        return True
+
+    if response.status_code in no_retry_statuses:
+        print_github_error(f'Permanent error for {url} - {response.status_code}, not retrying')
+        return True
+
+    print_github_warning(f'Error processing {url} - {response.status_code}')
+    return False
+
+
+def process_queue(work_queue: Queue) -> None:
+    """
+    Process items from a queue.
+    This is an endless loop to process items from the queue.
+
+    Parameters
+    ----------
+    work_queue : Queue
+        Queue to process. Metrics are recorded when it is a ``QueueLane``.
+
+    Examples
+    --------
+    >>> threads = threading.Thread(target=process_queue, args=(queue.lanes['tmdb'],), daemon=True)
+    ...
+    """
+    while True:
+        item = work_queue.get()
+        started = time.monotonic()
+        failed = False
+        refreshed = False
+        try:
+            refreshed = queue_handler(item=item)  # process the item from the queue
         except BaseException as e:  # NOSONAR(S5754)
             # intentional broad catch: SystemExit (from sys.exit in exception_writer) is a BaseException, not Exception;
             # catching broadly here ensures queue.task_done() is always called and the thread stays alive
+            failed = True
             print_github_error(f'Error processing queue item {item}: {e}')
         finally:
-            queue.task_done()  # always mark the item done, even on failure
+            if isinstance(work_queue, QueueLane):
+                work_queue.record(item=item, seconds=time.monotonic() - started, failed=failed, refreshed=refreshed)
+                work_queue.item_done(item_type=item[0])
+            work_queue.task_done()  # always mark the item done, even on failure
 
 
-def queue_handler(item: tuple) -> None:
-    data = process_item_id(item_type=item[0], item_id=item[1])
-    if not data:
-        return
-    if item[0] == 'movie':
-        databases[item[0]]['all_items'].append({
+class ItemAccumulator:
+    """
+    Compact collection of the items of a database, for the daily update outputs.
+
+    Queue workers append items from many threads, and the items are kept until the database outputs are written.
+    Instead of one dictionary for each item, ids are kept in an integer array and titles in a list of interned strings,
+    so repeated titles are stored once. Iterating yields the same dictionaries that the outputs used to collect.
+
+    When the estimated size of the items in memory, together with the item details that are collected next to them,
+    exceeds the memory cap, the items are moved to a temporary file. The details stay in memory, so once they use most
+    of the cap, items are moved in batches of at least ``1 / SPILL_BATCH_FRACTION`` of the cap.
+    """
+
+    def __init__(self, imdb_ids: bool = False, memory_cap: Optional[int] = None):
+        """
+        Initialize the accumulator.
+
+        Parameters
+        ----------
+        imdb_ids : bool
+            Whether items have an IMDb id. Only movies do.
+        memory_cap : Optional[int]
+            Estimated bytes of items and item details kept in memory before items are spilled to disk. ``None`` keeps
+            every item in memory.
+        """
+        self.imdb_ids = [] if imdb_ids else None
+        self.ids = array('q')
+        self.titles = []
+        self.memory_cap = memory_cap
+        self.memory = 0
+        self.retained = 0
+        self.spilled = 0
+        self.spill_file = None
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return self.spilled + len(self.ids)
+
+    @staticmethod
+    def _get_row_memory(title: str, imdb_id: Optional[str]) -> int:
+        """Return the estimated bytes of an item in the columns."""
+        return ITEM_ROW_OVERHEAD + sys.getsizeof(title) + (sys.getsizeof(imdb_id) if imdb_id else 0)
+
+    def append(self, item: dict) -> None:
+        """
+        Add an item.
+
+        Parameters
+        ----------
+        item : dict
+            Item with an integer ``id``, a ``title`` and, for movies, an ``imdb_id``.
+        """
+        title = sys.intern(item['title'])
+        imdb_id = item.get('imdb_id') if self.imdb_ids is not None else None
+        with self.lock:
+            self.ids.append(item['id'])
+            self.titles.append(title)
+            if self.imdb_ids is not None:
+                self.imdb_ids.append(imdb_id)
+            self.memory += self._get_row_memory(title=title, imdb_id=imdb_id)
+            self._spill_over_cap()
+
+    def retain(self, size: int) -> None:
+        """
+        Count memory that is held for the items outside of the accumulator against the memory cap.
+
+        Parameters
+        ----------
+        size : int
+            Estimated bytes, such as the size of the index details of an item.
+        """
+        with self.lock:
+            self.retained += size
+            self._spill_over_cap()
+
+    def _spill_over_cap(self) -> None:
+        """Spill the items in memory when they exceed their share of the memory cap. The lock must be held."""
+        if self.memory_cap is None:
+            return
+        if self.memory > max(self.memory_cap - self.retained, self.memory_cap // SPILL_BATCH_FRACTION):
+            self._spill()
+
+    @staticmethod
+    def _zip_columns(ids: array, titles: list, imdb_ids: Optional[list]):
+        """Return the columns as rows of id, title and IMDb id."""
+        return zip(ids, titles, imdb_ids if imdb_ids is not None else [None] * len(ids))
+
+    def _spill(self) -> None:
+        """Move the items in memory to the temporary file. The lock must be held."""
+        if self.spill_file is None:
+            # removed by the operating system when it is closed or the process exits
+            self.spill_file = tempfile.TemporaryFile()
+        self.spill_file.seek(0, os.SEEK_END)  # reads move the position of the file
+        self.spill_file.writelines(
+            f'{json.dumps(list(row), separators=(",", ":"))}\n'.encode('utf-8')
+            for row in self._zip_columns(ids=self.ids, titles=self.titles, imdb_ids=self.imdb_ids)
+        )
+        self.spilled += len(self.ids)
+        self.ids = array('q')
+        self.titles = []
+        self.imdb_ids = [] if self.imdb_ids is not None else None
+        self.memory = 0
+
+    def _iter_spilled_rows(self, count: int):
+        """Yield the first rows of the temporary file, reading a batch of lines at a time."""
+        offset = 0
+        while count > 0:
+            with self.lock:
+                self.spill_file.seek(offset)
+                lines = self.spill_file.readlines(SPILL_READ_SIZE)[:count]
+            offset += sum(map(len, lines))
+            count -= len(lines)
+            for line in lines:
+                yield json.loads(line)
+
+    def __iter__(self):
+        """
+        Yield the items in the order they were added, or sorted, as new dictionaries.
+
+        Spilled items are read back lazily. Items added while iterating are not yielded.
+        """
+        with self.lock:
+            spilled = self.spilled
+            # copies of the columns only copy pointers, the titles are shared
+            columns = (self.ids[:], self.titles[:], self.imdb_ids[:] if self.imdb_ids is not None else None)
+
+        for item_id, title, imdb_id in chain(self._iter_spilled_rows(count=spilled), self._zip_columns(*columns)):
+            yield self._build_item(item_id=item_id, title=title, imdb_id=imdb_id)
+
+    def _build_item(self, item_id: int, title: str, imdb_id: Optional[str]) -> dict:
+        """Return the dictionary of an item in its columns."""
+        if self.imdb_ids is not None:
+            return {'id': item_id, 'imdb_id': imdb_id, 'title': sys.intern(title)}
+        return {'id': item_id, 'title': sys.intern(title)}
+
+    def _get_columns(self) -> tuple:
+        """Return copies of the columns for reads by position, which need every item in memory."""
+        with self.lock:
+            if self.spilled:
+                raise RuntimeError('spilled items can only be read by position after the items are sorted')
+            return self.ids[:], self.titles[:], self.imdb_ids[:] if self.imdb_ids is not None else None
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[dict, list]:
+        """
+        Return the item at a position, or a list of the items in a slice, as new dictionaries.
+
+        Positions are only known for items in memory, which are every item once the items are sorted.
+        """
+        ids, titles, imdb_ids = self._get_columns()
+        if isinstance(index, slice):
+            return [
+                self._build_item(item_id=item_id, title=title, imdb_id=imdb_id)
+                for item_id, title, imdb_id in self._zip_columns(
+                    ids=ids[index],
+                    titles=titles[index],
+                    imdb_ids=imdb_ids[index] if imdb_ids is not None else None,
+                )
+            ]
+        return self._build_item(
+            item_id=ids[index],
+            title=titles[index],
+            imdb_id=imdb_ids[index] if imdb_ids is not None else None,
+        )
+
+    def iter_by_id(self):
+        """
+        Yield the items in id order, as new dictionaries.
+
+        Only a permutation of the positions is sorted, so the items are not copied. Like reads by position, this needs
+        every item in memory.
+        """
+        ids, titles, imdb_ids = self._get_columns()
+        for position in sorted(range(len(ids)), key=ids.__getitem__):
+            yield self._build_item(
+                item_id=ids[position],
+                title=titles[position],
+                imdb_id=imdb_ids[position] if imdb_ids is not None else None,
+            )
+
+    def sort(self) -> None:
+        """
+        Sort the items in the order of ``_get_page_sort_key``, by title and then by the text of the id.
+
+        The columns are reordered by a sorted permutation of their positions, so no dictionary or key tuple is built
+        for each item. The outputs need every item, so spilled items are read back into memory first.
+        """
+        with self.lock:
+            ids = array('q')
+            titles = []
+            imdb_ids = [] if self.imdb_ids is not None else None
+            if self.spill_file is not None:
+                self.spill_file.seek(0)
+                for item_id, title, imdb_id in map(json.loads, self.spill_file):
+                    ids.append(item_id)
+                    titles.append(sys.intern(title))
+                    if imdb_ids is not None:
+                        imdb_ids.append(imdb_id)
+                    self.memory += self._get_row_memory(title=title, imdb_id=imdb_id)
+                self._close_spill_file()
+            ids.extend(self.ids)
+            titles.extend(self.titles)
+            if imdb_ids is not None:
+                imdb_ids.extend(self.imdb_ids)
+
+            # two stable sorts, so items with the same title are ordered by id
+            order = sorted(range(len(ids)), key=lambda position: str(ids[position]))
+            order.sort(key=titles.__getitem__)
+
+            self.ids = array('q', (ids[position] for position in order))
+            self.titles = [titles[position] for position in order]
+            if imdb_ids is not None:
+                self.imdb_ids = [imdb_ids[position] for position in order]
+
+    def _close_spill_file(self) -> None:
+        """Close and forget the temporary file. The lock must be held."""
+        if self.spill_file is not None:
+            self.spill_file.close()
+        self.spill_file = None
+        self.spilled = 0
+
+    def close(self) -> None:
+        """Close the temporary file of spilled items. Spilled items are dropped, and the items in memory are kept."""
+        with self.lock:
+            self._close_spill_file()
+
+
+def _append_all_item(item_type: str, data: dict) -> None:
+    """Add a database item to the accumulated daily update page and plot data."""
+    all_items = databases[item_type]['all_items']
+    if item_type == 'movie':
+        all_items.append({
             'id': data['id'],
             'imdb_id': data.get('imdb_id'),  # imdb_id may not always be present
             'title': data['title']
         })
     else:
-        databases[item[0]]['all_items'].append({
+        all_items.append({
             'id': data['id'],
             'title': data['name']  # name is used in all cases except tmdb movies
         })
 
+    # collected while the item is in memory, so the outputs do not read every item file again
+    item_key = str(data['id'])
+    if 'youtube_theme_added' in data:
+        databases[item_type].setdefault('theme_timestamps', []).append(data['youtube_theme_added'])
+    youtube_id = get_youtube_video_id(url=data.get('youtube_theme_url'))
+    databases[item_type].setdefault('index_details', {})[item_key] = (
+        _get_item_year(item_type=item_type, data=data),
+        youtube_id,
+    )
+    edited = data.get('youtube_theme_edited', data.get('youtube_theme_added'))
+    databases[item_type].setdefault('edited_timestamps', {})[item_key] = edited
 
-def start_queue_workers(worker_count: int = 40) -> None:
-    """Start worker threads for processing queued database items."""
-    for _ in range(worker_count):
-        try:
-            worker_thread = threading.Thread(target=process_queue)
-            worker_thread.daemon = True
-            worker_thread.start()
-        except RuntimeError as r_e:
-            print_github_error(f'RuntimeError encountered: {r_e}')
-            break
+    if isinstance(all_items, ItemAccumulator):
+        # the details and the content hash of the item can not be spilled, so they count against the memory cap
+        content_hash = databases[item_type].get('content_hashes', {}).get(item_key)
+        all_items.retain(size=(
+            ITEM_DETAILS_OVERHEAD + sys.getsizeof(item_key) + sys.getsizeof(edited) +
+            (sys.getsizeof(youtube_id) if youtube_id else 0) +
+            (sys.getsizeof(content_hash[0]) if content_hash else 0)
+        ))
+
+
+def _iter_items_by_id(all_items: list):
+    """Yield database items in id order, streamed from an ``ItemAccumulator`` instead of a sorted copy."""
+    if isinstance(all_items, ItemAccumulator):
+        return all_items.iter_by_id()
+    return iter(sorted(all_items, key=lambda x: int(x['id'])))
+
+
+def _get_item_year(item_type: str, data: dict) -> Optional[int]:
+    """Return the release year of a database item, the same year the site shows next to its title."""
+    if item_type == 'game':
+        years = [release['y'] for release in data.get('release_dates') or [] if release.get('y')]
+        return min(years, default=None)
+
+    date_key = {'movie': 'release_date', 'tv_show': 'first_air_date'}.get(item_type)
+    release_date = (data.get(date_key) or '') if date_key else ''
+    return int(release_date[:4]) if release_date[:4].isdigit() else None
+
+
+def queue_handler(item: tuple) -> bool:
+    if len(item) > 2:
+        # metadata was already loaded by a batch request
+        data = _process_batched_item(item_type=item[0], item_id=item[1], json_data=item[2])
+    else:
+        data = process_item_id(item_type=item[0], item_id=item[1])
+    if not data:
+        return False
+    _append_all_item(item_type=item[0], data=data)
+    return True
+
+
+def start_queue_workers(worker_count: Optional[int] = None) -> None:
+    """
+    Start worker threads for processing queued database items.
+
+    Parameters
+    ----------
+    worker_count : Optional[int]
+        Number of worker threads for each provider lane. Defaults to the worker count of each lane.
+    """
+    for lane in queue.lanes.values():
+        for _ in range(worker_count or lane.worker_count):
+            try:
+                worker_thread = threading.Thread(target=process_queue, args=(lane,))
+                worker_thread.daemon = True
+                worker_thread.start()
+            except RuntimeError as r_e:
+                print_github_error(f'RuntimeError encountered: {r_e}')
+                return
+
+
+def _ensure_queue_workers() -> None:
+    """Start the queue worker threads the first time the queue needs them."""
+    global worker_queue
 
+    if worker_queue is not queue:
+        worker_queue = queue
+        start_queue_workers()
 
-start_queue_workers()
+
+def _print_queue_metrics() -> None:
+    """Print the metrics of each queue lane."""
+    for lane in queue.lanes.values():
+        print(f'{lane.name} lane: processed {lane.processed} items ({lane.failed} failed) '
+              f'with {lane.worker_count} workers in {lane.busy_seconds:.1f}s of worker time')
+
+
+def _get_item_provider(item_type: str) -> str:
+    """Return the metadata provider for a database item type."""
+    return 'igdb' if item_type.startswith('game') else 'tmdb'
+
+
+def _igdb_api_request(endpoint: str, query: str, max_tries: int = 3) -> bytes:
+    """
+    Request an IGDB endpoint, backing off when IGDB throttles the request.
+
+    Parameters
+    ----------
+    endpoint : str
+        IGDB endpoint to query.
+    query : str
+        Apicalypse query.
+    max_tries : int
+        Maximum number of attempts.
+
+    Returns
+    -------
+    bytes
+        Raw response body.
+    """
+    count = 1
+    while True:
+        igdb_limiter.wait()  # Apply IGDB rate limiting
+        try:
+            byte_array = get_igdb_wrapper().api_request(endpoint=endpoint, query=query)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or count >= max_tries or not _apply_rate_limit_feedback(
+                    limiter=igdb_limiter,
+                    url=f'igdb {endpoint}',
+                    response=e.response,
+                    default_delay=2**count,
+            ):
+                raise
+            count += 1
+        else:
+            igdb_limiter.recover()
+            return byte_array
 
 
 def _get_igdb_query_filter(item_id: Union[int, str]) -> tuple[str, Union[int, str]]:
@@ -979,8 +2313,7 @@ def _load_igdb_item_data(item_type: str, item_id: Union[int, str]) -> tuple[str,
     endpoint = databases[item_type]['api_endpoint']
     fields = databases[item_type]['api_fields']
 
-    igdb_limiter.wait()  # Apply IGDB rate limiting
-    byte_array = get_igdb_wrapper().api_request(
+    byte_array = _igdb_api_request(
         endpoint=endpoint,
         query=f'fields {", ".join(fields)}; where {where_type} = ({where}); limit 1; offset 0;'
     )
@@ -997,129 +2330,464 @@ def _load_igdb_item_data(item_type: str, item_id: Union[int, str]) -> tuple[str,
             end_program=True,
         )
 
+    if json_data and _is_unchanged_igdb_item(item_type=item_type, json_data=json_data):
+        return database_path, item_id, None
+
     return database_path, item_id, json_data
 
 
-def _remove_stale_tmdb_file(database_path: str, item_type: str, item_id: Union[int, str]) -> None:
-    """Remove a local TMDB file when the upstream item no longer exists."""
-    print_github_warning(f'{item_type} id {item_id} not found on TMDB, removing from database')
-    stale_file = os.path.join(database_path, f'{item_id}.json')
-    if os.path.isfile(stale_file):
-        os.remove(stale_file)
-        print_github_warning(f'Removed stale database file: {stale_file}')
+def _is_unchanged_igdb_item(item_type: str, json_data: dict) -> bool:
+    """Check whether IGDB item metadata is identical to the metadata of an earlier run."""
+    # IGDB queries do not support conditional requests, so only the body hash is compared
+    return _is_unchanged_response(item_type=item_type, item_id=json_data['id'], json_data=json_data)
 
 
-def _create_tmdb_session() -> requests.Session:
-    """Create a TMDB session with credentials kept out of request URLs.
+def _load_igdb_batch_data(item_type: str, item_ids: list) -> dict:
+    """
+    Load metadata for several items from IGDB.
+
+    Parameters
+    ----------
+    item_type : str
+        Database item type of every item in the batch.
+    item_ids : list
+        IGDB ids or slugs to load, at most ``IGDB_BATCH_SIZE`` items.
 
     Returns
     -------
-    requests.Session
-        Session configured with the TMDB API key as a request parameter.
+    dict
+        Mapping of requested item id or slug to item metadata. Items that were not found are not included.
     """
-    session = requests.Session()
-    session.params.update({'api_key': os.environ["TMDB_API_KEY_V3"]})
-    return session
+    endpoint = databases[item_type]['api_endpoint']
+    fields = databases[item_type]['api_fields']
 
+    filters = defaultdict(list)
+    for item_id in item_ids:
+        where_type, where = _get_igdb_query_filter(item_id=item_id)
+        filters[where_type].append(str(where))
 
-def _load_tmdb_item_data(item_type: str, item_id: Union[int, str]) -> tuple[str, Union[int, str], dict]:
-    """Load item metadata from TMDB."""
-    database_path = databases[item_type]['path']
-    endpoint = databases[item_type]['api_endpoint']
-    url = f'https://api.themoviedb.org/3/{endpoint}/{item_id}'
-    response = requests_loop(url=url, method=_create_tmdb_session().get, no_retry_statuses=[404])
+    results = {}
+    for where_type, values in filters.items():
+        print(f'Searching igdb {endpoint} for {len(values)} items by {where_type}')
 
-    if response.status_code == 404:
-        _remove_stale_tmdb_file(database_path=database_path, item_type=item_type, item_id=item_id)
-        if getattr(args, 'issue_update', False):
-            exception_writer(
-                error=Exception(
-                    f'Error processing TMDB url: {item_type} id {item_id} not found or unavailable',
-                ),
-                name='tmdb',
+        byte_array = _igdb_api_request(
+            endpoint=endpoint,
+            query=(
+                f'fields {", ".join(fields)}; where {where_type} = ({",".join(values)}); '
+                f'limit {IGDB_BATCH_SIZE}; offset 0;'
             )
-        return database_path, item_id, {}
-
-    if response.status_code != 200:
-        exception_writer(
-            error=Exception(f'tmdb api returned a non 200 status code of: {response.status_code}'),
-            name='tmdb',
-            end_program=True,
         )
-        return database_path, item_id, {}
+        for json_data in json.loads(byte_array):
+            if where_type in json_data:
+                results[str(json_data[where_type])] = json_data
 
-    return database_path, item_id, response.json()
+    return results
 
 
-def _load_item_data(item_type: str, item_id: Union[int, str]) -> tuple[str, Union[int, str], dict]:
-    """Load provider metadata for a database item."""
-    if item_type.startswith('game'):
-        return _load_igdb_item_data(item_type=item_type, item_id=item_id)
+def get_youtube_video_id(url: Optional[str]) -> Optional[str]:
+    """
+    Return the video id of a YouTube url.
 
-    return _load_tmdb_item_data(item_type=item_type, item_id=item_id)
+    Parameters
+    ----------
+    url : Optional[str]
+        YouTube url.
+
+    Returns
+    -------
+    Optional[str]
+        Video id, or ``None`` when the url is empty or not a YouTube video url.
+    """
+    match = YOUTUBE_VIDEO_ID_PATTERN.search(url or '')
+    return match.group(1) if match else None
 
 
-def _load_existing_item_data(item_file: str) -> dict:
-    """Load the existing database item and write duplicate metadata when needed."""
-    if not os.path.isfile(item_file):
-        return {}
+def _get_change_feed_run_id() -> str:
+    """
+    Get the id of the current run, used to name its pending change feed file.
 
-    if args.issue_update:
-        with open("duplicate.md", "w") as duplicate_f:
-            duplicate_f.write('This item already exists in the database.')
+    Returns
+    -------
+    str
+        GitHub Actions run id and attempt, or the process id outside of GitHub Actions.
+    """
+    run_id = os.environ.get('GITHUB_RUN_ID')
+    if run_id:
+        return f"{run_id}-{os.environ.get('GITHUB_RUN_ATTEMPT') or 1}"
+    return f'local-{os.getpid()}'
 
-    with open(file=item_file, mode='r') as og_f:
-        return json.load(fp=og_f)
 
+def record_change_event(item_type: str,
+                        event: str,
+                        item_id: Union[int, str],
+                        old_youtube_url: Optional[str],
+                        new_youtube_url: Optional[str]) -> None:
+    """
+    Append an event to the pending change feed of the current run.
 
-def _build_issue_author_badge(badge_type: str,
-                              author: Optional[str] = None,
-                              repository: Optional[str] = None) -> str:
-    """Build an author-scoped issue-count badge.
+    Each run writes its own file in the ``changes/pending`` directory of the database, so the issue update and the
+    daily update never append to the same file and their commits rebase cleanly. The daily update merges the pending
+    files into the feed with ``compact_change_feeds``.
 
     Parameters
     ----------
-    badge_type : str
-        Badge config key from ISSUE_AUTHOR_BADGES.
-    author : str, optional
-        GitHub username to search for. Defaults to the issue author login.
-    repository : str, optional
-        GitHub repository in owner/name format. Defaults to the current repository.
+    item_type : str
+        Database item type.
+    event : str
+        Event type, one of ``add``, ``edit`` and ``remove``.
+    item_id : Union[int, str]
+        Database item id.
+    old_youtube_url : Optional[str]
+        Theme url before the change.
+    new_youtube_url : Optional[str]
+        Theme url after the change.
+    """
+    now = datetime.now(timezone.utc)
+    line = json.dumps({
+        'event': event,
+        'id': item_id,
+        'old_youtube_id': get_youtube_video_id(url=old_youtube_url),
+        'new_youtube_id': get_youtube_video_id(url=new_youtube_url),
+        'timestamp': int(now.timestamp()),
+    }, separators=(',', ':'))
+
+    pending_dir = os.path.join(os.path.dirname(databases[item_type]['path']), CHANGES_DIRNAME,
+                               CHANGE_FEED_PENDING_DIRNAME)
+    with change_feed_lock:
+        os.makedirs(name=pending_dir, exist_ok=True)
+        with open(file=os.path.join(pending_dir, f'{_get_change_feed_run_id()}.jsonl'), mode='a',
+                  encoding='utf-8') as feed_f:
+            feed_f.write(f'{line}\n')
+
+
+def _read_change_feed_lines(feed_file: str) -> list:
+    """Read the lines of a change feed file, or no lines when the file does not exist."""
+    try:
+        with open(file=feed_file, mode='r', encoding='utf-8') as feed_f:
+            return feed_f.read().splitlines()
+    except FileNotFoundError:
+        return []
 
-    Returns
-    -------
-    str
-        Markdown badge link, or an empty string when no author is available.
+
+def _merge_pending_change_feeds(changes_dir: str) -> None:
     """
-    badge_config = ISSUE_AUTHOR_BADGES[badge_type]
-    author = author or os.environ.get('ISSUE_AUTHOR_LOGIN', '')
-    if not author:
-        return ''
+    Merge the pending change feeds of every run into the daily files of a database.
 
-    repository = repository or os.environ.get('GITHUB_REPOSITORY', DEFAULT_GITHUB_REPOSITORY)
-    label = badge_config['label']
-    query = ' '.join([
-        f'repo:{repository}',
-        'is:closed',
-        *badge_config['query_filters'],
-        f'author:{author}',
-    ])
-    encoded_query = quote(query, safe='')
-    badge_options = [
-        f'query={encoded_query}',
-        f'style={ISSUE_AUTHOR_BADGE_STYLE}',
-        f'label={label}',
-    ]
-    if badge_config.get('color'):
-        badge_options.append(f'color={badge_config["color"]}')
+    Events go to the file of their UTC day and are ordered by timestamp. Lines that are already in a daily file are not
+    added again, so merging can run again after an interrupted run.
 
-    badge_query = '&'.join(badge_options)
-    badge_url = f'https://img.shields.io/github/issues-search?{badge_query}'
-    issues_url = f'https://github.com/{repository}/issues?q={encoded_query}'
-    return f'[![{label}]({badge_url})]({issues_url})'
+    Parameters
+    ----------
+    changes_dir : str
+        Change feed directory of the database.
+    """
+    pending_dir = os.path.join(changes_dir, CHANGE_FEED_PENDING_DIRNAME)
+    try:
+        pending_files = [os.path.join(pending_dir, filename) for filename in sorted(os.listdir(pending_dir))
+                         if filename.endswith('.jsonl')]
+    except FileNotFoundError:
+        return
 
+    days = defaultdict(list)
+    for pending_file in pending_files:
+        for line in _read_change_feed_lines(feed_file=pending_file):
+            try:
+                timestamp = json.loads(line)['timestamp']
+            except (ValueError, TypeError, KeyError):
+                print_github_warning(f'Skipping invalid change feed line in {pending_file}: {line}')
+                continue
+            days[f'{datetime.fromtimestamp(timestamp, tz=timezone.utc):%Y-%m-%d}'].append((timestamp, line))
+
+    for day, events in days.items():
+        day_file = os.path.join(changes_dir, f'{day}.jsonl')
+        lines = _read_change_feed_lines(feed_file=day_file)
+        lines.extend(line for _, line in sorted(events, key=lambda event: event[0]))
+        output_writer.write(path=day_file, content=''.join(f'{line}\n' for line in dict.fromkeys(lines)))
+    for pending_file in pending_files:
+        output_writer.remove(path=pending_file)
+
+
+def compact_change_feeds(today: Optional[date] = None) -> None:
+    """
+    Merge the pending change feeds into the daily files, and the daily files of past months into monthly files.
 
-def _build_issue_comment_badges(author: Optional[str] = None, repository: Optional[str] = None) -> str:
+    Daily files of the current month are kept. Events keep their order, and lines that are already in the monthly file
+    are not added again, so compaction can run again after an interrupted run.
+
+    Parameters
+    ----------
+    today : Optional[date]
+        Current UTC date. Defaults to today.
+    """
+    current_month = f'{today or datetime.now(timezone.utc).date():%Y-%m}'
+    for db in databases:
+        changes_dir = os.path.join(os.path.dirname(databases[db]['path']), CHANGES_DIRNAME)
+        _merge_pending_change_feeds(changes_dir=changes_dir)
+        try:
+            filenames = sorted(os.listdir(changes_dir))
+        except FileNotFoundError:
+            continue
+
+        months = defaultdict(list)
+        for filename in filenames:
+            match = CHANGE_FEED_DAY_PATTERN.fullmatch(filename)
+            if match and match.group(1) < current_month:
+                months[match.group(1)].append(os.path.join(changes_dir, filename))
+
+        for month, day_files in months.items():
+            month_file = os.path.join(changes_dir, f'{month}.jsonl')
+            lines = []
+            for feed_file in [month_file] + day_files:
+                lines.extend(_read_change_feed_lines(feed_file=feed_file))
+            output_writer.write(path=month_file, content=''.join(f'{line}\n' for line in dict.fromkeys(lines)))
+            for day_file in day_files:
+                output_writer.remove(path=day_file)
+
+
+def _remove_stale_tmdb_file(database_path: str, item_type: str, item_id: Union[int, str]) -> None:
+    """Remove a local TMDB file, and the IMDb copy of a movie, when the upstream item no longer exists."""
+    print_github_warning(f'{item_type} id {item_id} not found on TMDB, removing from database')
+    stale_file = os.path.join(database_path, f'{item_id}.json')
+    if os.path.isfile(stale_file):
+        stale_data = _load_local_item(item_type=item_type, item_file=stale_file)
+        old_youtube_url = stale_data.get('youtube_theme_url')
+        output_writer.remove(path=stale_file)
+        print_github_warning(f'Removed stale database file: {stale_file}')
+        imdb_id = stale_data.get('imdb_id') if item_type == 'movie' else None
+        if imdb_id and IMDB_ID_PATTERN.fullmatch(str(imdb_id)):
+            output_writer.remove(path=os.path.join(imdb_path, f'{imdb_id}.json'))
+        record_change_event(
+            item_type=item_type,
+            event='remove',
+            item_id=item_id,
+            old_youtube_url=old_youtube_url,
+            new_youtube_url=None,
+        )
+
+
+def _create_tmdb_session() -> requests.Session:
+    """Get the shared TMDB session with credentials kept out of request URLs.
+
+    Returns
+    -------
+    requests.Session
+        Session configured with the TMDB API key as a request parameter.
+    """
+    return transport.session(name='tmdb', params={'api_key': os.environ["TMDB_API_KEY_V3"]})
+
+
+def _get_response_cache_key(item_type: str, item_id: Union[int, str]) -> str:
+    """Return the response cache key of a database item."""
+    return f'{_get_item_provider(item_type=item_type)}:{databases[item_type]["api_endpoint"]}:{item_id}'
+
+
+def _get_conditional_headers(item_type: str, item_id: Union[int, str]) -> Optional[dict]:
+    """
+    Get the conditional request headers for an item response cached by an earlier run.
+
+    Parameters
+    ----------
+    item_type : str
+        Database item type.
+    item_id : Union[int, str]
+        Database item id.
+
+    Returns
+    -------
+    Optional[dict]
+        Conditional request headers, or ``None`` when the response is not cached or the item has no local file.
+    """
+    item_file = os.path.join(databases[item_type]['path'], f'{item_id}.json')
+    if response_cache is None or not os.path.isfile(item_file):
+        return None
+
+    entry = response_cache.get(key=_get_response_cache_key(item_type=item_type, item_id=item_id))
+    headers = {}
+    if 'etag' in entry:
+        headers['If-None-Match'] = entry['etag']
+    if 'last_modified' in entry:
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers or None
+
+
+def _is_unchanged_response(item_type: str,
+                           item_id: Union[int, str],
+                           json_data: dict,
+                           etag: Optional[str] = None,
+                           last_modified: Optional[str] = None) -> bool:
+    """
+    Cache an item response and check whether it is identical to the response of an earlier run.
+
+    Only the fields that are stored in the database item are hashed, so volatile fields such as popularity do not
+    make an item look changed. Their values are still recorded in the database metrics for unchanged items.
+
+    Parameters
+    ----------
+    item_type : str
+        Database item type.
+    item_id : Union[int, str]
+        Database item id.
+    json_data : dict
+        Provider metadata of the item. It is not modified.
+    etag : Optional[str]
+        ``ETag`` validator of the response.
+    last_modified : Optional[str]
+        ``Last-Modified`` validator of the response.
+
+    Returns
+    -------
+    bool
+        Whether the response is unchanged and the database item file already holds it.
+    """
+    if response_cache is None:
+        return False
+
+    persisted_data = copy.deepcopy(json_data)
+    metrics = _apply_volatile_field_policy(item_type=item_type, og_data={}, json_data=persisted_data)
+    clean_old_data(data=persisted_data, item_type=item_type)
+
+    unchanged = response_cache.update(
+        key=_get_response_cache_key(item_type=item_type, item_id=item_id),
+        body=json.dumps(persisted_data, sort_keys=True).encode('utf-8'),
+        etag=etag,
+        last_modified=last_modified,
+    )
+    if not unchanged or not os.path.isfile(os.path.join(databases[item_type]['path'], f'{item_id}.json')):
+        return False
+
+    if metrics:
+        databases[item_type].setdefault('metrics', {})[str(item_id)] = metrics
+    return True
+
+
+def _load_tmdb_item_data(item_type: str, item_id: Union[int, str]) -> tuple[str, Union[int, str], Optional[dict]]:
+    """Load item metadata from TMDB."""
+    endpoint = databases[item_type]['api_endpoint']
+    url = f'{TMDB_API_URL}/{endpoint}/{item_id}'
+    response = requests_loop(
+        url=url,
+        headers=_get_conditional_headers(item_type=item_type, item_id=item_id),
+        method=_create_tmdb_session().get,
+        allow_statuses=[requests.codes.ok, requests.codes.not_modified],
+        no_retry_statuses=[404],
+    )
+    return _handle_tmdb_response(item_type=item_type, item_id=item_id, response=response)
+
+
+def _handle_tmdb_response(item_type: str,
+                          item_id: Union[int, str],
+                          response: requests.Response) -> tuple[str, Union[int, str], Optional[dict]]:
+    """
+    Return item metadata from a TMDB response, handling missing and failed items.
+
+    The metadata is ``None`` when the response is unchanged since the last daily update.
+    """
+    database_path = databases[item_type]['path']
+    if response.status_code == requests.codes.not_modified:
+        response_cache.not_modified(key=_get_response_cache_key(item_type=item_type, item_id=item_id))
+        return database_path, item_id, None
+
+    if response.status_code == 404:
+        _remove_stale_tmdb_file(database_path=database_path, item_type=item_type, item_id=item_id)
+        if getattr(args, 'issue_update', False):
+            exception_writer(
+                error=Exception(
+                    f'Error processing TMDB url: {item_type} id {item_id} not found or unavailable',
+                ),
+                name='tmdb',
+            )
+        return database_path, item_id, {}
+
+    if response.status_code != 200:
+        exception_writer(
+            error=Exception(f'tmdb api returned a non 200 status code of: {response.status_code}'),
+            name='tmdb',
+            end_program=True,
+        )
+        return database_path, item_id, {}
+
+    json_data = response.json()
+    if _is_unchanged_response(
+            item_type=item_type,
+            item_id=item_id,
+            json_data=json_data,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+    ):
+        return database_path, item_id, None
+
+    return database_path, item_id, json_data
+
+
+def _load_item_data(item_type: str, item_id: Union[int, str]) -> tuple[str, Union[int, str], dict]:
+    """Load provider metadata for a database item."""
+    if item_type.startswith('game'):
+        return _load_igdb_item_data(item_type=item_type, item_id=item_id)
+
+    return _load_tmdb_item_data(item_type=item_type, item_id=item_id)
+
+
+def _load_existing_item_data(item_file: str) -> dict:
+    """Load the existing database item and write duplicate metadata when needed."""
+    if not os.path.isfile(item_file):
+        return {}
+
+    if args.issue_update:
+        with open("duplicate.md", "w") as duplicate_f:
+            duplicate_f.write('This item already exists in the database.')
+
+    with open(file=item_file, mode='r') as og_f:
+        return json.load(fp=og_f)
+
+
+def _build_issue_author_badge(badge_type: str,
+                              author: Optional[str] = None,
+                              repository: Optional[str] = None) -> str:
+    """Build an author-scoped issue-count badge.
+
+    Parameters
+    ----------
+    badge_type : str
+        Badge config key from ISSUE_AUTHOR_BADGES.
+    author : str, optional
+        GitHub username to search for. Defaults to the issue author login.
+    repository : str, optional
+        GitHub repository in owner/name format. Defaults to the current repository.
+
+    Returns
+    -------
+    str
+        Markdown badge link, or an empty string when no author is available.
+    """
+    badge_config = ISSUE_AUTHOR_BADGES[badge_type]
+    author = author or os.environ.get('ISSUE_AUTHOR_LOGIN', '')
+    if not author:
+        return ''
+
+    repository = repository or os.environ.get('GITHUB_REPOSITORY', DEFAULT_GITHUB_REPOSITORY)
+    label = badge_config['label']
+    query = ' '.join([
+        f'repo:{repository}',
+        'is:closed',
+        *badge_config['query_filters'],
+        f'author:{author}',
+    ])
+    encoded_query = quote(query, safe='')
+    badge_options = [
+        f'query={encoded_query}',
+        f'style={ISSUE_AUTHOR_BADGE_STYLE}',
+        f'label={label}',
+    ]
+    if badge_config.get('color'):
+        badge_options.append(f'color={badge_config["color"]}')
+
+    badge_query = '&'.join(badge_options)
+    badge_url = f'https://img.shields.io/github/issues-search?{badge_query}'
+    issues_url = f'https://github.com/{repository}/issues?q={encoded_query}'
+    return f'[![{label}]({badge_url})]({issues_url})'
+
+
+def _build_issue_comment_badges(author: Optional[str] = None, repository: Optional[str] = None) -> str:
     """Build the leading issue comment badges for an author."""
     badges = [
         _build_issue_author_badge(
@@ -1346,12 +3014,19 @@ def _write_item_files(database_path: str, item_type: str, og_data: dict) -> None
         except KeyError as e:
             print_github_error(f'Error getting imdb_id: {e}')
 
+    content = json.dumps(obj=og_data, indent=4, sort_keys=True)
     for filename in destination_filenames:
-        destination_dir = os.path.dirname(filename)
-        os.makedirs(name=destination_dir, exist_ok=True)  # create directory if it doesn't exist
-
-        with open(filename, "w") as dest_f:
-            json.dump(obj=og_data, indent=4, fp=dest_f, sort_keys=True)
+        output_writer.write(path=filename, content=content)
+    if response_cache is not None:
+        # the files now hold the response, so later runs may skip it while it is unchanged
+        response_cache.commit(key=_get_response_cache_key(item_type=item_type, item_id=og_data['id']))
+
+    # hashed while the content is in memory, so the manifest does not read the item file again
+    data = content.encode('utf-8')
+    databases[item_type].setdefault('content_hashes', {})[str(og_data['id'])] = (
+        hashlib.sha256(data).hexdigest(),
+        len(data),
+    )
 
 
 def process_item_id(item_type: str,
@@ -1359,11 +3034,68 @@ def process_item_id(item_type: str,
                     youtube_url: Optional[str] = None,
                     issue_submission: Optional[dict] = None) -> dict:
     database_path, item_id, json_data = _load_item_data(item_type=item_type, item_id=item_id)
+    return _merge_item_data(
+        item_type=item_type,
+        database_path=database_path,
+        item_id=item_id,
+        json_data=json_data,
+        youtube_url=youtube_url,
+        issue_submission=issue_submission,
+    )
+
+
+def _process_batched_item(item_type: str, item_id: str, json_data: dict) -> dict:
+    """
+    Merge and write a database item with metadata loaded by a batch request.
+
+    Parameters
+    ----------
+    item_type : str
+        Database item type.
+    item_id : str
+        Database item id.
+    json_data : dict
+        Provider metadata for the item, empty when the provider did not return the item.
+
+    Returns
+    -------
+    dict
+        Updated item data, or the existing item data when the provider did not return the item.
+    """
+    database_path = databases[item_type]['path']
+    if not json_data:
+        print_github_warning(f'{item_type} id {item_id} not found on IGDB, keeping the existing database item')
+        return _load_local_item(item_type=item_type, item_file=os.path.join(database_path, f'{item_id}.json'))
+
+    return _merge_item_data(
+        item_type=item_type,
+        database_path=database_path,
+        item_id=json_data['id'],
+        json_data=None if _is_unchanged_igdb_item(item_type=item_type, json_data=json_data) else json_data,
+    )
+
+
+def _merge_item_data(item_type: str,
+                     database_path: str,
+                     item_id: Union[int, str],
+                     json_data: Optional[dict],
+                     youtube_url: Optional[str] = None,
+                     issue_submission: Optional[dict] = None) -> dict:
+    """
+    Merge provider metadata into the existing database item and write the item files.
+
+    When ``json_data`` is ``None`` the provider response is unchanged since the last daily update, so the existing
+    database item is returned without merging or writing it.
+    """
+    if json_data is None:
+        return _load_local_item(item_type=item_type, item_file=os.path.join(database_path, f'{item_id}.json'))
+
     if not json_data:
         return {}
 
     item_file = os.path.join(database_path, f"{item_id}.json")
     og_data = _load_existing_item_data(item_file=item_file)
+    old_youtube_url = og_data.get('youtube_theme_url')
     print(f'processing {item_type}: id {item_id}')
 
     try:
@@ -1389,6 +3121,10 @@ def process_item_id(item_type: str,
                     issue_submission=issue_submission,
                 )
 
+        metrics = _apply_volatile_field_policy(item_type=item_type, og_data=og_data, json_data=json_data)
+        if metrics:
+            databases[item_type].setdefault('metrics', {})[str(json_data['id'])] = metrics
+
         # update the existing dictionary with new values from json_data
         og_data.update(json_data)
         if youtube_url:
@@ -1399,9 +3135,74 @@ def process_item_id(item_type: str,
 
         _write_item_files(database_path=database_path, item_type=item_type, og_data=og_data)
 
+        if youtube_url and youtube_url != old_youtube_url:
+            record_change_event(
+                item_type=item_type,
+                event='edit' if old_youtube_url else 'add',
+                item_id=og_data['id'],
+                old_youtube_url=old_youtube_url,
+                new_youtube_url=youtube_url,
+            )
+
     return og_data
 
 
+def _iter_field_containers(data: Union[dict, list], path: list):
+    """Yield the dictionaries that hold the last key of a field path, descending into lists."""
+    if isinstance(data, list):
+        for element in data:
+            yield from _iter_field_containers(data=element, path=path)
+    elif isinstance(data, dict):
+        if len(path) == 1:
+            yield data
+        elif path[0] in data:
+            yield from _iter_field_containers(data=data[path[0]], path=path[1:])
+
+
+def _apply_volatile_field_policy(item_type: str, og_data: dict, json_data: dict) -> dict:
+    """
+    Apply the volatile field policy of a database to provider metadata.
+
+    Fields that change on almost every refresh are removed, rounded or moved to the database metrics, so item
+    files only change when their theme or metadata does. Fields are dotted paths, and lists are descended into.
+
+    Parameters
+    ----------
+    item_type : str
+        Database item type.
+    og_data : dict
+        Existing database item. Removed fields are also removed from it.
+    json_data : dict
+        Provider metadata, updated in place.
+
+    Returns
+    -------
+    dict
+        Values of the fields with the ``metrics`` policy. Only top level fields can use this policy.
+    """
+    metrics = {}
+    for field, policy in databases[item_type].get('volatile_fields', {}).items():
+        path = field.split('.')
+        if policy == 'metrics':
+            if field in json_data:
+                metrics[field] = json_data.pop(field)
+            og_data.pop(field, None)
+        elif policy == 'exclude':
+            for data in (og_data, json_data):
+                for container in _iter_field_containers(data=data, path=path):
+                    container.pop(path[-1], None)
+        elif policy.startswith('round:'):
+            digits = int(policy.split(':', 1)[1])
+            for container in _iter_field_containers(data=json_data, path=path):
+                value = container.get(path[-1])
+                if isinstance(value, float):
+                    container[path[-1]] = round(value, digits) if digits else round(value)
+        else:
+            raise ValueError(f'Unknown volatile field policy for {item_type} {field}: {policy}')
+
+    return metrics
+
+
 def clean_old_data(data: dict, item_type: str) -> None:
     # remove old data
     if item_type == 'game':
@@ -1599,6 +3400,26 @@ def validate_youtube_requirements(item: dict, min_seconds: int = 20, max_seconds
     return errors
 
 
+def _get_youtube_service(api_key: str):
+    """
+    Get the YouTube API service of the current thread, building it on first use.
+
+    Parameters
+    ----------
+    api_key : str
+        YouTube API key.
+
+    Returns
+    -------
+    googleapiclient.discovery.Resource
+        YouTube API service.
+    """
+    if getattr(youtube_services, 'api_key', None) != api_key:
+        youtube_services.service = build('youtube', 'v3', developerKey=api_key)
+        youtube_services.api_key = api_key
+    return youtube_services.service
+
+
 def check_youtube(data: dict) -> Optional[str]:
     url = data['youtube_theme_url'].strip()
 
@@ -1611,10 +3432,7 @@ def check_youtube(data: dict) -> Optional[str]:
 
     # Extract video ID using regex pattern that matches all common YouTube URL formats
     # Matches: youtube.com/watch?v=ID, youtu.be/ID, youtube.com/embed/ID, youtube.com/v/ID
-    video_id_match = re.search(
-        r'(?:youtube\.com/(?:watch\?v=|embed/|v/)|youtu\.be/)([a-zA-Z0-9_-]{11})',
-        url
-    )
+    video_id_match = YOUTUBE_VIDEO_ID_PATTERN.search(url)
 
     if not video_id_match:
         exception_writer(
@@ -1635,8 +3453,7 @@ def check_youtube(data: dict) -> Optional[str]:
         return None
 
     try:
-        # Build the YouTube API service
-        youtube = build('youtube', 'v3', developerKey=youtube_api_key)
+        youtube = _get_youtube_service(api_key=youtube_api_key)
 
         # Request video details
         request = youtube.videos().list(
@@ -1727,6 +3544,16 @@ def parse_args(args_list: list) -> argparse.Namespace:
     parser.add_argument('--daily_update', action='store_true', help='Run in daily update mode.')
     parser.add_argument('--issue_update', action='store_true', help='Run in issue update mode.')
     parser.add_argument('--leaderboard_update', action='store_true', help='Build the contributor leaderboard only.')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only refresh TMDB items that changed since the last daily update.')
+    parser.add_argument('--full_refresh_days', type=int, default=DEFAULT_FULL_REFRESH_DAYS,
+                        help='Days between full refreshes when running an incremental daily update.')
+    parser.add_argument('--compress', action='store_true',
+                        help='Write gzip and brotli compressed siblings of the JSON and SVG outputs.')
+    parser.add_argument('--plot_renderer', choices=PLOT_RENDERERS, default='svg',
+                        help='Renderer used for the database size plots.')
+    parser.add_argument('--items_memory_cap', type=int, default=DEFAULT_ITEMS_MEMORY_CAP_MIB,
+                        help='Estimated MiB of collected items kept in memory per database before spilling to disk.')
 
     global args
     args = parser.parse_args(args_list)
@@ -1734,133 +3561,1202 @@ def parse_args(args_list: list) -> argparse.Namespace:
     return args
 
 
-def _queue_daily_update_items() -> None:
-    """Queue all existing database items for daily refresh."""
-    for database in databases.values():
-        try:
-            all_db_items = os.listdir(path=database['path'])
-        except FileNotFoundError:
-            continue
+def _load_daily_update_state() -> dict:
+    """Load the state recorded by the previous daily update."""
+    try:
+        with open(file=daily_update_state_file, mode='r') as state_f:
+            state = json.load(fp=state_f)
+    except (OSError, json.JSONDecodeError):
+        return {}
 
-        for next_item_file in all_db_items:
-            if os.path.isfile(os.path.join(database['path'], next_item_file)):
-                next_item_id = next_item_file.rsplit('.', 1)[0]
-                queue.put((database['type'], next_item_id))
+    return state if isinstance(state, dict) else {}
 
 
-def _write_chunk_files(db: str, chunks: list) -> None:
-    """Write paginated all-item JSON files for a database."""
-    for page_number, chunk in enumerate(chunks, start=1):
-        chunk_file = os.path.join(os.path.dirname(databases[db]['path']), f'all_page_{page_number}.json')
-        with open(file=chunk_file, mode='w') as chunk_f:
-            json.dump(obj=chunk, fp=chunk_f)
+def _write_daily_update_state(state: dict) -> None:
+    """Record the daily update state used by the next incremental run."""
+    os.makedirs(name=os.path.dirname(daily_update_state_file), exist_ok=True)
+    with open(file=daily_update_state_file, mode='w') as state_f:
+        json.dump(obj=state, indent=4, fp=state_f, sort_keys=True)
 
 
-def _write_pages_file(db: str, all_items: list, chunks: list) -> None:
-    """Write the page-count metadata for a database."""
-    pages = {
-        'count': len(all_items),
-        'pages': len(chunks)
-    }
+def _load_tmdb_changed_ids(item_type: str, start_date: str, end_date: str) -> Optional[set]:
+    """
+    Load the item ids from a TMDB change list.
 
-    # get imdb count... number of files in imdb_path that start with tt
-    if db == 'movie':
-        pages['imdb_count'] = len([name for name in os.listdir(imdb_path) if name.startswith('tt')])
+    Parameters
+    ----------
+    item_type : str
+        Database item type with a ``changes_endpoint``.
+    start_date : str
+        First day of the change window, in ``YYYY-MM-DD`` format.
+    end_date : str
+        Last day of the change window, in ``YYYY-MM-DD`` format.
 
-    pages_file = os.path.join(os.path.dirname(databases[db]['path']), 'pages.json')
-    with open(file=pages_file, mode='w') as pages_f:
-        json.dump(obj=pages, fp=pages_f)
+    Returns
+    -------
+    Optional[set]
+        Changed item ids as strings, or ``None`` when the change list could not be loaded.
+    """
+    endpoint = databases[item_type]['changes_endpoint']
+    session = _create_tmdb_session()
+    changed_ids = set()
+    page = 1
+    total_pages = 1
+
+    while page <= total_pages:
+        query = urlencode({'end_date': end_date, 'page': page, 'start_date': start_date})
+        response = requests_loop(url=f'{TMDB_API_URL}/{endpoint}?{query}', method=session.get)
+        if response is None or response.status_code != 200:
+            print_github_warning(f'Unable to load TMDB {item_type} changes, refreshing all {item_type} items')
+            return None
 
+        changes = response.json()
+        changed_ids.update(str(change['id']) for change in changes.get('results', []))
+        total_pages = changes.get('total_pages', 1)
+        page += 1
 
-def _load_theme_timestamps(db: str, all_items: list) -> list:
-    """Load theme-add timestamps for database plot generation."""
-    timestamps = []
-    for item_ in all_items:
-        with open(file=os.path.join(databases[db]['path'], f'{item_["id"]}.json')) as item_f:
-            item_data = json.load(item_f)
-        timestamps.append(item_data['youtube_theme_added'])
+    return changed_ids
 
-    timestamps.sort()
-    return timestamps
 
+def _get_daily_update_changes(state: dict, started: int) -> Optional[dict]:
+    """
+    Get the TMDB items that changed since the previous daily update.
 
-def _build_database_plot_values(timestamps: list) -> tuple[list, list]:
-    """Build cumulative date and count values for the database size plot."""
-    timestamps_human = [datetime.fromtimestamp(x).strftime('%Y-%m-%d') for x in timestamps]
-    x_values = []
-    y_values = []
-    total_count = 0
-
-    for timestamp_human in timestamps_human:
-        if timestamp_human not in x_values:
-            new_total = timestamps_human.count(timestamp_human) + total_count
-            x_values.append(timestamp_human)
-            y_values.append(new_total)
-            total_count = new_total
+    Parameters
+    ----------
+    state : dict
+        State recorded by the previous daily update.
+    started : int
+        Start time of the current daily update.
 
-    # get the current date in human-readable format
-    current_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-    if timestamps_human[-1] != current_date:
-        x_values.append(current_date)  # add the current date
-        y_values.append(y_values[-1])  # add the last value again to indicate no increase
+    Returns
+    -------
+    Optional[dict]
+        Mapping of item type to changed item ids, or ``None`` when every item should be refreshed. Items that the
+        previous daily update failed to refresh are included, so they are retried before the next full refresh.
+    """
+    if not getattr(args, 'incremental', False):
+        return None
 
-    return x_values, y_values
+    last_run = state.get('last_run')
+    last_full_refresh = state.get('last_full_refresh')
+    if not last_run or not last_full_refresh:
+        print('No previous daily update recorded, running a full refresh')
+        return None
 
+    full_refresh_days = getattr(args, 'full_refresh_days', DEFAULT_FULL_REFRESH_DAYS)
+    if started - last_full_refresh >= full_refresh_days * 86400:
+        print(f'Last full refresh is at least {full_refresh_days} days old, running a full refresh')
+        return None
+
+    start_date = datetime.fromtimestamp(last_run, timezone.utc).date()
+    end_date = datetime.fromtimestamp(started, timezone.utc).date()
+    if end_date - start_date > timedelta(days=TMDB_CHANGES_MAX_DAYS):
+        print(f'Last daily update is more than {TMDB_CHANGES_MAX_DAYS} days old, running a full refresh')
+        return None
+
+    changes = {}
+    for item_type, database in databases.items():
+        if not database.get('changes_endpoint'):
+            continue
+
+        changed_ids = _load_tmdb_changed_ids(
+            item_type=item_type,
+            start_date=start_date.isoformat(),
+            end_date=end_date.isoformat(),
+        )
+        if changed_ids is None:
+            return None
+
+        print(f'{len(changed_ids)} {item_type} items changed on TMDB since {start_date}')
+        failed_ids = set(map(str, state.get('failed_ids', {}).get(item_type, []))) - changed_ids
+        if failed_ids:
+            print(f'Retrying {len(failed_ids)} {item_type} items that failed in the previous daily update')
+        changes[item_type] = changed_ids | failed_ids
+
+    return changes
+
+
+def _load_local_item(item_type: str, item_file: str) -> dict:
+    """
+    Load an unchanged database item for the daily update outputs.
+
+    Parameters
+    ----------
+    item_type : str
+        Database item type.
+    item_file : str
+        Path to the database item file.
+
+    Returns
+    -------
+    dict
+        Item data, or an empty dictionary when the item has never been fetched from its provider.
+    """
+    try:
+        with open(file=item_file, mode='rb') as item_f:
+            content = item_f.read()
+        data = json.loads(content)
+    except (OSError, ValueError) as e:
+        print_github_warning(f'Unable to read {item_file}: {e}')
+        return {}
+
+    title_key = 'title' if item_type == 'movie' else 'name'
+    if not isinstance(data, dict) or 'id' not in data or title_key not in data:
+        return {}
+
+    # hashed while the content is in memory, so the manifest does not read the item file again
+    databases[item_type].setdefault('content_hashes', {})[str(data['id'])] = (
+        hashlib.sha256(content).hexdigest(),
+        len(content),
+    )
+    return data
+
+
+def _queue_daily_update_items(changes: Optional[dict] = None) -> None:
+    """
+    Queue existing database items for daily refresh.
+
+    Parameters
+    ----------
+    changes : Optional[dict]
+        Mapping of item type to changed item ids. Item types in this mapping only refresh changed items and items
+        that have never been fetched, other items are loaded from disk. Every item is queued when ``None``.
+    """
+    changes = changes or {}
+    for database in databases.values():
+        try:
+            all_db_items = os.listdir(path=database['path'])
+        except FileNotFoundError:
+            queue.close(item_type=database['type'])
+            continue
+
+        changed_ids = changes.get(database['type'])
+        refresh_ids = []
+        for next_item_file in all_db_items:
+            item_file = os.path.join(database['path'], next_item_file)
+            if not os.path.isfile(item_file):
+                continue
+
+            next_item_id = next_item_file.rsplit('.', 1)[0]
+            if changed_ids is not None and next_item_id not in changed_ids:
+                data = _load_local_item(item_type=database['type'], item_file=item_file)
+                if data:
+                    _append_all_item(item_type=database['type'], data=data)
+                    continue
+
+            refresh_ids.append(next_item_id)
+
+        if database['type'].startswith('game'):
+            _queue_igdb_batches(item_type=database['type'], item_ids=refresh_ids)
+        else:
+            for next_item_id in refresh_ids:
+                queue.put((database['type'], next_item_id))
+        queue.close(item_type=database['type'])
+
+
+def _queue_igdb_batches(item_type: str, item_ids: list) -> None:
+    """
+    Load IGDB items in batches and queue each item with its metadata.
+
+    Parameters
+    ----------
+    item_type : str
+        Database item type of every item.
+    item_ids : list
+        IGDB ids or slugs to refresh.
+    """
+    for start in range(0, len(item_ids), IGDB_BATCH_SIZE):
+        batch = item_ids[start:start + IGDB_BATCH_SIZE]
+        try:
+            results = _load_igdb_batch_data(item_type=item_type, item_ids=batch)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print_github_warning(f'Batch request for {len(batch)} {item_type} items failed, queueing items: {e}')
+            for item_id in batch:
+                queue.put((item_type, item_id))
+            continue
+
+        for item_id in batch:
+            queue.put((item_type, item_id, results.get(str(item_id), {})))
+
+
+def _get_page_sort_key(item: dict) -> tuple[str, str]:
+    """Return the key that orders database items within and across pages."""
+    # sort by id within a title, so pages do not depend on the order items were refreshed in
+    return item['title'], str(item['id'])
+
+
+def _load_page_buckets(pages_file: str) -> tuple[list, int]:
+    """
+    Load the page buckets recorded in the ``pages.json`` file of the previous daily update.
+
+    Parameters
+    ----------
+    pages_file : str
+        Path of the ``pages.json`` file.
+
+    Returns
+    -------
+    tuple[list, int]
+        Page buckets in page order, and the number of the next new page. Files written before the next page number was
+        recorded continue after their highest page.
+    """
+    try:
+        with open(file=pages_file, mode='r', encoding='utf-8') as pages_f:
+            pages = json.load(fp=pages_f)
+    except (OSError, json.JSONDecodeError):
+        return [], 1
+
+    if not isinstance(pages, dict):
+        return [], 1
+    buckets = pages.get('buckets', [])
+    next_page = max(pages.get('next_page', 1), max((bucket['page'] for bucket in buckets), default=0) + 1)
+    return buckets, next_page
+
+
+def _build_page_buckets(all_items: list, previous_buckets: list, next_page_number: int = 1) -> list:
+    """
+    Assign sorted database items to stable pages.
+
+    Each item goes to the previous page whose first item sorts at or before it. Pages below ``PAGE_MIN_SIZE`` are
+    merged into the page before them and pages above ``PAGE_MAX_SIZE`` are split, so adding or removing a title only
+    changes the page it belongs to, instead of shifting every later page. New pages are numbered from
+    ``next_page_number``, which ``pages.json`` keeps across updates, so the number of a page that was merged away is
+    not reused for a different range of titles.
+
+    Only the number of items in each page is counted, so the items are streamed once and never copied into pages.
+
+    Parameters
+    ----------
+    all_items : list
+        Database items, sorted by ``_get_page_sort_key``.
+    previous_buckets : list
+        Page buckets of the previous daily update, in page order. Items are paged from scratch when empty.
+    next_page_number : int
+        Number of the first new page. Numbers of previous pages are never used for new pages.
+
+    Returns
+    -------
+    list
+        Tuples of page number, and start and end positions of the page items in ``all_items``, in page order.
+    """
+    page_numbers = [bucket['page'] for bucket in previous_buckets]
+    starts = [tuple(bucket['start']) for bucket in previous_buckets]
+    next_page_number = max(next_page_number, max(page_numbers, default=0) + 1)
+
+    if starts:
+        counts = [0] * len(starts)
+        for item in all_items:
+            # items before the first page start belong to the first page
+            counts[max(bisect_right(starts, _get_page_sort_key(item=item)) - 1, 0)] += 1
+        pages = zip(page_numbers, counts)
+    else:
+        pages = [(None, len(all_items))]
+
+    merged = []
+    for page_number, count in pages:
+        if merged and (count < PAGE_MIN_SIZE or merged[-1][1] < PAGE_MIN_SIZE):
+            merged[-1][1] += count
+        else:
+            merged.append([page_number, count])
+
+    buckets = []
+    start = 0
+    for page_number, count in merged:
+        if page_number is not None and count <= PAGE_MAX_SIZE:
+            buckets.append((page_number, start, start + count))
+        else:
+            # split evenly, the first part keeps the page number
+            parts = -(-count // PAGE_TARGET_SIZE)
+            for part in range(parts):
+                if page_number is None or part:
+                    page_number = next_page_number
+                    next_page_number += 1
+                buckets.append((page_number, start + count * part // parts, start + count * (part + 1) // parts))
+        start += count
+
+    return buckets
+
+
+def _write_chunk_files(db: str, all_items: list, buckets: list) -> None:
+    """Write paginated all-item JSON files for a database, and remove the files of pages that were merged away."""
+    database_dir = os.path.dirname(databases[db]['path'])
+    for page_number, start, end in buckets:
+        chunk_file = os.path.join(database_dir, f'all_page_{page_number}.json')
+        output_writer.write_json(path=chunk_file, obj=all_items[start:end])
+
+    page_numbers = {page_number for page_number, _, _ in buckets}
+    for file_name in os.listdir(path=database_dir):
+        match = PAGE_FILE_PATTERN.fullmatch(file_name)
+        if match and int(match.group(1)) not in page_numbers:
+            output_writer.remove(path=os.path.join(database_dir, file_name))
+
+
+def _write_index_file(db: str, all_items: list) -> None:
+    """
+    Write the compact index of every item in a database.
+
+    The index lets the site search and list a database with a single request, instead of one request for each page.
+    Items are written as rows of ``INDEX_FIELDS`` values, in page order.
+
+    Parameters
+    ----------
+    db : str
+        Database item type.
+    all_items : list
+        Database items, sorted by ``_get_page_sort_key``, which is also the page order.
+    """
+    details = databases[db].get('index_details', {})
+    rows = []
+    for item in all_items:
+        year, youtube_id = details.get(str(item['id']), (None, None))
+        rows.append([item['id'], item['title'], year, item.get('imdb_id'), youtube_id])
+
+    index_file = os.path.join(os.path.dirname(databases[db]['path']), INDEX_FILENAME)
+    output_writer.write(
+        path=index_file,
+        content=json.dumps({'fields': INDEX_FIELDS, 'items': rows}, separators=(',', ':')),
+    )
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Normalize a title or search term for the search index.
+
+    Text is decomposed and lowercased, every combining mark is removed and runs of punctuation and whitespace become a
+    single space. The site applies the same normalization to search terms, and both are tested against
+    ``tests/fixtures/search_normalization.json``.
+
+    Parameters
+    ----------
+    text : str
+        Text to normalize.
+
+    Returns
+    -------
+    str
+        Normalized text.
+    """
+    decomposed = unicodedata.normalize('NFKD', text).lower()
+    # every mark category, like the \p{M} class the site uses, not only marks with a combining class
+    stripped = ''.join(character for character in decomposed if not unicodedata.category(character).startswith('M'))
+    return SEARCH_SEPARATOR_PATTERN.sub(' ', stripped).strip()
+
+
+def get_search_trigrams(text: str) -> set:
+    """
+    Return the trigrams of normalized text, padded with a space so short words and word starts have trigrams.
+
+    Parameters
+    ----------
+    text : str
+        Normalized text.
+
+    Returns
+    -------
+    set
+        Distinct trigrams of the text.
+    """
+    padded = f' {text} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def _write_search_index(db: str, all_items: list) -> None:
+    """
+    Write the trigram search index of a database.
+
+    Positions refer to rows of the database index, which are in page order, so a position is also the sort key of
+    an item. Each trigram maps to the ascending positions of the titles that contain it, delta encoded to keep the
+    file small. The site only scores the titles that share the most trigrams with a search term.
+
+    Parameters
+    ----------
+    db : str
+        Database item type.
+    all_items : list
+        Database items, sorted by ``_get_page_sort_key``, which is also the page order.
+    """
+    titles = [normalize_search_text(text=str(item['title'])) for item in all_items]
+    postings = defaultdict(list)
+    for position, title in enumerate(titles):
+        for trigram in get_search_trigrams(text=title):
+            postings[trigram].append(position)
+
+    trigrams = {}
+    for trigram in sorted(postings):
+        positions = postings[trigram]
+        trigrams[trigram] = [positions[0]] + [current - previous for previous, current in zip(positions, positions[1:])]
+
+    search_index_file = os.path.join(os.path.dirname(databases[db]['path']), SEARCH_INDEX_FILENAME)
+    output_writer.write(path=search_index_file, content=json.dumps(
+        {'titles': titles, 'trigrams': trigrams},
+        ensure_ascii=False,
+        separators=(',', ':'),
+    ))
+
+
+def _get_themes_fields(db: str) -> list:
+    """Return the columns of the theme projection of a database. Only movies have IMDb ids."""
+    return [field for field in THEMES_FIELDS if db == 'movie' or field != 'imdb_id']
+
+
+def _write_themes_file(db: str, all_items: list) -> None:
+    """
+    Write the theme projection of a database.
+
+    Most clients only need the theme of each item, so the projection is a table of the items with a YouTube theme,
+    sorted by id, with their YouTube video id and the time the theme was last edited. The values were collected while
+    the items were in memory, so no item file is read again.
+
+    Parameters
+    ----------
+    db : str
+        Database item type.
+    all_items : list
+        Items in the database outputs.
+    """
+    fields = _get_themes_fields(db=db)
+    details = databases[db].get('index_details', {})
+    edited_timestamps = databases[db].get('edited_timestamps', {})
+
+    rows = []
+    for item in _iter_items_by_id(all_items=all_items):
+        item_id = str(item['id'])
+        youtube_id = details.get(item_id, (None, None))[1]
+        if not youtube_id:
+            continue
+        values = {
+            'id': item['id'],
+            'imdb_id': item.get('imdb_id'),
+            'youtube_id': youtube_id,
+            'edited': edited_timestamps.get(item_id),
+        }
+        rows.append([values[field] for field in fields])
+
+    themes_file = os.path.join(os.path.dirname(databases[db]['path']), THEMES_FILENAME)
+    output_writer.write(
+        path=themes_file,
+        content=json.dumps({'fields': fields, 'items': rows}, separators=(',', ':')),
+    )
+
+
+def _load_manifest_items(manifest_file: str) -> tuple[dict, str]:
+    """
+    Load the item entries of the previous content manifest.
+
+    Parameters
+    ----------
+    manifest_file : str
+        Path of the manifest.
+
+    Returns
+    -------
+    tuple[dict, str]
+        Entries by item id, and the SHA-256 hash of the manifest file. Both are empty when there is no valid manifest.
+    """
+    try:
+        with open(file=manifest_file, mode='rb') as manifest_f:
+            content = manifest_f.read()
+        items = json.loads(content)['items']
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}, ''
+    return (items, hashlib.sha256(content).hexdigest()) if isinstance(items, dict) else ({}, '')
+
+
+def _build_manifest_items(db: str, all_items: list) -> dict:
+    """
+    Build the content manifest entries of a database.
+
+    The manifest maps each item id to the SHA-256 hash and size of its item file, and to the time its theme was last
+    edited, so a mirror can fetch this one file and then download only the items whose hash changed.
+
+    Items are hashed when the daily update writes or loads their file, so the manifest only reads the files of items
+    that were not hashed in this run. The hashes never depend on file modification times, which git does not keep.
+
+    Parameters
+    ----------
+    db : str
+        Database item type.
+    all_items : list
+        Items in the database outputs, in page order.
+
+    Returns
+    -------
+    dict
+        Manifest entries by item id, in page order. Items without a file are left out.
+    """
+    content_hashes = databases[db].get('content_hashes', {})
+    edited_timestamps = databases[db].get('edited_timestamps', {})
+
+    items = {}
+    for item in all_items:
+        item_id = str(item['id'])
+        if item_id in content_hashes:
+            digest, size = content_hashes[item_id]
+        else:
+            try:
+                with open(file=os.path.join(databases[db]['path'], f'{item_id}.json'), mode='rb') as item_f:
+                    data = item_f.read()
+            except OSError:
+                continue  # items without a file have nothing to mirror
+            digest, size = hashlib.sha256(data).hexdigest(), len(data)
+        items[item_id] = {'hash': digest, 'size': size, 'edited': edited_timestamps.get(item_id)}
+
+    return items
+
+
+def _serialize_manifest(items: dict) -> bytes:
+    """Serialize the content manifest of a database."""
+    return json.dumps(
+        {'algorithm': 'sha256', 'count': len(items), 'items': items},
+        separators=(',', ':'),
+    ).encode('utf-8')
+
+
+def _write_manifest_file(db: str, content: bytes) -> None:
+    """Write the serialized content manifest of a database."""
+    output_writer.write(path=os.path.join(os.path.dirname(databases[db]['path']), MANIFEST_FILENAME), content=content)
+
+
+def _get_bundle_directory(db: str) -> str:
+    """Return the bundle directory of a database, with the same name as the database directory on the site."""
+    return os.path.join(bundle_path, os.path.basename(os.path.dirname(databases[db]['path'])))
+
+
+def _load_bundle_lines(db: str, manifest_hash: str) -> dict:
+    """
+    Load the lines of the previous bundle of a database by item id.
+
+    The bundle is not committed with the manifest, so its lines are only used when the bundle was written together
+    with the previous manifest.
+
+    Parameters
+    ----------
+    db : str
+        Database item type.
+    manifest_hash : str
+        SHA-256 hash of the previous manifest file.
+
+    Returns
+    -------
+    dict
+        Bundle lines by item id, or an empty dictionary when there is no bundle of the previous manifest.
+    """
+    directory = _get_bundle_directory(db=db)
+    try:
+        with open(file=os.path.join(directory, BUNDLE_MANIFEST_HASH_FILENAME), mode='r') as hash_f:
+            if not manifest_hash or hash_f.read() != manifest_hash:
+                return {}
+        with open(file=os.path.join(directory, BUNDLE_FILENAME), mode='rb') as bundle_f:
+            bundle = bundle_f.read()
+        with open(file=os.path.join(directory, BUNDLE_INDEX_FILENAME), mode='rb') as index_f:
+            records = list(BUNDLE_INDEX_RECORD.iter_unpack(index_f.read()))
+    except (OSError, struct.error):
+        return {}
+    return {str(key): bundle[offset:offset + length] for key, offset, length in records}
+
+
+def _write_bundle_files(db: str,
+                        all_items: list,
+                        manifest_items: dict,
+                        previous_items: dict,
+                        previous_manifest_hash: str,
+                        manifest_hash: str) -> None:
+    """
+    Write the bundle of every item in a database, with its offset indexes.
+
+    The bundle is written to ``bundle_path`` instead of the database, because a full second copy of every item would
+    grow the database branch on every run. The workflow publishes it with the site, and keeps it between runs in its
+    cache. The bundle has one compact JSON line for each item, in id order. Each index is a sorted array of fixed width
+    ``BUNDLE_INDEX_RECORD`` records, with the key, byte offset and length of a line, so consumers can find an item
+    with a binary search over a memory mapped index, without parsing the bundle. Movies also get an index by the
+    number of their IMDb id.
+
+    Lines of items whose hash did not change since the previous manifest are copied from the previous bundle, so only
+    the item files that changed are read and serialized again.
+
+    Parameters
+    ----------
+    db : str
+        Database item type.
+    all_items : list
+        Items in the database outputs.
+    manifest_items : dict
+        Content manifest entries of this run, by item id.
+    previous_items : dict
+        Content manifest entries of the previous run, by item id.
+    previous_manifest_hash : str
+        SHA-256 hash of the previous manifest file.
+    manifest_hash : str
+        SHA-256 hash of the manifest file of this run.
+    """
+    previous_lines = _load_bundle_lines(db=db, manifest_hash=previous_manifest_hash)
+    directory = _get_bundle_directory(db=db)
+    # recorded first, so a bundle interrupted before the manifest is written never matches the previous manifest
+    output_writer.write(path=os.path.join(directory, BUNDLE_MANIFEST_HASH_FILENAME), content=manifest_hash)
+    for filename in (BUNDLE_FILENAME, BUNDLE_INDEX_FILENAME, BUNDLE_IMDB_INDEX_FILENAME):
+        # the bundles moved out of the database
+        output_writer.remove(path=os.path.join(os.path.dirname(databases[db]['path']), filename))
+    lines = []
+    id_records = []
+    imdb_records = []
+    offset = 0
+    for item in _iter_items_by_id(all_items=all_items):
+        item_id = str(item['id'])
+        entry = manifest_items.get(item_id)
+        if entry is None:
+            continue
+
+        previous = previous_items.get(item_id)
+        line = previous_lines.get(item_id)
+        if line is None or not isinstance(previous, dict) or previous.get('hash') != entry['hash']:
+            try:
+                with open(file=os.path.join(databases[db]['path'], f'{item_id}.json'), mode='r') as item_f:
+                    data = json.load(fp=item_f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            line = json.dumps(obj=data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+        id_records.append((int(item_id), offset, len(line)))
+        imdb_id = item.get('imdb_id')
+        if imdb_id and IMDB_ID_PATTERN.fullmatch(imdb_id):
+            imdb_records.append((int(imdb_id[2:]), offset, len(line)))
+        lines.append(line)
+        offset += len(line) + 1  # lines end with a newline, which is not part of their length
+
+    output_writer.write(path=os.path.join(directory, BUNDLE_FILENAME), content=b''.join(line + b'\n' for line in lines))
+    output_writer.write(
+        path=os.path.join(directory, BUNDLE_INDEX_FILENAME),
+        content=b''.join(BUNDLE_INDEX_RECORD.pack(*record) for record in id_records),
+    )
+    if db == 'movie':
+        output_writer.write(
+            path=os.path.join(directory, BUNDLE_IMDB_INDEX_FILENAME),
+            content=b''.join(BUNDLE_INDEX_RECORD.pack(*record) for record in sorted(imdb_records)),
+        )
+
+
+def _write_pages_file(db: str, all_items: list, buckets: list, next_page: int) -> None:
+    """
+    Write the page metadata for a database, with the page buckets in display order.
+
+    The number of the next new page is recorded too, so later updates never give a new page the number of a page
+    that was merged away.
+    """
+    pages = {
+        'count': len(all_items),
+        'pages': len(buckets),
+        'next_page': max(next_page, max(page_number for page_number, _, _ in buckets) + 1),
+        'buckets': [
+            {
+                'page': page_number,
+                'count': end - start,
+                'start': list(_get_page_sort_key(item=all_items[start])),
+            }
+            for page_number, start, end in buckets
+        ],
+        'index': {
+            'file': INDEX_FILENAME,
+            'fields': INDEX_FIELDS,
+        },
+        'search_index': {
+            'file': SEARCH_INDEX_FILENAME,
+        },
+        'manifest': {
+            'file': MANIFEST_FILENAME,
+        },
+        'themes': {
+            'file': THEMES_FILENAME,
+            'fields': _get_themes_fields(db=db),
+        },
+        'changes': {
+            'directory': CHANGES_DIRNAME,
+            'daily': 'YYYY-MM-DD.jsonl',
+            'monthly': 'YYYY-MM.jsonl',
+        },
+        'bundle': {
+            'file': BUNDLE_FILENAME,
+            'index': BUNDLE_INDEX_FILENAME,
+            'record_format': BUNDLE_INDEX_RECORD.format,
+        },
+    }
+
+    if output_writer.compress:
+        # the compressed copies only exist when the daily update runs with compression
+        for key in ('index', 'search_index', 'manifest', 'themes'):
+            pages[key]['gzip'] = f'{pages[key]["file"]}.gz'
+
+    if db == 'movie':
+        pages['imdb_count'] = len({item['imdb_id'] for item in all_items if item.get('imdb_id')})
+        pages['bundle']['imdb_index'] = BUNDLE_IMDB_INDEX_FILENAME
+
+    pages_file = os.path.join(os.path.dirname(databases[db]['path']), 'pages.json')
+    output_writer.write_json(path=pages_file, obj=pages)
+
+
+def _write_metrics_file(db: str, all_items: list) -> None:
+    """
+    Write the volatile field metrics of a database.
+
+    Items that were not refreshed in this run keep their metrics from the existing file.
+
+    Parameters
+    ----------
+    db : str
+        Database type.
+    all_items : list
+        Items in the database outputs.
+    """
+    if 'metrics' not in databases[db].get('volatile_fields', {}).values():
+        return
+
+    metrics_file = os.path.join(os.path.dirname(databases[db]['path']), 'metrics.json')
+    try:
+        with open(file=metrics_file, mode='r') as metrics_f:
+            existing_metrics = json.load(fp=metrics_f)
+    except (OSError, json.JSONDecodeError):
+        existing_metrics = {}
+
+    refreshed_metrics = databases[db].get('metrics', {})
+    metrics = {}
+    for item in all_items:
+        item_id = str(item['id'])
+        item_metrics = refreshed_metrics.get(item_id, existing_metrics.get(item_id))
+        if item_metrics:
+            metrics[item_id] = item_metrics
+
+    # one entry per line, so the daily metric changes only rewrite the lines of the items that changed
+    entries = [
+        f'{json.dumps(item_id)}:{json.dumps(item_metrics, separators=(",", ":"), sort_keys=True)}'
+        for item_id, item_metrics in sorted(metrics.items())
+    ]
+    output_writer.write(path=metrics_file, content='{\n' + ',\n'.join(entries) + '\n}')
+
+
+def _build_database_plot_values(timestamps: list) -> tuple[list, list]:
+    """
+    Build cumulative date and count values for the database size plot.
+
+    Timestamps are bucketed by UTC day, the same day used for the trailing point of the current date.
+
+    Parameters
+    ----------
+    timestamps : list
+        Theme added timestamps, in seconds since the epoch.
+
+    Returns
+    -------
+    tuple[list, list]
+        Days in ``YYYY-MM-DD`` format, and the number of themes added up to and including each day.
+    """
+    days, counts = np.unique(
+        np.floor_divide(np.asarray(timestamps, dtype=np.float64), 86400).astype(np.int64),
+        return_counts=True,
+    )
+    x_values = np.datetime_as_string(days.astype('datetime64[D]'), unit='D').tolist()
+    y_values = np.cumsum(counts).tolist()
+
+    # get the current date in human-readable format
+    current_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    if x_values[-1] != current_date:
+        x_values.append(current_date)  # add the current date
+        y_values.append(y_values[-1])  # add the last value again to indicate no increase
+
+    return x_values, y_values
+
+
+def _get_plot_value_ticks(max_value: int) -> list:
+    """
+    Get evenly spaced y-axis ticks, using a step of 1, 2 or 5 times a power of ten.
+
+    Parameters
+    ----------
+    max_value : int
+        Largest value on the axis.
+
+    Returns
+    -------
+    list
+        Tick values, starting at zero and ending at or above the largest value.
+    """
+    magnitude = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            step = magnitude * multiplier
+            if step * PLOT_MAX_VALUE_TICKS >= max_value:
+                return list(range(0, -(-max_value // step) * step + 1, step))
+        magnitude *= 10
+
+
+def _get_plot_date_ticks(start: date, end: date) -> list:
+    """
+    Get x-axis date ticks, every few days for short ranges and on month boundaries for longer ones.
+
+    Parameters
+    ----------
+    start : date
+        First day on the axis.
+    end : date
+        Last day on the axis.
+
+    Returns
+    -------
+    list
+        Tick dates between the start and end, inclusive.
+    """
+    span = (end - start).days
+    for days in PLOT_DATE_TICK_DAYS:
+        if span // days < PLOT_MAX_DATE_TICKS:
+            return [start + timedelta(days=offset) for offset in range(0, span + 1, days)]
+
+    ticks = []
+    for months in PLOT_DATE_TICK_MONTHS:
+        # first month boundary on or after the start, aligned to the step
+        month_index = (start.year * 12) + start.month - 1 + (1 if start.day > 1 else 0)
+        month_index += -month_index % months
+        ticks = []
+        while (tick := date(month_index // 12, (month_index % 12) + 1, 1)) <= end:
+            ticks.append(tick)
+            month_index += months
+        if len(ticks) <= PLOT_MAX_DATE_TICKS:
+            break
+
+    return ticks
+
+
+def render_database_size_svg(title: str, x_values: list, y_values: list) -> str:
+    """
+    Render the database size plot as a line chart SVG.
+
+    The markup only depends on the plotted values, so unchanged plots produce identical files.
+
+    Parameters
+    ----------
+    title : str
+        Plot title.
+    x_values : list
+        Days in ``YYYY-MM-DD`` format, in ascending order.
+    y_values : list
+        Cumulative theme count for each day.
+
+    Returns
+    -------
+    str
+        SVG markup.
+    """
+    top, right, bottom, left = PLOT_MARGINS
+    plot_width = PLOT_WIDTH - left - right
+    plot_height = PLOT_HEIGHT - top - bottom
+    days = [date.fromisoformat(x) for x in x_values]
+    span = max((days[-1] - days[0]).days, 1)
+    value_ticks = _get_plot_value_ticks(max_value=max(max(y_values), 1))
+
+    def scale_x(day: date) -> float:
+        return left + (plot_width * (day - days[0]).days / span)
+
+    def scale_y(value: int) -> float:
+        return top + plot_height - (plot_height * value / value_ticks[-1])
+
+    parts = [
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{PLOT_WIDTH}" height="{PLOT_HEIGHT}" '
+        f'viewBox="0 0 {PLOT_WIDTH} {PLOT_HEIGHT}" role="img" aria-labelledby="title">',
+        f'<title id="title">{escape(title)}</title>',
+        '<style>',
+        f'text{{fill:{PLOT_TEXT_COLOR};font-family:-apple-system,BlinkMacSystemFont,"Segoe UI",sans-serif;'
+        'font-size:10px}',
+        '.title{font-size:14px}',
+        f'.grid{{stroke:{PLOT_GRID_COLOR};stroke-width:0.8}}',
+        f'.frame{{fill:none;stroke:{PLOT_GRID_COLOR}}}',
+        f'.line{{fill:none;stroke:{PLOT_LINE_COLOR};stroke-width:1.5;stroke-linejoin:round}}',
+        '</style>',
+        f'<text class="title" x="{left + (plot_width / 2):.1f}" y="{top - 14}" text-anchor="middle">'
+        f'{escape(title)}</text>',
+        f'<text x="16" y="{top + (plot_height / 2):.1f}" text-anchor="middle" '
+        f'transform="rotate(-90 16 {top + (plot_height / 2):.1f})">Themes</text>',
+    ]
+
+    for value in value_ticks:
+        y = scale_y(value)
+        parts.extend([
+            f'<line class="grid" x1="{left}" x2="{left + plot_width}" y1="{y:.1f}" y2="{y:.1f}"/>',
+            f'<text x="{left - 6}" y="{y + 3:.1f}" text-anchor="end">{value:,}</text>',
+        ])
+
+    label_y = top + plot_height + 14
+    for tick in _get_plot_date_ticks(start=days[0], end=days[-1]):
+        x = scale_x(tick)
+        parts.extend([
+            f'<line class="grid" x1="{x:.1f}" x2="{x:.1f}" y1="{top}" y2="{top + plot_height}"/>',
+            f'<text x="{x:.1f}" y="{label_y}" text-anchor="end" '
+            f'transform="rotate(-30 {x:.1f} {label_y})">{tick.isoformat()}</text>',
+        ])
+
+    points = ' '.join(f'{scale_x(day):.1f},{scale_y(value):.1f}' for day, value in zip(days, y_values))
+    parts.extend([
+        f'<rect class="frame" x="{left}" y="{top}" width="{plot_width}" height="{plot_height}"/>',
+        f'<polyline class="line" points="{points}"/>',
+        '</svg>',
+    ])
+
+    return '\n'.join(parts) + '\n'
+
+
+def _render_database_size_plot_matplotlib(title: str, x_values: list, y_values: list) -> bytes:
+    """
+    Render the database size plot with matplotlib.
+
+    Matplotlib is only imported here, so the native renderer does not pay for loading it.
+
+    Parameters
+    ----------
+    title : str
+        Plot title.
+    x_values : list
+        Days in ``YYYY-MM-DD`` format, in ascending order.
+    y_values : list
+        Cumulative theme count for each day.
+
+    Returns
+    -------
+    bytes
+        SVG markup.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    matplotlib.rcParams['svg.hashsalt'] = 'ThemerrDB'  # stable SVG element ids, so unchanged plots are not rewritten
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
 
-def _write_database_size_plot(db: str, all_items: list) -> None:
-    """Write the database size plot SVG."""
-    timestamps = _load_theme_timestamps(db=db, all_items=all_items)
-    x_values, y_values = _build_database_plot_values(timestamps=timestamps)
     x_dates = [datetime.strptime(d, '%Y-%m-%d') for d in x_values]
 
-    fig, ax = plt.subplots(figsize=(10, 4))
-    fig.patch.set_alpha(0)
-    ax.patch.set_alpha(0)
-
-    ax.plot(x_dates, y_values, color='#1f77b4')
-    ax.set_title(databases[db]['title'], color='#777')
-    ax.set_ylabel('Themes', color='#777')
-    ax.tick_params(colors='#777')
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-    ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-    fig.autofmt_xdate()
-    ax.grid(True, color='#404040')
-    for spine in ax.spines.values():
-        spine.set_edgecolor('#404040')
+    # pyplot keeps global figure state, so plots are rendered one at a time
+    with matplotlib_lock:
+        fig, ax = plt.subplots(figsize=(10, 4))
+        fig.patch.set_alpha(0)
+        ax.patch.set_alpha(0)
+
+        ax.plot(x_dates, y_values, color=PLOT_LINE_COLOR)
+        ax.set_title(title, color=PLOT_TEXT_COLOR)
+        ax.set_ylabel('Themes', color=PLOT_TEXT_COLOR)
+        ax.tick_params(colors=PLOT_TEXT_COLOR)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        fig.autofmt_xdate()
+        ax.grid(True, color=PLOT_GRID_COLOR)
+        for spine in ax.spines.values():
+            spine.set_edgecolor(PLOT_GRID_COLOR)
+
+        svg = io.BytesIO()
+        # no date metadata, so the SVG only changes when the plot does
+        fig.savefig(svg, format='svg', bbox_inches='tight', transparent=True, metadata={'Date': None})
+        plt.close(fig)
+
+    return svg.getvalue()
+
+
+def _write_database_size_plot(db: str) -> None:
+    """Write the database size plot SVG from the theme timestamps collected during the refresh."""
+    timestamps = databases[db].get('theme_timestamps', [])
+    if not timestamps:
+        return
+    x_values, y_values = _build_database_plot_values(timestamps=timestamps)
+    title = databases[db]['title']
+
+    if getattr(args, 'plot_renderer', 'svg') == 'matplotlib':
+        svg = _render_database_size_plot_matplotlib(title=title, x_values=x_values, y_values=y_values)
+    else:
+        svg = render_database_size_svg(title=title, x_values=x_values, y_values=y_values)
 
     svg_file = os.path.join(
         os.path.dirname(databases[db]['path']),
-        f'{databases[db]["title"].lower()}_plot.svg'.replace(' ', '_')
+        f'{title.lower()}_plot.svg'.replace(' ', '_')
     )
-    fig.savefig(svg_file, format='svg', bbox_inches='tight', transparent=True)
-    plt.close(fig)
+    output_writer.write(path=svg_file, content=svg)
 
 
-def _write_database_outputs(db: str) -> None:
-    """Write daily update JSON and SVG outputs for one database."""
-    items_per_page = 10
-    all_items = sorted(databases[db]['all_items'], key=itemgetter('title'), reverse=False)
-    if not all_items:
-        return
+def _write_database_pages(db: str) -> None:
+    """Write the page, chunk, index, bundle and metrics outputs for one database."""
+    all_items = databases[db]['all_items']
+    try:
+        if isinstance(all_items, ItemAccumulator):
+            all_items.sort()
+        else:
+            all_items = sorted(all_items, key=_get_page_sort_key)
+        if not all_items:
+            return
+
+        pages_file = os.path.join(os.path.dirname(databases[db]['path']), 'pages.json')
+        previous_buckets, next_page = _load_page_buckets(pages_file=pages_file)
+        buckets = _build_page_buckets(
+            all_items=all_items,
+            previous_buckets=previous_buckets,
+            next_page_number=next_page,
+        )
+        _write_chunk_files(db=db, all_items=all_items, buckets=buckets)
+        _write_index_file(db=db, all_items=all_items)
+        _write_search_index(db=db, all_items=all_items)
+        _write_themes_file(db=db, all_items=all_items)
+        manifest_file = os.path.join(os.path.dirname(databases[db]['path']), MANIFEST_FILENAME)
+        previous_items, previous_manifest_hash = _load_manifest_items(manifest_file=manifest_file)
+        manifest_items = _build_manifest_items(db=db, all_items=all_items)
+        manifest = _serialize_manifest(items=manifest_items)
+        _write_bundle_files(
+            db=db,
+            all_items=all_items,
+            manifest_items=manifest_items,
+            previous_items=previous_items,
+            previous_manifest_hash=previous_manifest_hash,
+            manifest_hash=hashlib.sha256(manifest).hexdigest(),
+        )
+        _write_manifest_file(db=db, content=manifest)
+        _write_pages_file(db=db, all_items=all_items, buckets=buckets, next_page=next_page)
+        _write_metrics_file(db=db, all_items=all_items)
+    finally:
+        if isinstance(all_items, ItemAccumulator):
+            all_items.close()  # the items are not read again, so the temporary file of spilled items is removed
 
-    chunks = [all_items[x:x + items_per_page] for x in range(0, len(all_items), items_per_page)]
-    _write_chunk_files(db=db, chunks=chunks)
-    _write_pages_file(db=db, all_items=all_items, chunks=chunks)
-    _write_database_size_plot(db=db, all_items=all_items)
 
+def _run_timed_task(name: str, func: Callable, **kwargs) -> float:
+    """
+    Run an output stage task and report how long it took.
 
-def _run_daily_update() -> None:
-    """Run the daily update workflow."""
-    # migration tasks go here
-    _queue_daily_update_items()
+    Parameters
+    ----------
+    name : str
+        Task name used in the report.
+    func : Callable
+        Task to run.
+    **kwargs
+        Keyword arguments for the task.
+
+    Returns
+    -------
+    float
+        Task duration, in seconds.
+    """
+    start_time = time.perf_counter()
+    func(**kwargs)
+    elapsed_time = time.perf_counter() - start_time
+    print(f'Output task {name} finished in {elapsed_time:.2f}s')
 
-    # finish queue before writing `all` files
-    queue.join()
+    return elapsed_time
 
-    for db in databases:
-        _write_database_outputs(db=db)
 
-    build_top_contributor_images()
+class OutputStage:
+    """
+    Thread pool that writes the daily update outputs while items are still being refreshed.
+
+    The pages and the plot of a database only read its refreshed items, so they are independent tasks that can start as
+    soon as the last item of that database is processed.
+    """
+
+    def __init__(self, max_workers: int = OUTPUT_STAGE_WORKERS):
+        """
+        Initialize the output stage.
+
+        Parameters
+        ----------
+        max_workers : int
+            Number of output worker threads.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='output')
+        self.futures = []
+        self.submitted = set()
+        self.lock = Lock()
+        self.started = time.perf_counter()
+
+    def submit(self, name: str, func: Callable, **kwargs) -> None:
+        """
+        Start an output task.
+
+        Parameters
+        ----------
+        name : str
+            Task name used in the report.
+        func : Callable
+            Task to run.
+        **kwargs
+            Keyword arguments for the task.
+        """
+        future = self.executor.submit(_run_timed_task, name=name, func=func, **kwargs)
+        with self.lock:
+            self.futures.append(future)
+
+    def submit_database(self, db: str) -> None:
+        """Start the output tasks of a database, unless they were already started."""
+        with self.lock:
+            if db in self.submitted:
+                return
+            self.submitted.add(db)
+
+        print(f'Database {db} refreshed after {time.perf_counter() - self.started:.2f}s, writing outputs')
+        self.submit(name=f'{db} pages', func=_write_database_pages, db=db)
+        self.submit(name=f'{db} plot', func=_write_database_size_plot, db=db)
+
+    def wait(self) -> None:
+        """Start the outputs of the remaining databases and wait for every task to finish."""
+        for db in databases:
+            self.submit_database(db=db)
+
+        self.executor.shutdown(wait=True)
+        # re-raise the first task failure after the remaining tasks finish
+        task_seconds = sum(future.result() for future in self.futures)
+        print(f'Output stage finished after {time.perf_counter() - self.started:.2f}s '
+              f'({task_seconds:.2f}s of task time)')
+
+
+def _run_daily_update() -> None:
+    """Run the daily update workflow."""
+    global output_writer, response_cache
+
+    started = int(datetime.now(timezone.utc).timestamp())
+    output_writer = OutputWriter(compress=getattr(args, 'compress', False), manifest_path=compression_manifest_file)
+    if output_writer.compress:
+        output_writer.load_manifest()
+    memory_cap = getattr(args, 'items_memory_cap', DEFAULT_ITEMS_MEMORY_CAP_MIB) * 1024 * 1024
+    for db, config in databases.items():
+        config['all_items'] = ItemAccumulator(imdb_ids=db == 'movie', memory_cap=memory_cap)
+    state = _load_daily_update_state()
+    response_cache = ResponseCache(path=response_cache_file)
+    response_cache.load()
+
+    _ensure_queue_workers()
+
+    # the leaderboard only reads contributor files, so its GitHub requests overlap the refresh
+    output_stage = OutputStage()
+    output_stage.submit(name='top contributors', func=build_top_contributor_images)
+    queue.on_complete = output_stage.submit_database
+    try:
+        # migration tasks go here
+        output_writer.remove(path=legacy_response_cache_file)  # the response cache moved out of the database
+        changes = _get_daily_update_changes(state=state, started=started)
+        _queue_daily_update_items(changes=changes)
+
+        # the outputs of each database are written once its items are refreshed
+        queue.join()
+        _print_queue_metrics()
+        failed_ids = queue.pop_failed_ids()
+    finally:
+        queue.on_complete = None
+
+    # the feed is compacted once the refresh recorded its own events
+    output_stage.submit(name='change feed compaction', func=compact_change_feeds)
+
+    print(f'Response cache: {response_cache.unchanged} unchanged and {response_cache.changed} changed responses')
+    response_cache.save()
+    response_cache = None
+
+    output_stage.wait()
+    output_writer.save_manifest()
+    transport.print_stats()
+    output_writer.print_stats()
+
+    _write_daily_update_state(state={
+        'failed_ids': failed_ids,
+        'last_full_refresh': started if changes is None else state['last_full_refresh'],
+        'last_run': started,
+    })
 
 
 def main() -> None:
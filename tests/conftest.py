@@ -1,6 +1,9 @@
 # standard imports
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import json
 import os
+import threading
+from urllib.parse import urlparse
 
 # lib imports
 import pytest
@@ -20,6 +23,23 @@ GOLDENEYE_IGDB_URL = 'https://www.igdb.com/games/goldeneye-007'
 RICKROLL_YOUTUBE_URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
 
 
+@pytest.fixture(autouse=True)
+def bundle_directory(tmp_path, monkeypatch):
+    """Write the item bundles of the daily update to a temporary directory."""
+    monkeypatch.setattr(updater, 'bundle_path', str(tmp_path / 'bundle'))
+    return tmp_path / 'bundle'
+
+
+@pytest.fixture(autouse=True)
+def daily_update_files(tmp_path, monkeypatch):
+    """Keep the state, response cache and compression manifest of the daily update out of the repository."""
+    monkeypatch.setattr(updater, 'daily_update_state_file', str(tmp_path / 'database' / 'daily_update.json'))
+    monkeypatch.setattr(updater, 'response_cache_file', str(tmp_path / '.cache' / 'response_cache.json'))
+    monkeypatch.setattr(updater, 'legacy_response_cache_file', str(tmp_path / 'database' / 'response_cache.json'))
+    monkeypatch.setattr(updater, 'compression_manifest_file', str(tmp_path / 'database' / 'compression_manifest.json'))
+    return tmp_path / 'database' / 'daily_update.json'
+
+
 @pytest.fixture(scope='session')
 def igdb_auth():
     """Skip tests if no auth id or secret."""
@@ -230,3 +250,73 @@ def exceptions_file(submission_workspace):
     yield exceptions_file
 
     os.remove(exceptions_file)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Reply to requests with the scripted responses of a ``StubServer``."""
+    protocol_version = 'HTTP/1.1'  # keep connections alive like the real APIs
+
+    def do_GET(self):
+        self.server.stub.respond(handler=self)
+
+    def do_POST(self):
+        self.server.stub.respond(handler=self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """
+    Local HTTP server that replays scripted responses.
+
+    Each route maps a URL path to a list of ``(status, body, headers)`` responses. Responses are used in order and
+    the last response is repeated once the script runs out.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubRequestHandler)
+        self.httpd.stub = self
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def add_route(self, path: str, *responses):
+        self.routes[path] = list(responses)
+
+    def respond(self, handler: BaseHTTPRequestHandler):
+        parsed_url = urlparse(handler.path)
+        content_length = int(handler.headers.get('Content-Length', 0))
+        with self.lock:
+            self.requests.append({
+                'body': handler.rfile.read(content_length).decode('utf-8'),
+                'headers': dict(handler.headers),
+                'method': handler.command,
+                'path': parsed_url.path,
+                'query': parsed_url.query,
+            })
+            responses = self.routes.get(parsed_url.path, [(404, {}, {})])
+            status, body, headers = responses.pop(0) if len(responses) > 1 else responses[0]
+
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(payload)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+
+@pytest.fixture(scope='function')
+def stub_server():
+    """Run a local HTTP server with scripted responses."""
+    server = StubServer()
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -17,6 +17,15 @@ const {
 const ITEM_LOADER_PATH = '../gh-pages-template/assets/js/item_loader.js'
 const YOUTUBE_PLAYER_PATH = '../gh-pages-template/assets/js/yt.js'
 const TEST_URL_BASE = 'https://preview.example'
+// shared with the pytest suite, so the site and the daily update normalize search text the same way
+const SEARCH_NORMALIZATION_CASES = require('./fixtures/search_normalization.json')
+
+/**
+ * Page buckets returned for `pages.json` requests, by category directory, instead of the default buckets.
+ *
+ * @type {Object.<string, Object[]>}
+ */
+let pageBucketOverrides = {}
 
 /**
  * Build the page nodes expected by item_loader.js.
@@ -179,6 +188,32 @@ function getItemDetails(url) {
   return Object.entries(details).find(([suffix]) => path.endsWith(suffix))?.[1]
 }
 
+/**
+ * Build a search index fixture with delta encoded trigram postings.
+ *
+ * @param {string[]} titles Normalized titles, in index order.
+ * @returns {{titles: string[], trigrams: Object.<string, number[]>}} Search index.
+ */
+function buildSearchIndex(titles) {
+  const positions = {}
+  titles.forEach((title, position) => {
+    const padded = ` ${title} `
+    for (let index = 0; index < padded.length - 2; index++) {
+      const trigram = padded.slice(index, index + 3)
+      positions[trigram] = positions[trigram] || []
+      if (positions[trigram].at(-1) !== position) {
+        positions[trigram].push(position)
+      }
+    }
+  })
+
+  const trigrams = {}
+  for (const [trigram, trigramPositions] of Object.entries(positions)) {
+    trigrams[trigram] = trigramPositions.map((position, index) => position - (trigramPositions[index - 1] || 0))
+  }
+  return {titles, trigrams}
+}
+
 /**
  * Return a JSON response fixture for an item loader request.
  *
@@ -188,7 +223,20 @@ function getItemDetails(url) {
 function getJsonFixture(url) {
   const path = new URL(url, TEST_URL_BASE).pathname
   if (path.endsWith('/pages.json')) {
-    return {body: {pages: path.includes('/games/') ? 2 : 1}, status: 200}
+    const directory = path.split('/').at(-2)
+    const buckets = pageBucketOverrides[directory] || (path.includes('/games/') ? [{page: 1}, {page: 2}] : [{page: 1}])
+    const nextPage = Math.max(...buckets.map(bucket => bucket.page)) + 1
+    return {body: {buckets, next_page: nextPage, pages: buckets.length}, status: 200}
+  }
+
+  if (path.endsWith('/search_index.json')) {
+    const items = getPageItems(path.replace('search_index.json', 'all_page_1.json'))
+    return {body: buildSearchIndex(items.map(item => item.title.toLowerCase())), status: 200}
+  }
+
+  if (path.endsWith('/all_index.json')) {
+    const items = getPageItems(path.replace('all_index.json', 'all_page_1.json'))
+    return {body: {fields: ['id', 'title'], items: items.map(item => [item.id, item.title])}, status: 200}
   }
 
   const pageItems = getPageItems(path)
@@ -358,6 +406,7 @@ describe('gh-pages item loader', () => {
 
   afterEach(() => {
     jest.restoreAllMocks()
+    pageBucketOverrides = {}
     delete globalThis.changeVideo
     delete globalThis.levenshteinDistance
     delete globalThis.rankingSorter
@@ -494,13 +543,21 @@ describe('gh-pages item loader', () => {
     expect(formData.get('search_button')).toBeNull()
     expect(formData.get('submit_button')).toBeNull()
     expect(globalThis.levenshteinDistance).toHaveBeenCalledWith('goldeneye', 'goldeneye')
-    expect(globalThis.levenshteinDistance).toHaveBeenCalledWith('goldeneye', 'unrelated movie')
+    // titles without a shared trigram are not scored
+    expect(globalThis.levenshteinDistance).not.toHaveBeenCalledWith('goldeneye', 'unrelated movie')
     expect(document.getElementById('Theme Types').classList.contains('d-none')).toBe(true)
     expect(document.getElementById('Movies').classList.contains('d-none')).toBe(true)
     expect(document.getElementById('search-container').textContent).toContain('Clear Results')
     expect(document.getElementById('search-container').textContent).toContain('GoldenEye (1995)')
     expect(document.getElementById('search-container').textContent).not.toContain('Unrelated Movie')
-    expect(findRequest(requests, '/ThemerrDB/movies/all_page_1.json')).toBeDefined()
+    expect(findRequest(requests, '/ThemerrDB/movies/all_index.json')).toBeDefined()
+    expect(findRequest(requests, '/ThemerrDB/movies/search_index.json')).toBeDefined()
+    expect(globalThis.themerrItemLoader.normalize_search_text('  Amélie:  Le Fabuleux_Destin ')).toBe(
+      'amelie le fabuleux destin'
+    )
+    expect(globalThis.themerrItemLoader.get_search_trigrams('up')).toEqual(new Set([' up', 'up ']))
+    // both titles share five trigrams with the term, so they are ordered by index position
+    expect(globalThis.themerrItemLoader.get_search_candidates('movies', 'golden movie')).toEqual([0, 1])
 
     globalThis.themerrItemLoader.load_search_items('movies')
     document.querySelector('#search-container button').click()
@@ -510,6 +567,32 @@ describe('gh-pages item loader', () => {
     expect(document.getElementById('Movies').classList.contains('d-none')).toBe(false)
   })
 
+  test('scores every title when the search term shares no trigram with the index', () => {
+    loadItemLoader()
+    globalThis.themerrItemLoader.show_theme_type('movies')
+    globalThis.run_search()
+    const titles = globalThis.themerrItemLoader.types_dict['movies']['search_index']['titles']
+    const allPositions = titles.map((title, position) => position)
+
+    // a single character only has the padded trigram " q ", which no title contains
+    expect(globalThis.themerrItemLoader.get_search_candidates('movies', 'q')).toEqual(allPositions)
+    // a term of only punctuation normalizes to an empty term without trigrams
+    expect(globalThis.themerrItemLoader.get_search_candidates('movies', '')).toEqual(allPositions)
+
+    globalThis.levenshteinDistance.mockClear()
+    globalThis.themerrItemLoader.get_search_results('movies', 'q')
+    expect(globalThis.levenshteinDistance).toHaveBeenCalledTimes(titles.length)
+    for (let title of titles) {
+      expect(globalThis.levenshteinDistance).toHaveBeenCalledWith('q', title)
+    }
+  })
+
+  test.each(SEARCH_NORMALIZATION_CASES)('normalizes "$text" like the daily update', ({text, normalized}) => {
+    loadItemLoader()
+
+    expect(globalThis.themerrItemLoader.normalize_search_text(text)).toBe(normalized)
+  })
+
   test('skips empty searches', () => {
     loadItemLoader()
     globalThis.themerrItemLoader.set_content_sections_hidden(false)
@@ -546,6 +629,21 @@ describe('gh-pages item loader', () => {
       .toThrow('Untrusted JSON request URL: /ThemerrDB/games/pages.json')
   })
 
+  test('lists page files in bucket order instead of page number order', () => {
+    // pages keep their numbers when other pages are split or merged away, so numbers are not in display order
+    pageBucketOverrides.movies = [{page: 1}, {page: 4}, {page: 5}, {page: 2}]
+    const {requests} = loadItemLoader()
+
+    expect(globalThis.themerrItemLoader.load_page_files('movies')).toEqual([
+      'all_page_1.json',
+      'all_page_4.json',
+      'all_page_5.json',
+      'all_page_2.json'
+    ])
+    expect(globalThis.themerrItemLoader.load_page_files('games')).toEqual(['all_page_1.json', 'all_page_2.json'])
+    expect(findRequest(requests, '/ThemerrDB/movies/pages.json').async).toBe(false)
+  })
+
   test('initializes immediately when loaded after DOM ready', () => {
     globalThis.history.replaceState(null, '', '/#Movies')
 
@@ -0,0 +1,310 @@
+"""
+test_benchmarks.py
+
+This module contains benchmarks for the daily update output stage. The 1,000 item benchmarks always run, while the
+larger sizes only run when the ``THEMERRDB_BENCHMARKS`` environment variable is set.
+"""
+# standard imports
+import builtins
+from datetime import datetime, timezone
+import json
+import os
+import random
+import time
+import tracemalloc
+
+# lib imports
+import pytest
+
+# local imports
+from src import bundle_reader
+from src import updater
+
+
+def benchmark_sizes(*sizes):
+    """Return benchmark sizes, skipping large sizes unless benchmarks are enabled."""
+    return [
+        pytest.param(size, marks=pytest.mark.skipif(
+            size > 1000 and not os.getenv('THEMERRDB_BENCHMARKS'),
+            reason='set THEMERRDB_BENCHMARKS to run large benchmarks',
+        ))
+        for size in sizes
+    ]
+
+
+@pytest.fixture
+def movie_database(tmp_path, monkeypatch):
+    """Use an empty movie database."""
+    movie_dir = tmp_path / 'movies' / 'themoviedb'
+    movie_dir.mkdir(parents=True)
+    monkeypatch.setattr(updater, 'databases', {
+        'movie': {
+            **updater.databases['movie'],
+            'all_items': [],
+            'content_hashes': {},
+            'edited_timestamps': {},
+            'path': str(movie_dir),
+        },
+    })
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+    return movie_dir
+
+
+@pytest.mark.parametrize('size', benchmark_sizes(1000, 10000, 100000))
+def test_benchmark_output_stage_uses_collected_timestamps(size, movie_database, monkeypatch):
+    for item_id in range(size):
+        data = {
+            'id': item_id,
+            'imdb_id': f'tt{item_id:07d}',
+            'title': f'Movie {item_id}',
+            'youtube_theme_added': 1700000000 + item_id * 60,
+        }
+        item_file = movie_database / f'{item_id}.json'
+        item_file.write_text(json.dumps(data), encoding='utf-8')
+        # unchanged items are loaded by the daily update, which hashes them for the manifest
+        updater._append_all_item(
+            item_type='movie',
+            data=updater._load_local_item(item_type='movie', item_file=str(item_file)),
+        )
+
+    # the pass over every item file that the output stage used to make
+    start_time = time.perf_counter()
+    timestamps = []
+    for item in updater.databases['movie']['all_items']:
+        with open(movie_database / f'{item["id"]}.json') as item_f:
+            timestamps.append(json.load(item_f)['youtube_theme_added'])
+    timestamps.sort()
+    file_pass_time = time.perf_counter() - start_time
+
+    # the previous run hashed and bundled every item file
+    updater._write_database_pages(db='movie')
+
+    item_reads = []
+
+    def recording_open(file, *args, **kwargs):
+        if os.path.dirname(str(file)) == str(movie_database):
+            item_reads.append(file)
+        return builtins.open(file, *args, **kwargs)
+
+    monkeypatch.setattr(updater, 'open', recording_open, raising=False)
+    start_time = time.perf_counter()
+    collected = sorted(updater.databases['movie']['theme_timestamps'])
+    collected_time = time.perf_counter() - start_time
+
+    updater._write_database_pages(db='movie')
+
+    print(f'{size} items: reading item files took {file_pass_time:.3f}s, '
+          f'collected timestamps took {collected_time:.3f}s')
+    assert collected == timestamps
+    assert item_reads == []
+    assert collected_time < file_pass_time
+
+
+@pytest.mark.parametrize('size', benchmark_sizes(1000, 10000, 100000))
+def test_benchmark_manifest_uses_collected_hashes(size, movie_database):
+    item_files = []
+    for item_id in range(size):
+        data = {'id': item_id, 'title': f'Movie {item_id}', 'youtube_theme_edited': 1700000000 + item_id}
+        item_file = movie_database / f'{item_id}.json'
+        item_file.write_text(json.dumps(data, indent=4), encoding='utf-8')
+        item_files.append(str(item_file))
+        updater._append_all_item(item_type='movie', data=data)
+    all_items = updater.databases['movie']['all_items']
+
+    start_time = time.perf_counter()
+    hashed = updater._build_manifest_items(db='movie', all_items=all_items)
+    hash_time = time.perf_counter() - start_time
+
+    # the daily update loads every unchanged item anyway, and collects its hash while the content is in memory
+    for item_file in item_files:
+        updater._load_local_item(item_type='movie', item_file=item_file)
+    start_time = time.perf_counter()
+    collected = updater._build_manifest_items(db='movie', all_items=all_items)
+    collected_time = time.perf_counter() - start_time
+
+    print(f'{size} items: hashing item files took {hash_time:.3f}s, using collected hashes took {collected_time:.3f}s')
+    assert collected == hashed
+    assert len(hashed) == size
+
+
+@pytest.mark.parametrize('size', benchmark_sizes(1000, 100000))
+def test_benchmark_bundle_reader_batched_lookups(size, movie_database, bundle_directory):
+    for item_id in range(size):
+        data = {'id': item_id, 'imdb_id': f'tt{item_id:07d}', 'title': f'Movie {item_id}'}
+        (movie_database / f'{item_id}.json').write_text(json.dumps(data), encoding='utf-8')
+        updater._append_all_item(item_type='movie', data=data)
+    updater._write_database_pages(db='movie')
+    requested = random.Random(5).sample(range(size * 2), k=size // 10)
+
+    start_time = time.perf_counter()
+    file_items = {}
+    for item_id in requested:
+        try:
+            with open(movie_database / f'{item_id}.json') as item_f:
+                file_items[item_id] = json.load(item_f)
+        except FileNotFoundError:
+            pass
+    file_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    with bundle_reader.BundleReader(directory=str(bundle_directory / 'movies')) as reader:
+        bundle_items = reader.get_many(item_ids=requested)
+    bundle_time = time.perf_counter() - start_time
+
+    print(f'{size} items: {len(requested)} item file reads took {file_time:.3f}s, '
+          f'batched bundle lookups took {bundle_time:.3f}s')
+    assert bundle_items == file_items
+
+
+def measure_item_memory(items, size: int) -> tuple:
+    """
+    Collect movie items and sort them for the outputs.
+
+    Returns the sorted items, the memory held by the collected items and the peak memory while sorting them.
+    """
+    tracemalloc.start()
+    try:
+        for item_id in range(size):
+            items.append({'id': item_id, 'imdb_id': f'tt{item_id:07d}', 'title': f'Movie {item_id % (size // 2)}'})
+        collected = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        if isinstance(items, updater.ItemAccumulator):
+            items.sort()
+        else:
+            items.sort(key=updater._get_page_sort_key)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return list(items), collected, peak
+
+
+@pytest.mark.parametrize('size', benchmark_sizes(1000, 100000))
+def test_benchmark_item_accumulator_memory(size):
+    list_items, list_collected, list_peak = measure_item_memory(items=[], size=size)
+    accumulated_items, accumulated_collected, accumulated_peak = measure_item_memory(
+        items=updater.ItemAccumulator(imdb_ids=True), size=size)
+    spilled_items, spilled_collected, spilled_peak = measure_item_memory(
+        items=updater.ItemAccumulator(imdb_ids=True, memory_cap=64 * 1024), size=size)
+
+    mib = 2 ** 20
+    print(f'{size} items: list of dicts holds {list_collected / mib:.1f} MiB (sorting peak {list_peak / mib:.1f} MiB), '
+          f'accumulator {accumulated_collected / mib:.1f} MiB ({accumulated_peak / mib:.1f} MiB), '
+          f'spilled accumulator {spilled_collected / mib:.1f} MiB ({spilled_peak / mib:.1f} MiB)')
+    assert accumulated_items == list_items
+    assert spilled_items == list_items
+    assert accumulated_collected < list_collected / 2
+    assert spilled_collected < accumulated_collected
+    assert accumulated_peak < list_peak
+
+
+def build_plot_values_by_scanning(timestamps: list) -> tuple[list, list]:
+    """Build the plot values with the previous list scanning implementation, as a reference."""
+    timestamps_human = [datetime.fromtimestamp(x).strftime('%Y-%m-%d') for x in timestamps]
+    x_values = []
+    y_values = []
+    total_count = 0
+
+    for timestamp_human in timestamps_human:
+        if timestamp_human not in x_values:
+            new_total = timestamps_human.count(timestamp_human) + total_count
+            x_values.append(timestamp_human)
+            y_values.append(new_total)
+            total_count = new_total
+
+    # get the current date in human-readable format
+    current_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    if timestamps_human[-1] != current_date:
+        x_values.append(current_date)  # add the current date
+        y_values.append(y_values[-1])  # add the last value again to indicate no increase
+
+    return x_values, y_values
+
+
+@pytest.fixture
+def utc_local_time(monkeypatch):
+    """Use UTC as the local time zone, the time zone of the CI runners that publish the plots."""
+    monkeypatch.setenv('TZ', 'UTC')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_plot_values_match_previous_implementation(utc_local_time):
+    generator = random.Random(4)
+    timestamps = [generator.randrange(1500000000, 1800000000) for _ in range(2000)]
+    timestamps += [int(datetime.now(timezone.utc).timestamp()), 0, 86399, 86400]
+
+    # the previous implementation expects the timestamps in order, and buckets them by local day
+    expected = build_plot_values_by_scanning(sorted(timestamps))
+    assert updater._build_database_plot_values(timestamps=timestamps) == expected
+
+
+def test_benchmark_plot_values_one_million_timestamps():
+    generator = random.Random(4)
+    timestamps = [generator.randrange(1500000000, 1800000000) for _ in range(1000000)]
+
+    start_time = time.perf_counter()
+    x_values, y_values = updater._build_database_plot_values(timestamps=timestamps)
+    elapsed_time = time.perf_counter() - start_time
+
+    print(f'1000000 timestamps: {elapsed_time:.3f}s for {len(x_values)} days')
+    assert y_values[-1] == len(timestamps)
+    assert all(isinstance(value, int) for value in y_values)
+    # the previous implementation scanned a list for every timestamp and took hours at this size
+    assert elapsed_time < 2
+
+
+def test_benchmark_native_plot_renderer():
+    generator = random.Random(4)
+    timestamps = [generator.randrange(1500000000, 1800000000) for _ in range(100000)]
+    x_values, y_values = updater._build_database_plot_values(timestamps=timestamps)
+
+    start_time = time.perf_counter()
+    svg = updater.render_database_size_svg(title='Movies', x_values=x_values, y_values=y_values)
+    elapsed_time = time.perf_counter() - start_time
+
+    print(f'{len(x_values)} days: {elapsed_time:.3f}s for {len(svg)} bytes')
+    assert 'matplotlib' not in svg
+    assert elapsed_time < 1
+
+
+def search_candidates(search_index: dict, search_term: str, limit: int = 200) -> list:
+    """Select the titles sharing the most trigrams with a search term, the way the site does."""
+    hits = {}
+    for trigram in updater.get_search_trigrams(text=updater.normalize_search_text(text=search_term)):
+        position = 0
+        for delta in search_index['trigrams'].get(trigram, []):
+            position += delta
+            hits[position] = hits.get(position, 0) + 1
+    return sorted(hits, key=lambda candidate: (-hits[candidate], candidate))[:limit]
+
+
+@pytest.mark.parametrize('size', benchmark_sizes(1000, 100000))
+def test_benchmark_search_index(size, movie_database, monkeypatch):
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter(compress=True))
+    generator = random.Random(4)
+    words = [''.join(generator.choices('abcdefghijklmnopqrstuvwxyz', k=generator.randint(3, 9))) for _ in range(5000)]
+    updater.databases['movie']['all_items'] = [
+        {'id': item_id, 'title': ' '.join(generator.choices(words, k=generator.randint(1, 4))).title()}
+        for item_id in range(size)
+    ]
+
+    start_time = time.perf_counter()
+    updater._write_database_pages(db='movie')
+    build_time = time.perf_counter() - start_time
+
+    search_index = json.loads((movie_database.parent / 'search_index.json').read_text(encoding='utf-8'))
+    raw_size = (movie_database.parent / 'search_index.json').stat().st_size
+    compressed_size = (movie_database.parent / 'search_index.json.gz').stat().st_size
+    wanted = search_index['titles'][size // 2]
+
+    start_time = time.perf_counter()
+    candidates = search_candidates(search_index=search_index, search_term=wanted)
+    query_time = time.perf_counter() - start_time
+
+    print(f'{size} titles: outputs built in {build_time:.3f}s, search index {raw_size / 1024:.0f} KiB '
+          f'({compressed_size / 1024:.0f} KiB compressed), query took {query_time * 1000:.1f}ms '
+          f'for {len(candidates)} candidates')
+    assert wanted in {search_index['titles'][candidate] for candidate in candidates}
+    assert len(candidates) <= 200
@@ -0,0 +1,90 @@
+# standard imports
+import json
+
+# lib imports
+import pytest
+
+# local imports
+from src import bundle_reader
+from src import updater
+
+
+@pytest.fixture
+def movie_bundle(tmp_path, bundle_directory, monkeypatch):
+    """Write the bundle of a small movie database with the daily update outputs."""
+    movie_dir = tmp_path / 'movies'
+    tmdb_dir = movie_dir / 'themoviedb'
+    tmdb_dir.mkdir(parents=True)
+    items = [
+        {'id': item_id, 'imdb_id': f'tt{item_id * 7:07d}', 'title': f'Movie {item_id}'}
+        for item_id in range(1, 200)
+    ]
+    items.append({'id': 500, 'imdb_id': None, 'title': 'Amélie'})
+    for item in items:
+        (tmdb_dir / f'{item["id"]}.json').write_text(json.dumps(item), encoding='utf-8')
+
+    monkeypatch.setattr(updater, 'databases', {
+        'movie': {'all_items': items, 'path': str(tmdb_dir), 'title': 'Movies', 'type': 'movie'},
+    })
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+    updater._write_database_pages(db='movie')
+    return bundle_directory / 'movies'
+
+
+def test_bundle_reader_matches_updater_format():
+    assert bundle_reader.INDEX_RECORD.format == updater.BUNDLE_INDEX_RECORD.format
+    assert bundle_reader.BUNDLE_FILENAME == updater.BUNDLE_FILENAME
+    assert bundle_reader.BUNDLE_INDEX_FILENAME == updater.BUNDLE_INDEX_FILENAME
+    assert bundle_reader.BUNDLE_IMDB_INDEX_FILENAME == updater.BUNDLE_IMDB_INDEX_FILENAME
+
+
+def test_bundle_reader_get(movie_bundle):
+    with bundle_reader.BundleReader(directory=str(movie_bundle)) as reader:
+        assert len(reader) == 200
+        assert reader.get(item_id=1) == {'id': 1, 'imdb_id': 'tt0000007', 'title': 'Movie 1'}
+        assert reader.get(item_id='199')['title'] == 'Movie 199'
+        assert reader.get(item_id=500)['title'] == 'Amélie'
+        assert reader.get(item_id=0) is None
+        assert reader.get(item_id=200) is None
+        assert reader.get(item_id=501) is None
+        assert reader.get(item_id='abc') is None
+
+
+def test_bundle_reader_get_by_imdb_id(movie_bundle):
+    with bundle_reader.BundleReader(directory=str(movie_bundle)) as reader:
+        assert reader.get_by_imdb_id(imdb_id='tt0000014')['id'] == 2
+        assert reader.get_by_imdb_id(imdb_id='tt0000015') is None
+        assert reader.get_by_imdb_id(imdb_id='nm0000014') is None
+
+
+def test_bundle_reader_get_many(movie_bundle):
+    with bundle_reader.BundleReader(directory=str(movie_bundle)) as reader:
+        items = reader.get_many(item_ids=[150, '3', 3, 1000, 'tt1', 42])
+        imdb_items = reader.get_many_by_imdb_id(imdb_ids=['tt0000021', 'tt0000701', 'tt0001386', None])
+
+    assert {item_id: item['id'] for item_id, item in items.items()} == {150: 150, '3': 3, 3: 3, 42: 42}
+    assert {imdb_id: item['id'] for imdb_id, item in imdb_items.items()} == {'tt0000021': 3, 'tt0001386': 198}
+
+
+def test_bundle_reader_without_imdb_index(tmp_path):
+    (tmp_path / bundle_reader.BUNDLE_FILENAME).write_bytes(b'{"id":5}\n')
+    (tmp_path / bundle_reader.BUNDLE_INDEX_FILENAME).write_bytes(bundle_reader.INDEX_RECORD.pack(5, 0, 8))
+
+    with bundle_reader.BundleReader(directory=str(tmp_path)) as reader:
+        assert reader.get(item_id=5) == {'id': 5}
+        assert reader.get_by_imdb_id(imdb_id='tt0000005') is None
+
+
+def test_bundle_reader_empty_bundle(tmp_path):
+    (tmp_path / bundle_reader.BUNDLE_FILENAME).write_bytes(b'')
+    (tmp_path / bundle_reader.BUNDLE_INDEX_FILENAME).write_bytes(b'')
+
+    reader = bundle_reader.BundleReader(directory=str(tmp_path))
+    assert len(reader) == 0
+    assert reader.get(item_id=1) is None
+    reader.close()
+
+
+def test_bundle_reader_missing_bundle(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        bundle_reader.BundleReader(directory=str(tmp_path))
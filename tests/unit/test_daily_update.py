@@ -0,0 +1,1231 @@
+"""
+test_daily_update.py
+
+This module contains unit tests for the daily update workflow. The daily update refreshes existing database items from
+their providers and writes the generated page, plot, and state files. Tests in this module use local stand-ins for the
+provider APIs.
+"""
+# standard imports
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+import json
+import os
+import threading
+from urllib.parse import parse_qs
+
+# lib imports
+import pytest
+
+# local imports
+from src import updater
+
+IGDB_GAMES = {
+    1638: {'id': 1638, 'name': 'GoldenEye 007', 'slug': 'goldeneye-007'},
+    1639: {'id': 1639, 'name': 'Perfect Dark', 'slug': 'perfect-dark'},
+}
+
+DAY = 86400
+STARTED = int(datetime(2026, 10, 18, 12, tzinfo=timezone.utc).timestamp())
+
+
+def daily_args(**kwargs):
+    """Build daily update args with optional overrides."""
+    values = {
+        'daily_update': True,
+        'full_refresh_days': 7,
+        'incremental': True,
+        'issue_update': False,
+        'leaderboard_update': False,
+    }
+    values.update(kwargs)
+    return type('Args', (), values)()
+
+
+@pytest.fixture
+def tmdb_stub(stub_server, monkeypatch):
+    """Point TMDB requests at the local stub server."""
+    monkeypatch.setenv('TMDB_API_KEY_V3', 'test-key')
+    monkeypatch.setattr(updater, 'TMDB_API_URL', f'{stub_server.url}/3')
+    monkeypatch.setattr(updater.tmdb_limiter, 'wait', lambda: None)
+    monkeypatch.setattr(updater.time, 'sleep', lambda seconds: None)
+    return stub_server
+
+
+@pytest.fixture
+def state_file(daily_update_files):
+    """Use the temporary daily update state file."""
+    return daily_update_files
+
+
+def test_parse_args_incremental_options():
+    args = updater.parse_args(['--daily_update', '--incremental', '--full_refresh_days', '3'])
+
+    assert args.incremental
+    assert args.full_refresh_days == 3
+    assert updater.parse_args(['--daily_update']).full_refresh_days == updater.DEFAULT_FULL_REFRESH_DAYS
+
+
+@pytest.mark.parametrize('content, expected', [
+    (None, {}),
+    ('not json', {}),
+    ('[]', {}),
+    ('{"last_run": 1}', {'last_run': 1}),
+])
+def test_load_daily_update_state(state_file, content, expected):
+    if content is not None:
+        state_file.parent.mkdir(parents=True)
+        state_file.write_text(content, encoding='utf-8')
+
+    assert updater._load_daily_update_state() == expected
+
+
+def test_write_daily_update_state_round_trips(state_file):
+    updater._write_daily_update_state(state={'last_run': 2, 'last_full_refresh': 1})
+
+    assert updater._load_daily_update_state() == {'last_full_refresh': 1, 'last_run': 2}
+
+
+def test_load_tmdb_changed_ids_reads_every_page(tmdb_stub):
+    tmdb_stub.add_route(
+        '/3/movie/changes',
+        (200, {'page': 1, 'results': [{'id': 710}, {'id': 10378}], 'total_pages': 2}, {}),
+        (200, {'page': 2, 'results': [{'id': 710}, {'id': 42}], 'total_pages': 2}, {}),
+    )
+
+    changed_ids = updater._load_tmdb_changed_ids(
+        item_type='movie',
+        start_date='2026-10-17',
+        end_date='2026-10-18',
+    )
+
+    assert changed_ids == {'710', '10378', '42'}
+    queries = [parse_qs(request['query']) for request in tmdb_stub.requests]
+    assert [query['page'] for query in queries] == [['1'], ['2']]
+    assert queries[0]['start_date'] == ['2026-10-17']
+    assert queries[0]['end_date'] == ['2026-10-18']
+    assert queries[0]['api_key'] == ['test-key']
+
+
+def test_load_tmdb_changed_ids_returns_none_on_error(tmdb_stub, capsys):
+    tmdb_stub.add_route('/3/tv/changes', (500, {}, {}))
+
+    assert updater._load_tmdb_changed_ids(item_type='tv_show', start_date='2026-10-17', end_date='2026-10-18') is None
+    assert 'Unable to load TMDB tv_show changes' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('args, state', [
+    (daily_args(incremental=False), {'last_full_refresh': STARTED - DAY, 'last_run': STARTED - DAY}),
+    (daily_args(), {}),
+    (daily_args(), {'last_run': STARTED - DAY}),
+    (daily_args(), {'last_full_refresh': STARTED - 7 * DAY, 'last_run': STARTED - DAY}),
+    (daily_args(full_refresh_days=30), {'last_full_refresh': STARTED - 20 * DAY, 'last_run': STARTED - 15 * DAY}),
+])
+def test_get_daily_update_changes_requires_full_refresh(args, state, monkeypatch):
+    monkeypatch.setattr(updater, 'args', args)
+    monkeypatch.setattr(updater, '_load_tmdb_changed_ids', lambda **kwargs: pytest.fail('changes should not load'))
+
+    assert updater._get_daily_update_changes(state=state, started=STARTED) is None
+
+
+def test_get_daily_update_changes_loads_tmdb_change_lists(tmdb_stub, monkeypatch):
+    monkeypatch.setattr(updater, 'args', daily_args())
+    tmdb_stub.add_route('/3/movie/changes', (200, {'results': [{'id': 710}], 'total_pages': 1}, {}))
+    tmdb_stub.add_route('/3/tv/changes', (200, {'results': [], 'total_pages': 1}, {}))
+
+    changes = updater._get_daily_update_changes(
+        state={'last_full_refresh': STARTED - 3 * DAY, 'last_run': STARTED - DAY},
+        started=STARTED,
+    )
+
+    assert changes == {'movie': {'710'}, 'tv_show': set()}
+    assert {request['path'] for request in tmdb_stub.requests} == {'/3/movie/changes', '/3/tv/changes'}
+    assert parse_qs(tmdb_stub.requests[0]['query'])['start_date'] == ['2026-10-17']
+
+
+def test_get_daily_update_changes_retries_failed_items(tmdb_stub, monkeypatch, capsys):
+    monkeypatch.setattr(updater, 'args', daily_args())
+    tmdb_stub.add_route('/3/movie/changes', (200, {'results': [{'id': 710}], 'total_pages': 1}, {}))
+    tmdb_stub.add_route('/3/tv/changes', (200, {'results': [], 'total_pages': 1}, {}))
+
+    changes = updater._get_daily_update_changes(
+        state={
+            'failed_ids': {'movie': ['42', '710'], 'game': ['1638']},  # games are always refreshed
+            'last_full_refresh': STARTED - 3 * DAY,
+            'last_run': STARTED - DAY,
+        },
+        started=STARTED,
+    )
+
+    assert changes == {'movie': {'42', '710'}, 'tv_show': set()}
+    assert 'Retrying 1 movie items that failed in the previous daily update' in capsys.readouterr().out
+
+
+def test_get_daily_update_changes_falls_back_to_full_refresh(tmdb_stub, monkeypatch):
+    monkeypatch.setattr(updater, 'args', daily_args())
+    tmdb_stub.add_route('/3/movie/changes', (503, {}, {}))
+
+    changes = updater._get_daily_update_changes(
+        state={'last_full_refresh': STARTED - 3 * DAY, 'last_run': STARTED - DAY},
+        started=STARTED,
+    )
+
+    assert changes is None
+
+
+@pytest.mark.parametrize('item_type, content, expected', [
+    ('movie', '{"id": 710, "title": "GoldenEye"}', {'id': 710, 'title': 'GoldenEye'}),
+    ('movie', '{"id": 710, "youtube_theme_url": "url"}', {}),
+    ('game', '{"id": 1638, "name": "GoldenEye 007"}', {'id': 1638, 'name': 'GoldenEye 007'}),
+    ('game', '[]', {}),
+    ('game', 'not json', {}),
+])
+def test_load_local_item(item_type, content, expected, tmp_path):
+    item_file = tmp_path / 'item.json'
+    item_file.write_text(content, encoding='utf-8')
+
+    assert updater._load_local_item(item_type=item_type, item_file=str(item_file)) == expected
+
+
+def test_queue_daily_update_items_only_queues_changed_and_unfetched_items(tmp_path, monkeypatch):
+    queued = []
+    batched = []
+    closed = []
+    movie_dir = tmp_path / 'movies' / 'themoviedb'
+    game_dir = tmp_path / 'games' / 'igdb'
+    movie_dir.mkdir(parents=True)
+    game_dir.mkdir(parents=True)
+    (movie_dir / '710.json').write_text('{"id": 710, "title": "GoldenEye"}', encoding='utf-8')
+    (movie_dir / '10378.json').write_text('{"id": 10378, "title": "Big Buck Bunny"}', encoding='utf-8')
+    (movie_dir / '42.json').write_text('{"id": 42}', encoding='utf-8')
+    (game_dir / '1638.json').write_text('{"id": 1638, "name": "GoldenEye 007"}', encoding='utf-8')
+
+    class RecordingQueue:
+        def put(self, item):
+            queued.append(item)
+
+        def close(self, item_type):
+            closed.append(item_type)
+
+    monkeypatch.setattr(updater, 'queue', RecordingQueue())
+    monkeypatch.setattr(updater, '_queue_igdb_batches', lambda **kwargs: batched.append(tuple(kwargs.values())))
+    monkeypatch.setattr(updater, 'databases', {
+        'game': {'all_items': [], 'path': str(game_dir), 'type': 'game'},
+        'movie': {'all_items': [], 'path': str(movie_dir), 'type': 'movie'},
+    })
+
+    updater._queue_daily_update_items(changes={'movie': {'10378'}})
+
+    assert sorted(queued) == [('movie', '10378'), ('movie', '42')]
+    assert batched == [('game', ['1638'])]
+    assert closed == ['game', 'movie']
+    assert updater.databases['movie']['all_items'] == [{'id': 710, 'imdb_id': None, 'title': 'GoldenEye'}]
+    assert updater.databases['game']['all_items'] == []
+
+
+@pytest.mark.parametrize('changes, expected_full_refresh', [
+    (None, STARTED),
+    ({'movie': set()}, STARTED - 3 * DAY),
+])
+def test_run_daily_update_records_state(changes, expected_full_refresh, state_file, monkeypatch):
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(STARTED, tz)
+
+    state_file.parent.mkdir(parents=True)
+    state_file.write_text(json.dumps({'last_full_refresh': STARTED - 3 * DAY, 'last_run': STARTED - DAY}))
+    received = []
+
+    def queue_daily_update_items(changes):
+        received.append(changes)
+        updater.queue.lanes['tmdb'].record(item=('movie', 42), seconds=0.0, failed=True, refreshed=False)
+        updater.queue.lanes['tmdb'].record(item=('movie', 710), seconds=0.0, failed=False, refreshed=True)
+
+    monkeypatch.setattr(updater, 'datetime', FixedDateTime)
+    monkeypatch.setattr(updater, 'databases', {})
+    monkeypatch.setattr(updater, '_get_daily_update_changes', lambda state, started: changes)
+    monkeypatch.setattr(updater, '_queue_daily_update_items', queue_daily_update_items)
+    monkeypatch.setattr(updater, 'build_top_contributor_images', lambda: None)
+    monkeypatch.setattr(updater, 'compact_change_feeds', lambda: None)
+
+    updater._run_daily_update()
+
+    assert received == [changes]
+    # items that were not refreshed are retried by the next incremental run
+    assert json.loads(state_file.read_text()) == {
+        'failed_ids': {'movie': ['42']},
+        'last_full_refresh': expected_full_refresh,
+        'last_run': STARTED,
+    }
+    assert updater.queue.pop_failed_ids() == {}
+
+
+class RecordingIGDBWrapper:
+    """IGDB wrapper stand-in that answers multi-id and multi-slug queries."""
+
+    def __init__(self, games=None):
+        self.games = IGDB_GAMES if games is None else games
+        self.queries = []
+
+    def api_request(self, endpoint, query):
+        self.queries.append((endpoint, query))
+        where = query.split('where ', 1)[1].split(';', 1)[0]
+        where_type, values = where.split(' = ')
+        values = {value.strip('"') for value in values.strip('()').split(',')}
+        return json.dumps([
+            game for game in self.games.values()
+            if str(game.get(where_type)) in values
+        ])
+
+
+def test_load_igdb_batch_data_groups_ids_and_slugs(monkeypatch):
+    wrapper = RecordingIGDBWrapper(games={
+        **IGDB_GAMES,
+        1: {'name': 'No ID'},
+    })
+    monkeypatch.setattr(updater, 'wrapper', wrapper)
+    monkeypatch.setattr(updater.igdb_limiter, 'wait', lambda: None)
+
+    results = updater._load_igdb_batch_data(item_type='game', item_ids=['1638', 'perfect-dark', '404'])
+
+    assert results == {'1638': IGDB_GAMES[1638], 'perfect-dark': IGDB_GAMES[1639]}
+    assert [endpoint for endpoint, _ in wrapper.queries] == ['games', 'games']
+    assert 'where id = (1638,404); limit 500;' in wrapper.queries[0][1]
+    assert 'where slug = ("perfect-dark"); limit 500;' in wrapper.queries[1][1]
+
+
+def test_queue_igdb_batches_queues_items_with_metadata(monkeypatch):
+    queued = []
+    wrapper = RecordingIGDBWrapper()
+
+    class RecordingQueue:
+        def put(self, item):
+            queued.append(item)
+
+    monkeypatch.setattr(updater, 'queue', RecordingQueue())
+    monkeypatch.setattr(updater, 'wrapper', wrapper)
+    monkeypatch.setattr(updater, 'IGDB_BATCH_SIZE', 2)
+    monkeypatch.setattr(updater.igdb_limiter, 'wait', lambda: None)
+
+    updater._queue_igdb_batches(item_type='game', item_ids=['1638', '404', '1639'])
+
+    assert len(wrapper.queries) == 2
+    assert queued == [
+        ('game', '1638', IGDB_GAMES[1638]),
+        ('game', '404', {}),
+        ('game', '1639', IGDB_GAMES[1639]),
+    ]
+
+
+def test_queue_igdb_batches_falls_back_to_single_items(monkeypatch, capsys):
+    queued = []
+
+    class RecordingQueue:
+        def put(self, item):
+            queued.append(item)
+
+    def load_igdb_batch_data(item_type, item_ids):
+        raise updater.requests.exceptions.HTTPError('429 Client Error')
+
+    monkeypatch.setattr(updater, 'queue', RecordingQueue())
+    monkeypatch.setattr(updater, '_load_igdb_batch_data', load_igdb_batch_data)
+
+    updater._queue_igdb_batches(item_type='game', item_ids=['1638', '1639'])
+
+    assert queued == [('game', '1638'), ('game', '1639')]
+    assert 'Batch request for 2 game items failed' in capsys.readouterr().out
+
+
+def test_queue_handler_processes_batched_items(tmp_path, monkeypatch, capsys):
+    game_dir = tmp_path / 'games' / 'igdb'
+    game_dir.mkdir(parents=True)
+    (game_dir / '1639.json').write_text(json.dumps({
+        'id': 1639,
+        'name': 'Perfect Dark',
+        'youtube_theme_url': 'https://www.youtube.com/watch?v=qGPBFvDz_HM',
+    }), encoding='utf-8')
+    monkeypatch.setitem(updater.databases['game'], 'path', str(game_dir))
+    monkeypatch.setitem(updater.databases['game'], 'all_items', [])
+    monkeypatch.setattr(updater, 'args', daily_args())
+
+    updater.queue_handler(item=('game', '1638', {**IGDB_GAMES[1638], 'igdb_id': 1638}))
+    updater.queue_handler(item=('game', '1639', {}))
+
+    assert json.loads((game_dir / '1638.json').read_text()) == IGDB_GAMES[1638]
+    assert updater.databases['game']['all_items'] == [
+        {'id': 1638, 'title': 'GoldenEye 007'},
+        {'id': 1639, 'title': 'Perfect Dark'},
+    ]
+    assert 'game id 1639 not found on IGDB' in capsys.readouterr().out
+
+
+TMDB_MOVIES = {
+    710: {'id': 710, 'imdb_id': 'tt0113189', 'title': 'GoldenEye'},
+    10378: {'id': 10378, 'imdb_id': 'tt1254207', 'title': 'Big Buck Bunny'},
+}
+
+
+def create_refresh_database(root):
+    """Create a database tree and matching database config for a refresh run."""
+    config = {}
+    for item_type, path, items in (
+            ('movie', ('movies', 'themoviedb'), (710, 10378, 404)),
+            ('game', ('games', 'igdb'), (1638, 1639, 1640)),
+    ):
+        item_dir = root.joinpath(*path)
+        item_dir.mkdir(parents=True)
+        for item_id in items:
+            (item_dir / f'{item_id}.json').write_text(json.dumps({
+                'id': item_id,
+                'name': 'Old Name',
+                'title': 'Old Title',
+                'youtube_theme_url': f'https://www.youtube.com/watch?v={item_id}',
+            }), encoding='utf-8')
+        config[item_type] = {**updater.databases[item_type], 'all_items': [], 'path': str(item_dir)}
+
+    return config
+
+
+def read_tree(root):
+    """Read every file in a directory tree."""
+    return {
+        os.path.relpath(os.path.join(dirpath, filename), root): open(os.path.join(dirpath, filename)).read()
+        for dirpath, _, filenames in os.walk(root)
+        for filename in filenames
+    }
+
+
+def test_queued_items_refresh_every_database(tmp_path, tmdb_stub, monkeypatch):
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(STARTED, tz)
+
+    for movie_id, payload in TMDB_MOVIES.items():
+        tmdb_stub.add_route(f'/3/movie/{movie_id}', (200, payload, {}))
+    monkeypatch.setattr(updater, 'datetime', FixedDateTime)  # the change feed records the removed item
+    monkeypatch.setattr(updater, 'args', daily_args(incremental=False))
+    monkeypatch.setattr(updater, 'wrapper', RecordingIGDBWrapper())
+    monkeypatch.setattr(updater.igdb_limiter, 'wait', lambda: None)
+    monkeypatch.setattr(updater, 'databases', create_refresh_database(root=tmp_path))
+    monkeypatch.setattr(updater, 'imdb_path', str(tmp_path / 'movies' / 'imdb'))
+    monkeypatch.setattr(updater, 'queue', updater.ProviderQueue())
+
+    updater._queue_daily_update_items()
+    updater._ensure_queue_workers()
+    updater.queue.join()
+
+    files = read_tree(tmp_path)
+    assert 'movies/themoviedb/404.json' not in files
+    assert json.loads(files['movies/imdb/tt0113189.json'])['title'] == 'GoldenEye'
+    assert len(updater.databases['movie']['all_items']) == 2
+    assert len(updater.databases['game']['all_items']) == 3
+
+
+def test_provider_queue_lanes_run_independently(monkeypatch, capsys):
+    igdb_released = threading.Event()
+    handled = []
+
+    def queue_handler(item):
+        if item[0] == 'game':
+            assert igdb_released.wait(timeout=5)
+        if item[1] == 'broken':
+            raise SystemExit(1)
+        handled.append(item)
+        return item[1] != '2'  # the provider returned no data
+
+    monkeypatch.setattr(updater, 'queue', updater.ProviderQueue(concurrency={'igdb': 1, 'tmdb': 2}))
+    monkeypatch.setattr(updater, 'queue_handler', queue_handler)
+    for item_id in range(3):
+        updater.queue.put(('game', str(item_id)))
+    for item_type in ('movie', 'movie_collection', 'tv_show', 'movie'):
+        updater.queue.put((item_type, 'broken' if item_type == 'tv_show' else '710'))
+
+    updater._ensure_queue_workers()
+    updater._ensure_queue_workers()  # workers are only started once per queue
+    updater.queue.lanes['tmdb'].join()  # tmdb items finish while every igdb worker is blocked
+
+    assert [item[0] for item in handled] == ['movie', 'movie_collection', 'movie']
+    assert updater.queue.lanes['igdb'].processed == 0
+
+    igdb_released.set()
+    updater.queue.join()
+    updater._print_queue_metrics()
+
+    tmdb_lane, igdb_lane = updater.queue.lanes['tmdb'], updater.queue.lanes['igdb']
+    assert (tmdb_lane.processed, tmdb_lane.failed) == (4, 1)
+    assert (igdb_lane.processed, igdb_lane.failed) == (3, 0)
+    assert igdb_lane.busy_seconds > 0
+    output = capsys.readouterr().out
+    assert 'tmdb lane: processed 4 items (1 failed) with 2 workers' in output
+    assert 'igdb lane: processed 3 items (0 failed) with 1 workers' in output
+    assert updater.queue.pop_failed_ids() == {'game': ['2'], 'tv_show': ['broken']}
+
+
+def cache_response(cache, key, body, **validators):
+    """Store a response in a response cache, as if its item files were written."""
+    cache.update(key=key, body=body, **validators)
+    cache.commit(key=key)
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    """Use an empty response cache."""
+    cache = updater.ResponseCache(path=str(tmp_path / 'response_cache.json'))
+    monkeypatch.setattr(updater, 'response_cache', cache)
+    return cache
+
+
+def test_response_cache_evicts_least_recently_used_entries(response_cache):
+    response_cache.max_entries = 2
+    cache_response(response_cache, key='tmdb:movie:1', body=b'1', etag='"a"')
+    cache_response(response_cache, key='tmdb:movie:2', body=b'2', last_modified='Sat, 17 Oct 2026 12:00:00 GMT')
+    response_cache.run = 2
+    assert response_cache.get(key='tmdb:movie:1')['etag'] == '"a"'
+
+    cache_response(response_cache, key='tmdb:movie:3', body=b'3')
+    response_cache.save()
+
+    assert sorted(response_cache.entries) == ['tmdb:movie:1', 'tmdb:movie:3']
+    assert response_cache.get(key='tmdb:movie:2') == {}
+
+
+def test_response_cache_round_trips(response_cache):
+    assert not response_cache.update(key='tmdb:movie:1', body=b'1', etag='"a"')
+    assert not response_cache.update(key='tmdb:movie:1', body=b'1', etag='"a"')  # not stored until committed
+    response_cache.commit(key='tmdb:movie:1')
+    response_cache.commit(key='tmdb:movie:2')  # nothing pending
+    assert response_cache.update(key='tmdb:movie:1', body=b'1', etag='"b"')
+    cache_response(response_cache, key='igdb:games:1638', body=b'1638')
+    response_cache.save()
+
+    loaded = updater.ResponseCache(path=response_cache.path)
+    loaded.load()
+
+    assert (response_cache.changed, response_cache.unchanged) == (3, 1)
+    assert loaded.entries == response_cache.entries
+    assert loaded.run == 2
+    assert json.loads(open(response_cache.path).read())['version'] == updater.RESPONSE_CACHE_VERSION
+
+
+def test_response_cache_file_is_sorted_by_key(response_cache):
+    for key in ('tmdb:movie:2', 'igdb:games:1638', 'tmdb:movie:1'):
+        cache_response(response_cache, key=key, body=key.encode('utf-8'))
+    response_cache.save()
+    content = open(response_cache.path).read()
+
+    # using an entry in a later run only changes its recency field, not the order of the file
+    loaded = updater.ResponseCache(path=response_cache.path)
+    loaded.load()
+    loaded.get(key='tmdb:movie:2')
+    loaded.save()
+
+    assert list(json.loads(content)['entries']) == ['igdb:games:1638', 'tmdb:movie:1', 'tmdb:movie:2']
+    assert open(response_cache.path).read() == content.replace('"used":1}},"run":1', '"used":2}},"run":2')
+
+
+@pytest.mark.parametrize('content, warning', [
+    (None, None),
+    ('not json', 'Ignoring unreadable response cache'),
+    ('{"version": 1, "entries": [["tmdb:movie:1", {}]]}', 'unsupported format version'),
+])
+def test_response_cache_ignores_unusable_files(content, warning, response_cache, capsys):
+    if content is not None:
+        with open(response_cache.path, 'w') as cache_f:
+            cache_f.write(content)
+
+    response_cache.load()
+
+    assert response_cache.entries == {}
+    output = capsys.readouterr().out
+    assert warning in output if warning else output == ''
+
+
+def test_tmdb_responses_are_revalidated(tmdb_stub, response_cache, tmp_path, monkeypatch):
+    movie_dir = tmp_path / 'movies' / 'themoviedb'
+    movie_dir.mkdir(parents=True)
+    item_file = movie_dir / '710.json'
+    item_file.write_text(json.dumps({'id': 710, 'title': 'Old Title', 'youtube_theme_url': 'url'}), encoding='utf-8')
+    monkeypatch.setattr(updater, 'args', daily_args())
+    monkeypatch.setitem(updater.databases, 'movie', {**updater.databases['movie'], 'path': str(movie_dir)})
+    monkeypatch.setattr(updater, 'imdb_path', str(tmp_path / 'movies' / 'imdb'))
+    tmdb_stub.add_route(
+        '/3/movie/710',
+        (200, TMDB_MOVIES[710], {'ETag': '"v1"'}),
+        (304, b'', {'ETag': '"v1"'}),
+        (200, TMDB_MOVIES[710], {'ETag': '"v2"'}),
+    )
+
+    assert updater.process_item_id(item_type='movie', item_id='710')['title'] == 'GoldenEye'
+    local_item = {**json.loads(item_file.read_text()), 'marker': True}
+    item_file.write_text(json.dumps(local_item), encoding='utf-8')
+
+    # not modified, then an identical body with a new validator, both keep the database item as it is
+    assert updater.process_item_id(item_type='movie', item_id='710') == local_item
+    assert updater.process_item_id(item_type='movie', item_id='710') == local_item
+
+    assert json.loads(item_file.read_text()) == local_item
+    assert [request['headers'].get('If-None-Match') for request in tmdb_stub.requests] == [None, '"v1"', '"v1"']
+    assert response_cache.get(key='tmdb:movie:710')['etag'] == '"v2"'
+    assert (response_cache.changed, response_cache.unchanged) == (1, 2)
+
+
+def test_tmdb_not_modified_since_keeps_local_item(tmdb_stub, response_cache, tmp_path, monkeypatch):
+    movie_dir = tmp_path / 'movies' / 'themoviedb'
+    movie_dir.mkdir(parents=True)
+    local_item = {'id': 710, 'title': 'GoldenEye', 'marker': True}
+    (movie_dir / '710.json').write_text(json.dumps(local_item), encoding='utf-8')
+    monkeypatch.setitem(updater.databases, 'movie', {**updater.databases['movie'], 'path': str(movie_dir)})
+    cache_response(response_cache, key='tmdb:movie:710', body=b'{}', last_modified='Sat, 17 Oct 2026 12:00:00 GMT')
+    tmdb_stub.add_route('/3/movie/710', (304, b'', {}))
+
+    assert updater.process_item_id(item_type='movie', item_id='710') == local_item
+    assert tmdb_stub.requests[0]['headers']['If-Modified-Since'] == 'Sat, 17 Oct 2026 12:00:00 GMT'
+
+
+def test_tmdb_volatile_fields_do_not_change_responses(tmdb_stub, response_cache, tmp_path, monkeypatch):
+    movie_dir = tmp_path / 'movies' / 'themoviedb'
+    monkeypatch.setattr(updater, 'args', daily_args())
+    monkeypatch.setitem(updater.databases, 'movie', {**updater.databases['movie'], 'path': str(movie_dir)})
+    monkeypatch.setattr(updater, 'imdb_path', str(tmp_path / 'movies' / 'imdb'))
+    tmdb_stub.add_route(
+        '/3/movie/710',
+        (200, {**TMDB_MOVIES[710], 'popularity': 1.5, 'vote_count': 10}, {'ETag': '"v1"'}),
+        (200, {**TMDB_MOVIES[710], 'popularity': 2.5, 'vote_count': 11}, {'ETag': '"v2"'}),
+    )
+
+    updater.process_item_id(item_type='movie', item_id='710')
+    local_item = {**json.loads((movie_dir / '710.json').read_text()), 'marker': True}
+    (movie_dir / '710.json').write_text(json.dumps(local_item), encoding='utf-8')
+
+    assert updater.process_item_id(item_type='movie', item_id='710') == local_item
+    assert (response_cache.changed, response_cache.unchanged) == (1, 1)
+    assert updater.databases['movie']['metrics']['710'] == {'popularity': 2.5, 'vote_count': 11}
+
+
+def test_tmdb_responses_are_not_cached_when_the_item_write_fails(tmdb_stub, response_cache, tmp_path, monkeypatch):
+    movie_dir = tmp_path / 'movies' / 'themoviedb'
+    monkeypatch.setattr(updater, 'args', daily_args())
+    monkeypatch.setitem(updater.databases, 'movie', {**updater.databases['movie'], 'path': str(movie_dir)})
+    monkeypatch.setattr(updater, 'imdb_path', str(tmp_path / 'movies' / 'imdb'))
+    tmdb_stub.add_route('/3/movie/710', (200, TMDB_MOVIES[710], {'ETag': '"v1"'}))
+
+    def fail_write(path, content, compress=None):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(updater.output_writer, 'write', fail_write)
+    with pytest.raises(OSError, match='disk full'):
+        updater.process_item_id(item_type='movie', item_id='710')
+
+    assert response_cache.get(key='tmdb:movie:710') == {}
+    assert response_cache.changed == 1
+
+
+def test_tmdb_responses_are_not_revalidated_without_local_item(tmdb_stub, response_cache, tmp_path, monkeypatch):
+    movie_dir = tmp_path / 'movies' / 'themoviedb'
+    monkeypatch.setitem(updater.databases, 'movie', {**updater.databases['movie'], 'path': str(movie_dir)})
+    monkeypatch.setattr(updater, 'imdb_path', str(tmp_path / 'movies' / 'imdb'))
+    cache_response(response_cache, key='tmdb:movie:710', body=json.dumps(TMDB_MOVIES[710]).encode(), etag='"v1"')
+    tmdb_stub.add_route('/3/movie/710', (200, TMDB_MOVIES[710], {'ETag': '"v1"'}))
+
+    assert updater.process_item_id(item_type='movie', item_id='710')['title'] == 'GoldenEye'
+    assert 'If-None-Match' not in tmdb_stub.requests[0]['headers']
+    assert (movie_dir / '710.json').is_file()
+
+
+def test_unchanged_igdb_items_are_not_rewritten(response_cache, tmp_path, monkeypatch):
+    game_dir = tmp_path / 'games' / 'igdb'
+    monkeypatch.setitem(updater.databases, 'game', {**updater.databases['game'], 'path': str(game_dir)})
+    monkeypatch.setattr(updater, 'wrapper', RecordingIGDBWrapper())
+    monkeypatch.setattr(updater.igdb_limiter, 'wait', lambda: None)
+
+    assert updater._process_batched_item(item_type='game', item_id='1638', json_data=dict(IGDB_GAMES[1638]))
+    local_item = {**json.loads((game_dir / '1638.json').read_text()), 'marker': True}
+    (game_dir / '1638.json').write_text(json.dumps(local_item), encoding='utf-8')
+
+    unchanged_item = updater._process_batched_item(item_type='game', item_id='1638', json_data=dict(IGDB_GAMES[1638]))
+    assert unchanged_item == local_item
+    assert updater._load_igdb_item_data(item_type='game', item_id='1638') == (str(game_dir), 1638, None)
+    assert json.loads((game_dir / '1638.json').read_text()) == local_item
+
+
+def test_run_daily_update_saves_response_cache(state_file, monkeypatch):
+    def queue_daily_update_items(changes):
+        cache_response(updater.response_cache, key='tmdb:movie:710', body=b'{}')
+
+    monkeypatch.setattr(updater, 'args', daily_args(incremental=False))
+    monkeypatch.setattr(updater, 'databases', {})
+    monkeypatch.setattr(updater, '_queue_daily_update_items', queue_daily_update_items)
+    monkeypatch.setattr(updater, 'build_top_contributor_images', lambda: None)
+    monkeypatch.setattr(updater, 'compact_change_feeds', lambda: None)
+
+    state_file.parent.mkdir(parents=True)
+    legacy_file = state_file.parent / 'response_cache.json'
+    legacy_file.write_text('{}', encoding='utf-8')
+
+    updater._run_daily_update()
+
+    cache = updater.ResponseCache(path=updater.response_cache_file)
+    cache.load()
+    assert list(cache.entries) == ['tmdb:movie:710']
+    assert updater.response_cache is None
+    assert not legacy_file.exists()
+
+
+def test_output_writer_only_writes_changed_files(tmp_path):
+    writer = updater.OutputWriter()
+    output_file = tmp_path / 'movies' / 'pages.json'
+
+    assert writer.write_json(path=str(output_file), obj={'count': 1})
+    assert not writer.write_json(path=str(output_file), obj={'count': 1})
+    assert writer.write_json(path=str(output_file), obj={'count': 2})  # same size, different content
+    assert writer.write(path=str(output_file), content=b'{"count": 10}')
+    writer.print_stats()
+
+    assert output_file.read_text() == '{"count": 10}'
+    assert oct(output_file.stat().st_mode & 0o777) == '0o644'
+    assert (writer.written, writer.skipped) == (3, 1)
+    assert os.listdir(output_file.parent) == ['pages.json']
+
+
+def test_output_writer_removes_temporary_file_on_failure(tmp_path, monkeypatch, capsys):
+    def replace(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(updater.os, 'replace', replace)
+    writer = updater.OutputWriter()
+
+    with pytest.raises(OSError, match='disk full'):
+        writer.write(path=str(tmp_path / 'pages.json'), content='{}')
+
+    writer.print_stats()
+    assert os.listdir(tmp_path) == []
+    assert 'Output files: 0 written and 0 unchanged' in capsys.readouterr().out
+
+
+class FakeBrotli:
+    """Stand-in for the optional brotli package."""
+
+    @staticmethod
+    def compress(data, quality):
+        return b'br:' + data
+
+
+def test_output_writer_writes_compressed_siblings(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(updater, 'brotli', FakeBrotli)
+    writer = updater.OutputWriter(compress=True, manifest_path=str(tmp_path / 'compression_manifest.json'))
+    pages_file = tmp_path / 'movies' / 'pages.json'
+    text_file = tmp_path / 'movies' / 'notes.txt'
+
+    assert writer.write_json(path=str(pages_file), obj={'count': 1})
+    assert writer.write(path=str(text_file), content='notes')
+    assert not writer.write_json(path=str(pages_file), obj={'count': 1})  # unchanged siblings are not compressed
+    (tmp_path / 'movies' / 'pages.json.br').unlink()
+    assert not writer.write_json(path=str(pages_file), obj={'count': 1})  # missing siblings are written again
+    writer.save_manifest()
+    writer.print_stats()
+
+    assert updater.gzip.decompress((tmp_path / 'movies' / 'pages.json.gz').read_bytes()) == b'{"count": 1}'
+    assert (tmp_path / 'movies' / 'pages.json.br').read_bytes() == b'br:{"count": 1}'
+    assert sorted(os.listdir(tmp_path / 'movies')) == ['notes.txt', 'pages.json', 'pages.json.br', 'pages.json.gz']
+    assert writer.compressed == 3
+    manifest = json.loads((tmp_path / 'compression_manifest.json').read_text())
+    assert manifest == {
+        'movies/pages.json': {
+            'size': 12,
+            'gz': (tmp_path / 'movies' / 'pages.json.gz').stat().st_size,
+            'br': 15,
+        },
+    }
+    assert 'Compressed files: 3 written with gz, br' in capsys.readouterr().out
+
+
+def test_output_writer_manifest_keeps_existing_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(updater, 'brotli', None)
+    manifest_file = tmp_path / 'compression_manifest.json'
+    (tmp_path / 'kept.json').write_text('{}')
+    manifest_file.write_text(json.dumps({
+        'kept.json': {'size': 2, 'gz': 22},
+        'removed.json': {'size': 2, 'gz': 22},
+    }))
+
+    writer = updater.OutputWriter(compress=True, manifest_path=str(manifest_file))
+    writer.load_manifest()
+    writer.write(path=str(tmp_path / 'plot.svg'), content='<svg/>')
+    writer.save_manifest()
+
+    assert list(json.loads(manifest_file.read_text())) == ['kept.json', 'plot.svg']
+    assert not (tmp_path / 'plot.svg.br').exists()
+
+
+@pytest.mark.parametrize('content', ['not json', '[]', None])
+def test_output_writer_ignores_invalid_manifest(content, tmp_path):
+    manifest_file = tmp_path / 'compression_manifest.json'
+    if content is not None:
+        manifest_file.write_text(content)
+
+    writer = updater.OutputWriter(compress=True, manifest_path=str(manifest_file))
+    writer.load_manifest()
+
+    assert writer.manifest == {}
+
+
+def test_output_writer_does_not_save_manifest_without_compression(tmp_path):
+    writer = updater.OutputWriter(manifest_path=str(tmp_path / 'compression_manifest.json'))
+    writer.write(path=str(tmp_path / 'pages.json'), content='{}')
+    writer.save_manifest()
+
+    assert os.listdir(tmp_path) == ['pages.json']
+
+
+def test_run_daily_update_compresses_outputs(state_file, monkeypatch):
+    monkeypatch.setattr(updater, 'args', updater.parse_args(['--daily_update', '--compress']))
+    monkeypatch.setattr(updater, 'databases', {})
+    monkeypatch.setattr(updater, '_queue_daily_update_items', lambda changes: None)
+    monkeypatch.setattr(
+        updater,
+        'build_top_contributor_images',
+        lambda: updater.output_writer.write(path=str(state_file.parent / 'top_contributors.svg'), content='<svg/>'),
+    )
+
+    updater._run_daily_update()
+
+    database_dir = state_file.parent
+    assert (database_dir / 'top_contributors.svg.gz').is_file()
+    assert not (database_dir / 'response_cache.json.gz').exists()
+    assert list(json.loads((database_dir / 'compression_manifest.json').read_text())) == ['top_contributors.svg']
+
+
+def test_apply_volatile_field_policy(monkeypatch):
+    monkeypatch.setitem(updater.databases, 'movie_collection', {
+        **updater.databases['movie_collection'],
+        'volatile_fields': {
+            'popularity': 'metrics',
+            'parts.popularity': 'exclude',
+            'parts.vote_average': 'round:1',
+            'vote_average': 'round:0',
+            'missing.vote_count': 'exclude',
+        },
+    })
+    og_data = {'id': 645, 'popularity': 1.5, 'parts': [{'id': 710, 'popularity': 2.5}]}
+    json_data = {
+        'id': 645,
+        'popularity': 3.5,
+        'vote_average': 7.6,
+        'parts': [{'id': 710, 'popularity': 4.5, 'vote_average': 7.25}, {'id': 714, 'vote_average': 7}],
+    }
+
+    metrics = updater._apply_volatile_field_policy(item_type='movie_collection', og_data=og_data, json_data=json_data)
+
+    assert metrics == {'popularity': 3.5}
+    assert og_data == {'id': 645, 'parts': [{'id': 710}]}
+    assert json_data == {
+        'id': 645,
+        'vote_average': 8,
+        'parts': [{'id': 710, 'vote_average': 7.2}, {'id': 714, 'vote_average': 7}],
+    }
+
+
+def test_apply_volatile_field_policy_rejects_unknown_policy(monkeypatch):
+    monkeypatch.setitem(updater.databases, 'movie', {**updater.databases['movie'], 'volatile_fields': {'a': 'drop'}})
+
+    with pytest.raises(ValueError, match='Unknown volatile field policy for movie a: drop'):
+        updater._apply_volatile_field_policy(item_type='movie', og_data={}, json_data={})
+
+
+def test_volatile_fields_do_not_rewrite_items(tmdb_stub, tmp_path, monkeypatch):
+    movie_dir = tmp_path / 'movies' / 'themoviedb'
+    movie_dir.mkdir(parents=True)
+    (movie_dir / '710.json').write_text(json.dumps({'id': 710, 'popularity': 1.0, 'youtube_theme_url': 'url'}))
+    monkeypatch.setattr(updater, 'args', daily_args())
+    monkeypatch.setattr(updater, 'databases', {
+        'movie': {**updater.databases['movie'], 'all_items': [], 'path': str(movie_dir)},
+    })
+    monkeypatch.setattr(updater, 'imdb_path', str(tmp_path / 'movies' / 'imdb'))
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+    tmdb_stub.add_route(
+        '/3/movie/710',
+        (200, {**TMDB_MOVIES[710], 'popularity': 12.5, 'vote_count': 10}, {}),
+        (200, {**TMDB_MOVIES[710], 'popularity': 13.5, 'vote_count': 11}, {}),
+    )
+
+    first = updater.process_item_id(item_type='movie', item_id='710')
+    second = updater.process_item_id(item_type='movie', item_id='710')
+
+    assert first == second
+    assert 'popularity' not in json.loads((movie_dir / '710.json').read_text())
+    assert updater.databases['movie']['metrics'] == {'710': {'popularity': 13.5, 'vote_count': 11}}
+    assert (updater.output_writer.written, updater.output_writer.skipped) == (2, 2)  # item and imdb files
+
+
+def test_write_metrics_file_keeps_metrics_of_unrefreshed_items(tmp_path, monkeypatch):
+    movie_dir = tmp_path / 'movies'
+    metrics_file = movie_dir / 'metrics.json'
+    movie_dir.mkdir()
+    metrics_file.write_text(json.dumps({'710': {'popularity': 1.0}, '714': {'popularity': 2.0}}))
+    monkeypatch.setattr(updater, 'databases', {
+        'game': {**updater.databases['game'], 'path': str(tmp_path / 'games' / 'igdb')},
+        'movie': {
+            **updater.databases['movie'],
+            'metrics': {'10378': {'popularity': 3.0}},
+            'path': str(movie_dir / 'themoviedb'),
+        },
+    })
+    all_items = [{'id': 710}, {'id': 10378}, {'id': 42}]
+
+    updater._write_metrics_file(db='movie', all_items=all_items)
+    updater._write_metrics_file(db='game', all_items=all_items)
+
+    assert metrics_file.read_text() == '{\n"10378":{"popularity":3.0},\n"710":{"popularity":1.0}\n}'
+    assert not (tmp_path / 'games').exists()
+
+    metrics_file.write_text('not json')
+    updater._write_metrics_file(db='movie', all_items=all_items)
+    assert json.loads(metrics_file.read_text()) == {'10378': {'popularity': 3.0}}
+
+
+def test_output_stage_runs_tasks_concurrently(capsys, monkeypatch):
+    # every task waits for all the others, so the stage only finishes if they run at the same time
+    barrier = threading.Barrier(5, timeout=10)
+    finished = []
+
+    def task(name):
+        barrier.wait()
+        finished.append(name)
+
+    monkeypatch.setattr(updater, 'databases', {'game': {}, 'movie': {}})
+    monkeypatch.setattr(updater, '_write_database_pages', lambda db: task(f'{db} pages'))
+    monkeypatch.setattr(updater, '_write_database_size_plot', lambda db: task(f'{db} plot'))
+
+    stage = updater.OutputStage()
+    stage.submit(name='top contributors', func=lambda: task('top contributors'))
+    stage.submit_database(db='movie')
+    stage.submit_database(db='movie')  # outputs are only started once
+    stage.wait()
+
+    assert sorted(finished) == ['game pages', 'game plot', 'movie pages', 'movie plot', 'top contributors']
+    output = capsys.readouterr().out
+    assert 'Output task movie plot finished in ' in output
+    assert 'Output stage finished after ' in output
+
+
+def test_output_stage_closes_item_accumulator_when_pages_fail(tmp_path, monkeypatch):
+    def sort():
+        raise RuntimeError('sort failed')
+
+    items = updater.ItemAccumulator(memory_cap=100)
+    for item_id in range(10):
+        items.append({'id': item_id, 'title': f'Title {item_id}'})
+    spill_file = items.spill_file
+    monkeypatch.setattr(items, 'sort', sort)
+    monkeypatch.setattr(updater, 'databases', {'movie': {'all_items': items, 'path': str(tmp_path / 'themoviedb')}})
+    monkeypatch.setattr(updater, '_write_database_size_plot', lambda db: None)
+
+    stage = updater.OutputStage()
+    stage.submit_database(db='movie')
+
+    with pytest.raises(RuntimeError, match='sort failed'):
+        stage.wait()
+
+    assert spill_file.closed
+    assert items.spill_file is None
+
+
+def test_output_stage_raises_task_failure(monkeypatch):
+    finished = []
+
+    def fail():
+        raise RuntimeError('leaderboard failed')
+
+    monkeypatch.setattr(updater, 'databases', {'movie': {}})
+    monkeypatch.setattr(updater, '_write_database_pages', lambda db: finished.append(f'{db} pages'))
+    monkeypatch.setattr(updater, '_write_database_size_plot', lambda db: finished.append(f'{db} plot'))
+
+    stage = updater.OutputStage()
+    stage.submit(name='top contributors', func=fail)
+
+    with pytest.raises(RuntimeError, match='leaderboard failed'):
+        stage.wait()
+
+    assert sorted(finished) == ['movie pages', 'movie plot']
+
+
+def test_database_outputs_start_when_database_refresh_finishes(state_file, monkeypatch):
+    igdb_released = threading.Event()
+    written = []
+
+    def queue_handler(item):
+        if item[0] == 'game':
+            assert igdb_released.wait(timeout=5)
+
+    def write_database_pages(db):
+        written.append(db)
+        if db == 'movie':
+            # the game items are still blocked while the movie outputs are written
+            igdb_released.set()
+
+    def queue_daily_update_items(changes):
+        updater.queue.put(('game', '1638'))
+        updater.queue.close(item_type='game')
+        updater.queue.put(('movie', '710'))
+        updater.queue.put(('movie', '711'))
+        updater.queue.close(item_type='movie')
+        updater.queue.close(item_type='tv_show')
+
+    monkeypatch.setattr(updater, 'args', daily_args(incremental=False))
+    monkeypatch.setattr(updater, 'databases', {'game': {}, 'movie': {}, 'tv_show': {}})
+    monkeypatch.setattr(updater, 'queue', updater.ProviderQueue(concurrency={'igdb': 1, 'tmdb': 2}))
+    monkeypatch.setattr(updater, 'queue_handler', queue_handler)
+    monkeypatch.setattr(updater, '_queue_daily_update_items', queue_daily_update_items)
+    monkeypatch.setattr(updater, '_print_queue_metrics', lambda: None)
+    monkeypatch.setattr(updater, '_write_database_pages', write_database_pages)
+    monkeypatch.setattr(updater, '_write_database_size_plot', lambda db: None)
+    monkeypatch.setattr(updater, 'build_top_contributor_images', lambda: None)
+    monkeypatch.setattr(updater, 'compact_change_feeds', lambda: None)
+
+    updater._run_daily_update()
+
+    assert sorted(written) == ['game', 'movie', 'tv_show']
+    assert written.index('movie') < written.index('game')
+    assert updater.queue.on_complete is None
+
+
+def test_provider_queue_reports_completed_item_types():
+    completed = []
+    provider_queue = updater.ProviderQueue()
+    provider_queue.on_complete = completed.append
+
+    provider_queue.put(('movie', '710'))
+    provider_queue.put(('game', '1638'))
+    provider_queue.item_done(item_type='movie')
+    provider_queue.close(item_type='game')
+    provider_queue.close(item_type='movie')
+    provider_queue.close(item_type='tv_show')
+    provider_queue.item_done(item_type='game')
+
+    assert completed == ['movie', 'tv_show', 'game']
+
+
+def test_compact_change_feeds_merges_past_months(tmp_path, monkeypatch):
+    changes_dir = tmp_path / 'movies' / 'changes'
+    changes_dir.mkdir(parents=True)
+    (changes_dir / '2026-08.jsonl').write_text('{"id":1}\n', encoding='utf-8')
+    (changes_dir / '2026-08-31.jsonl').write_text('{"id":1}\n{"id":2}\n', encoding='utf-8')  # interrupted run
+    (changes_dir / '2026-09-02.jsonl').write_text('{"id":4}\n', encoding='utf-8')
+    (changes_dir / '2026-09-01.jsonl').write_text('{"id":3}\n', encoding='utf-8')
+    (changes_dir / '2026-10-01.jsonl').write_text('{"id":5}\n', encoding='utf-8')
+    (changes_dir / 'notes.txt').write_text('kept', encoding='utf-8')
+    monkeypatch.setattr(updater, 'databases', {
+        'movie': {'path': str(tmp_path / 'movies' / 'themoviedb')},
+        'tv_show': {'path': str(tmp_path / 'tv_shows' / 'themoviedb')},  # no change feed yet
+    })
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+
+    updater.compact_change_feeds(today=date(2026, 10, 18))
+
+    assert sorted(path.name for path in changes_dir.iterdir()) == [
+        '2026-08.jsonl', '2026-09.jsonl', '2026-10-01.jsonl', 'notes.txt',
+    ]
+    assert (changes_dir / '2026-08.jsonl').read_text(encoding='utf-8') == '{"id":1}\n{"id":2}\n'
+    assert (changes_dir / '2026-09.jsonl').read_text(encoding='utf-8') == '{"id":3}\n{"id":4}\n'
+
+
+def test_compact_change_feeds_merges_pending_runs(tmp_path, monkeypatch, capsys):
+    changes_dir = tmp_path / 'movies' / 'changes'
+    pending_dir = changes_dir / 'pending'
+    pending_dir.mkdir(parents=True)
+    sep_30 = int(datetime(2026, 9, 30, 23, 59, tzinfo=timezone.utc).timestamp())
+    oct_18 = int(datetime(2026, 10, 18, 12, tzinfo=timezone.utc).timestamp())
+    (changes_dir / '2026-10-18.jsonl').write_text(f'{{"id":1,"timestamp":{oct_18}}}\n', encoding='utf-8')
+    (pending_dir / '100-1.jsonl').write_text(
+        f'{{"id":3,"timestamp":{oct_18 + 60}}}\n{{"id":1,"timestamp":{oct_18}}}\n',  # merged by an interrupted run
+        encoding='utf-8',
+    )
+    (pending_dir / '101-1.jsonl').write_text(
+        f'{{"id":2,"timestamp":{oct_18 + 30}}}\n{{"id":4,"timestamp":{sep_30}}}\nnot json\n',
+        encoding='utf-8',
+    )
+    monkeypatch.setattr(updater, 'databases', {'movie': {'path': str(tmp_path / 'movies' / 'themoviedb')}})
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+
+    updater.compact_change_feeds(today=date(2026, 10, 18))
+
+    assert list(pending_dir.iterdir()) == []
+    assert sorted(path.name for path in changes_dir.iterdir()) == ['2026-09.jsonl', '2026-10-18.jsonl', 'pending']
+    assert [json.loads(line)['id'] for line in (changes_dir / '2026-10-18.jsonl').read_text().splitlines()] == [
+        1, 2, 3,
+    ]
+    assert (changes_dir / '2026-09.jsonl').read_text(encoding='utf-8') == f'{{"id":4,"timestamp":{sep_30}}}\n'
+    assert 'Skipping invalid change feed line' in capsys.readouterr().out
+
+
+def test_item_accumulator_yields_added_items():
+    movies = updater.ItemAccumulator(imdb_ids=True)
+    movies.append({'id': 710, 'imdb_id': 'tt0113189', 'title': 'GoldenEye'})
+    movies.append({'id': 42, 'title': 'A Movie'})
+    shows = updater.ItemAccumulator()
+    shows.append({'id': 1930, 'title': 'Show'})
+
+    assert len(movies) == 2
+    assert list(movies) == [
+        {'id': 710, 'imdb_id': 'tt0113189', 'title': 'GoldenEye'},
+        {'id': 42, 'imdb_id': None, 'title': 'A Movie'},
+    ]
+    assert list(shows) == [{'id': 1930, 'title': 'Show'}]
+    assert not updater.ItemAccumulator()
+
+
+def test_item_accumulator_interns_titles():
+    items = updater.ItemAccumulator()
+    for item_id in range(2):
+        items.append({'id': item_id, 'title': ''.join(['Same', ' Title'])})
+
+    assert items.titles[0] is items.titles[1]
+
+
+@pytest.mark.parametrize('imdb_ids', [True, False])
+def test_item_accumulator_spills_above_memory_cap(imdb_ids):
+    items = updater.ItemAccumulator(imdb_ids=imdb_ids, memory_cap=500)
+    expected = []
+    for item_id in range(20):
+        item = {'id': item_id, 'imdb_id': f'tt{item_id:07d}', 'title': f'Title {item_id}'}
+        items.append(item)
+        expected.append(item if imdb_ids else {'id': item_id, 'title': item['title']})
+
+    assert items.spilled > 0
+    assert items.memory <= 500
+    assert len(items) == 20
+    assert list(items) == expected
+    items.append({'id': 20, 'imdb_id': None, 'title': 'Title 20'})  # appends after reading the spilled items
+    assert [item['id'] for item in items] == list(range(21))
+
+
+def test_item_accumulator_reads_spilled_items_lazily(monkeypatch):
+    monkeypatch.setattr(updater, 'SPILL_READ_SIZE', 1)  # one line per read
+    items = updater.ItemAccumulator(memory_cap=500)
+    for item_id in range(20):
+        items.append({'id': item_id, 'title': f'Title {item_id}'})
+    spilled = items.spilled
+
+    iterator = iter(items)
+    assert next(iterator) == {'id': 0, 'title': 'Title 0'}
+    for item_id in range(20, 40):
+        items.append({'id': item_id, 'title': f'Title {item_id}'})  # spills between reads
+
+    assert items.spilled > spilled
+    assert [item['id'] for item in iterator] == list(range(1, 20))
+    assert [item['id'] for item in items] == list(range(40))
+
+
+@pytest.mark.parametrize('memory_cap', [None, 500])
+def test_item_accumulator_sorts_columns_in_page_order(memory_cap):
+    items = updater.ItemAccumulator(imdb_ids=True, memory_cap=memory_cap)
+    expected = []
+    for item_id in (9, 10, 3, 100, 42, 7, 8, 11, 12, 13, 14, 15):
+        item = {'id': item_id, 'imdb_id': f'tt{item_id:07d}', 'title': f'Title {item_id % 3}'}
+        items.append(item)
+        expected.append(item)
+
+    items.sort()
+
+    assert items.spilled == 0
+    assert items.spill_file is None
+    assert list(items) == sorted(expected, key=updater._get_page_sort_key)
+
+
+@pytest.mark.parametrize('imdb_ids', [True, False])
+def test_item_accumulator_reads_sorted_items_by_position_and_id(imdb_ids):
+    items = updater.ItemAccumulator(imdb_ids=imdb_ids, memory_cap=500)
+    for item_id in range(20, 0, -1):
+        items.append({'id': item_id, 'imdb_id': f'tt{item_id:07d}', 'title': f'Title {item_id % 3}'})
+    expected = sorted(items, key=updater._get_page_sort_key)
+
+    with pytest.raises(RuntimeError, match='sorted'):
+        items[0]  # spilled items have no position until the items are sorted
+    items.sort()
+
+    assert items[0] == expected[0]
+    assert items[5:8] == expected[5:8]
+    assert list(items.iter_by_id()) == sorted(expected, key=lambda item: item['id'])
+    assert list(updater._iter_items_by_id(all_items=expected)) == list(items.iter_by_id())
+
+
+def test_item_accumulator_counts_retained_memory():
+    items = updater.ItemAccumulator(memory_cap=800)
+    items.retain(size=600)
+    items.append({'id': 1, 'title': 'Title 1'})
+    items.append({'id': 2, 'title': 'Title 2'})
+    assert items.spilled == 0
+
+    items.append({'id': 3, 'title': 'Title 3'})  # over the share of the cap that the details leave
+    assert (items.spilled, items.memory) == (3, 0)
+
+    items.retain(size=1000)  # once the details use the cap, items are spilled in batches of an eighth of it
+    items.append({'id': 4, 'title': 'Title 4'})
+    assert items.spilled == 3
+    items.append({'id': 5, 'title': 'Title 5'})
+    assert items.spilled == 5
+
+
+def test_item_accumulator_close_removes_spilled_items():
+    items = updater.ItemAccumulator(memory_cap=100)
+    items.append({'id': 1, 'title': 'Title 1'})
+    items.append({'id': 2, 'title': 'Title 2'})
+    spill_file = items.spill_file
+    items.append({'id': 3, 'title': 'Title 3'})
+
+    items.close()
+    items.close()
+
+    assert spill_file.closed
+    assert list(items) == [{'id': 3, 'title': 'Title 3'}]
+
+
+def test_append_all_item_counts_details_against_memory_cap(monkeypatch):
+    items = updater.ItemAccumulator(imdb_ids=True)
+    monkeypatch.setattr(updater, 'databases', {'movie': {'all_items': items, 'content_hashes': {'710': ('a' * 64, 1)}}})
+
+    updater._append_all_item(item_type='movie', data={
+        'id': 710,
+        'title': 'GoldenEye',
+        'youtube_theme_url': 'https://www.youtube.com/watch?v=abcdefghijk',
+        'youtube_theme_added': 1700000000,
+    })
+    updater._append_all_item(item_type='movie', data={'id': 42, 'title': 'A Movie'})
+
+    assert items.retained > 2 * updater.ITEM_DETAILS_OVERHEAD + 64
+    assert updater.databases['movie']['index_details']['710'] == (None, 'abcdefghijk')
+
+
+def test_item_accumulator_appends_from_threads():
+    items = updater.ItemAccumulator(imdb_ids=True, memory_cap=2000)
+
+    def append_items(start):
+        for item_id in range(start, start + 500):
+            items.append({'id': item_id, 'imdb_id': None, 'title': f'Title {item_id}'})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(append_items, range(0, 4000, 500)))
+
+    assert sorted(item['id'] for item in items) == list(range(4000))
+
+
+def test_run_daily_update_collects_items_with_memory_cap(state_file, monkeypatch):
+    monkeypatch.setattr(updater, 'args', updater.parse_args(['--daily_update', '--items_memory_cap', '1']))
+    monkeypatch.setattr(updater, 'databases', {'movie': {'all_items': []}, 'tv_show': {}})
+    monkeypatch.setattr(updater, '_get_daily_update_changes', lambda state, started: None)
+    monkeypatch.setattr(updater, '_queue_daily_update_items', lambda changes: None)
+    monkeypatch.setattr(updater, '_ensure_queue_workers', lambda: None)
+    monkeypatch.setattr(updater, '_print_queue_metrics', lambda: None)
+    monkeypatch.setattr(updater, 'build_top_contributor_images', lambda: None)
+    monkeypatch.setattr(updater, 'compact_change_feeds', lambda: None)
+    monkeypatch.setattr(updater, '_write_database_pages', lambda db: None)
+    monkeypatch.setattr(updater, 'queue', updater.ProviderQueue())
+
+    updater._run_daily_update()
+
+    movies = updater.databases['movie']['all_items']
+    assert isinstance(movies, updater.ItemAccumulator)
+    assert movies.imdb_ids == []
+    assert movies.memory_cap == 1024 * 1024
+    assert updater.databases['tv_show']['all_items'].imdb_ids is None
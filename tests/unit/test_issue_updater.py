@@ -147,13 +147,14 @@ def test_igdb_authorization(monkeypatch):
         def json(self):
             return {'access_token': 'token'}
 
-    def post(url, data):
-        assert url == 'https://id.twitch.tv/oauth2/token'
-        assert data['client_id'] == 'client-id'
-        assert data['client_secret'] == 'client-secret'
-        return Response()
+    class Session:
+        def post(self, url, data):
+            assert url == 'https://id.twitch.tv/oauth2/token'
+            assert data['client_id'] == 'client-id'
+            assert data['client_secret'] == 'client-secret'
+            return Response()
 
-    monkeypatch.setattr(updater.requests, 'post', post)
+    monkeypatch.setattr(updater.transport, 'session', lambda name: Session())
 
     auth = updater.igdb_authorization(
         client_id='client-id',
@@ -175,7 +176,7 @@ def test_get_igdb_wrapper_initializes_lazily(monkeypatch):
     monkeypatch.setenv('TWITCH_CLIENT_SECRET', 'client-secret')
     monkeypatch.setattr(updater, 'wrapper', None)
     monkeypatch.setattr(updater, 'igdb_authorization', lambda client_id, client_secret: {'access_token': 'token'})
-    monkeypatch.setattr(updater, 'IGDBWrapper', Wrapper)
+    monkeypatch.setattr(updater, 'PooledIGDBWrapper', Wrapper)
 
     wrapper = updater.get_igdb_wrapper()
 
@@ -654,6 +655,45 @@ def test_process_item_id(item_type, item_id, mock_igdb_api, mock_tmdb_api, youtu
     assert data['youtube_theme_url']
 
 
+def test_process_item_id_records_change_events(mock_tmdb_api, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GITHUB_RUN_ID', '123')
+    monkeypatch.setenv('GITHUB_RUN_ATTEMPT', '2')
+    monkeypatch.setattr(updater, 'args', type('Args', (), {'issue_update': False})())
+
+    for youtube_url in [
+        'https://www.youtube.com/watch?v=qGPBFvDz_HM',
+        'https://www.youtube.com/watch?v=qGPBFvDz_HM',  # the same theme is not a change
+        'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+    ]:
+        updater.process_item_id(item_type='movie', item_id=710, youtube_url=youtube_url)
+    updater.process_item_id(item_type='movie', item_id=710)  # refreshes without a theme url are not changes
+
+    # each run writes its own pending file, so concurrent workflows never edit the same file
+    [feed_file] = (tmp_path / 'database' / 'movies' / 'changes' / 'pending').iterdir()
+    assert feed_file.name == '123-2.jsonl'
+    events = [json.loads(line) for line in feed_file.read_text(encoding='utf-8').splitlines()]
+    assert [(event['event'], event['id'], event['old_youtube_id'], event['new_youtube_id']) for event in events] == [
+        ('add', 710, None, 'qGPBFvDz_HM'),
+        ('edit', 710, 'qGPBFvDz_HM', 'dQw4w9WgXcQ'),
+    ]
+
+
+@pytest.mark.parametrize('run_id, run_attempt, expected', [
+    ('123', '2', '123-2'),
+    ('123', None, '123-1'),
+    (None, None, f'local-{os.getpid()}'),
+])
+def test_get_change_feed_run_id(run_id, run_attempt, expected, monkeypatch):
+    for name, value in (('GITHUB_RUN_ID', run_id), ('GITHUB_RUN_ATTEMPT', run_attempt)):
+        if value is None:
+            monkeypatch.delenv(name, raising=False)
+        else:
+            monkeypatch.setenv(name, value)
+
+    assert updater._get_change_feed_run_id() == expected
+
+
 def test_main_daily_update(daily_update_args, mock_igdb_api, mock_tmdb_api, monkeypatch):
     class FutureDateTime(RealDateTime):
         @classmethod
@@ -822,7 +862,19 @@ def test_process_item_id_tmdb_not_found_with_stale_file(item_type, tmp_path, mon
     tmp_db_path = tmp_path / 'database' / item_type / 'themoviedb'
     tmp_db_path.mkdir(parents=True)
     stale_file = tmp_db_path / f'{item_id}.json'
-    stale_file.write_text(json.dumps({'id': int(item_id), 'title': 'Removed Item'}))
+    stale_file.write_text(json.dumps({
+        'id': int(item_id),
+        'imdb_id': 'tt0000001',
+        'name': 'Removed Item',
+        'title': 'Removed Item',
+        'youtube_theme_url': 'https://www.youtube.com/watch?v=qGPBFvDz_HM',
+    }))
+
+    stale_file.with_suffix('.json.gz').write_bytes(b'')
+    imdb_dir = tmp_path / 'database' / 'imdb'
+    imdb_dir.mkdir()
+    (imdb_dir / 'tt0000001.json').write_text('{}')
+    monkeypatch.setattr(updater, 'imdb_path', str(imdb_dir))
 
     monkeypatch.setitem(updater.databases[item_type], 'path', str(tmp_db_path))
     monkeypatch.setenv('TMDB_API_KEY_V3', 'test_key')
@@ -834,7 +886,13 @@ def test_process_item_id_tmdb_not_found_with_stale_file(item_type, tmp_path, mon
         data = updater.process_item_id(item_type=item_type, item_id=item_id)
 
     assert data == {}
-    assert not stale_file.exists()
+    assert list(tmp_db_path.iterdir()) == []
+    # only movies have an IMDb copy
+    assert (imdb_dir / 'tt0000001.json').exists() == (item_type != 'movie')
+    [feed_file] = (tmp_path / 'database' / item_type / 'changes' / 'pending').iterdir()
+    event = json.loads(feed_file.read_text(encoding='utf-8'))
+    assert event.pop('timestamp') > 0
+    assert event == {'event': 'remove', 'id': item_id, 'old_youtube_id': 'qGPBFvDz_HM', 'new_youtube_id': None}
 
 
 @pytest.mark.parametrize('item_type', ['movie', 'movie_collection', 'tv_show'])
@@ -862,9 +920,9 @@ def test_queue_handler_skips_empty_data():
     original_items = list(updater.databases['movie']['all_items'])
 
     with patch('src.updater.process_item_id', return_value={}):
-        updater.queue_handler(item=('movie', '42903'))
+        assert updater.queue_handler(item=('movie', '42903')) is False
 
-    assert updater.databases['movie']['all_items'] == original_items
+    assert list(updater.databases['movie']['all_items']) == original_items
 
 
 @pytest.mark.parametrize('item_type, item_id, response, expected', [
@@ -900,7 +958,7 @@ def test_queue_handler_appends_processed_item(item_type, item_id, response, expe
     monkeypatch.setitem(updater.databases[item_type], 'all_items', [])
 
     with patch('src.updater.process_item_id', return_value=response) as process_item_id:
-        updater.queue_handler(item=(item_type, item_id))
+        assert updater.queue_handler(item=(item_type, item_id)) is True
 
     process_item_id.assert_called_once_with(item_type=item_type, item_id=item_id)
     assert updater.databases[item_type]['all_items'] == [expected]
@@ -920,17 +978,11 @@ def test_process_queue_task_done_called_on_exception():
 
     test_queue.task_done = patched_task_done
 
-    original_queue = updater.queue
-    updater.queue = test_queue
-
-    try:
-        with patch('src.updater.queue_handler', side_effect=RuntimeError('simulated failure')):
-            thread = threading.Thread(target=updater.process_queue, daemon=True)
-            thread.start()
-            assert task_done_called.wait(timeout=5), 'queue.task_done() was not called within timeout'
-            test_queue.join()
-    finally:
-        updater.queue = original_queue
+    with patch('src.updater.queue_handler', side_effect=RuntimeError('simulated failure')):
+        thread = threading.Thread(target=updater.process_queue, args=(test_queue,), daemon=True)
+        thread.start()
+        assert task_done_called.wait(timeout=5), 'queue.task_done() was not called within timeout'
+        test_queue.join()
 
 
 def test_requests_loop_no_retry_on_permanent_status():
@@ -1019,8 +1071,9 @@ def test_start_queue_workers_stops_on_runtime_error(monkeypatch, capsys):
     class FailingThread:
         daemon = False
 
-        def __init__(self, target):
+        def __init__(self, target, args):
             assert target == updater.process_queue
+            assert args == (updater.queue.lanes['igdb'],)
 
         def start(self):
             raise RuntimeError('thread failed')
@@ -1416,6 +1469,7 @@ def mock_youtube_build(monkeypatch, response=None, exception=None):
         return YouTube()
 
     monkeypatch.setattr(updater, 'build', build)
+    monkeypatch.setattr(updater, 'youtube_services', threading.local())
 
 
 def test_check_youtube_returns_none_without_api_key(tmp_path, monkeypatch, youtube_url):
@@ -6,11 +6,18 @@ controlling API request frequency to ensure compliance with API rate limits. Tes
 validate that the rate limiter correctly throttles requests according to specified rates.
 """
 # standard imports
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
 import math
 import time
 import threading
 
+# lib imports
+import pytest
+import requests
+
 # local imports
+from src import updater
 from src.updater import RateLimiter
 
 
@@ -24,6 +31,7 @@ class TestRateLimiter:
         assert limiter.max_requests_per_second == 10
         assert math.isclose(limiter.min_interval, 0.1, rel_tol=1e-09, abs_tol=1e-09)
         assert limiter.last_request_time == 0
+        assert limiter.burst == 1
         assert limiter.lock is not None
 
     def test_rate_limiter_allows_immediate_first_request(self):
@@ -170,3 +178,277 @@ class TestRateLimiter:
         limiter.wait()
         second_call_time = limiter.last_request_time
         assert second_call_time >= first_call_time
+
+    def test_rate_limiter_allows_burst(self):
+        """Test that an idle limiter allows a burst of requests before throttling."""
+        limiter = RateLimiter(max_requests_per_second=10, burst=5)
+
+        start_time = time.time()
+        for _ in range(5):
+            limiter.wait()
+        burst_time = time.time() - start_time
+        limiter.wait()
+        elapsed_time = time.time() - start_time
+
+        # the burst is immediate, then the sixth request waits for a refilled token
+        assert burst_time < 0.05
+        assert elapsed_time >= 0.09
+        assert elapsed_time < 0.2
+
+    def test_rate_limiter_weighted_cost(self):
+        """Test that a weighted request uses several request slots."""
+        limiter = RateLimiter(max_requests_per_second=10)
+
+        limiter.wait(cost=3)
+        start_time = time.time()
+        limiter.wait()
+        elapsed_time = time.time() - start_time
+
+        # the weighted request owes 2 slots and the next request waits for its own slot too
+        assert elapsed_time >= 0.09
+        assert elapsed_time < 0.4
+
+    def test_rate_limiter_does_not_sleep_while_holding_lock(self):
+        """Test that a waiting thread does not hold the lock while it sleeps."""
+        limiter = RateLimiter(max_requests_per_second=1)
+        limiter.wait()
+
+        waiter = threading.Thread(target=limiter.wait)
+        waiter.start()
+        time.sleep(0.05)
+
+        # the waiter has reserved its slot and is sleeping, so the lock is free
+        assert limiter.lock.acquire(timeout=0.1)
+        limiter.lock.release()
+        waiter.join()
+
+    def test_rate_limiter_contention_benchmark(self):
+        """Benchmark throughput with many threads contending for one limiter."""
+        rate = 200
+        thread_count = 48
+        requests_per_thread = 5
+        limiter = RateLimiter(max_requests_per_second=rate)
+        barrier = threading.Barrier(thread_count)
+
+        def make_requests():
+            barrier.wait()
+            for _ in range(requests_per_thread):
+                limiter.wait()
+
+        threads = [threading.Thread(target=make_requests) for _ in range(thread_count)]
+        start_time = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed_time = time.time() - start_time
+
+        total_requests = thread_count * requests_per_thread
+        throughput = total_requests / elapsed_time
+        print(f'{thread_count} threads: {throughput:.1f} requests/second (limit {rate})')
+
+        # first request is immediate, then the rest are spaced at the configured rate
+        assert elapsed_time >= (total_requests - 1) / rate - 0.01
+        assert throughput >= rate * 0.9
+
+    def test_rate_limiter_contention_benchmark_with_burst(self):
+        """Benchmark that a burst does not raise sustained throughput above the configured rate."""
+        rate = 100
+        burst = 10
+        thread_count = 40
+        limiter = RateLimiter(max_requests_per_second=rate, burst=burst)
+
+        threads = [threading.Thread(target=limiter.wait, kwargs={'cost': 2}) for _ in range(thread_count)]
+        start_time = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed_time = time.time() - start_time
+
+        # 40 requests of cost 2 use 80 tokens, 10 of them from the burst
+        expected_time = (thread_count * 2 - burst) / rate
+        assert elapsed_time >= expected_time - 0.01
+        assert elapsed_time < expected_time + 0.15
+
+
+class RecordingLimiter(RateLimiter):
+    """Rate limiter that records hold delays instead of waiting them out."""
+
+    def __init__(self, max_requests_per_second: float):
+        super().__init__(max_requests_per_second=max_requests_per_second)
+        self.holds = []
+
+    def hold(self, delay: float) -> None:
+        self.holds.append(round(delay, 1))
+
+
+def make_response(status_code: int, headers: dict) -> requests.Response:
+    """Create a response with the given status and headers."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    return response
+
+
+class TestAdaptiveRateControl:
+    """Test suite for adapting the request rate to provider throttling."""
+
+    def test_throttle_halves_rate_down_to_floor(self):
+        """Test that throttling halves the rate, but not below an eighth of the configured rate."""
+        limiter = RateLimiter(max_requests_per_second=40)
+
+        limiter.throttle()
+        assert limiter.max_requests_per_second == 20
+        assert math.isclose(limiter.min_interval, 0.05)
+
+        for _ in range(5):
+            limiter.throttle()
+        assert limiter.max_requests_per_second == 5
+
+    def test_recover_ramps_rate_back_up(self):
+        """Test that healthy responses add the rate back one step at a time."""
+        limiter = RateLimiter(max_requests_per_second=4, recovery_step=1.5)
+        limiter.throttle()
+
+        limiter.recover()
+        assert limiter.max_requests_per_second == 3.5
+        limiter.recover()
+        limiter.recover()
+        assert limiter.max_requests_per_second == 4
+        assert math.isclose(limiter.min_interval, 0.25)
+
+    def test_hold_delays_next_request(self):
+        """Test that holding the limiter delays the next request by the given delay."""
+        limiter = RateLimiter(max_requests_per_second=100)
+        limiter.wait()
+
+        limiter.hold(delay=0.2)
+        start_time = time.time()
+        limiter.wait()
+        elapsed_time = time.time() - start_time
+
+        assert elapsed_time >= 0.19
+        assert elapsed_time < 0.3
+
+    def test_throttle_holds_for_retry_after(self):
+        """Test that throttling with a delay holds off requests for that delay."""
+        limiter = RateLimiter(max_requests_per_second=100)
+
+        limiter.throttle(delay=0.2)
+        start_time = time.time()
+        limiter.wait()
+        elapsed_time = time.time() - start_time
+
+        assert elapsed_time >= 0.19
+        assert limiter.max_requests_per_second == 50
+
+    @pytest.mark.parametrize('headers, expected', [
+        ({}, None),
+        ({'Retry-After': '3'}, 3.0),
+        ({'Retry-After': '600'}, updater.RATE_LIMIT_MAX_DELAY),
+        ({'Retry-After': 'soon'}, None),
+        ({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '2'}, 2.0),
+        ({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': 'later'}, None),
+        ({'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': '2'}, None),
+    ])
+    def test_get_retry_after(self, headers, expected):
+        """Test reading the server-given delay from rate limit headers."""
+        assert updater._get_retry_after(response=make_response(status_code=429, headers=headers)) == expected
+
+    def test_get_retry_after_dates(self):
+        """Test reading delays given as an HTTP date or an epoch reset time."""
+        retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        reset_at = str(int(time.time()) + 30)
+
+        http_date = updater._get_retry_after(response=make_response(status_code=503, headers={'Retry-After': retry_at}))
+        epoch = updater._get_retry_after(response=make_response(status_code=200, headers={
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': reset_at,
+        }))
+
+        assert 28 <= http_date <= 30
+        assert 28 <= epoch <= 30
+
+    def test_requests_loop_honors_retry_after(self, stub_server):
+        """Test that a throttled request waits for Retry-After instead of the fixed backoff."""
+        stub_server.add_route(
+            '/movie/1',
+            (429, {}, {'Retry-After': '0.2'}),
+            (200, {'id': 1}, {}),
+        )
+        limiter = RateLimiter(max_requests_per_second=40)
+
+        start_time = time.time()
+        response = updater.requests_loop(url=f'{stub_server.url}/movie/1', limiter=limiter)
+        elapsed_time = time.time() - start_time
+
+        assert response.json() == {'id': 1}
+        assert len(stub_server.requests) == 2
+        assert 0.19 <= elapsed_time < 1.5
+        assert limiter.max_requests_per_second == 21  # halved, then recovered one step
+
+    def test_requests_loop_backs_off_on_503_without_retry_after(self, stub_server):
+        """Test that throttled responses without a delay hold off for the exponential backoff."""
+        stub_server.add_route('/movie/1', (503, {}, {}), (503, {}, {}), (200, {'id': 1}, {}))
+        limiter = RecordingLimiter(max_requests_per_second=40)
+
+        response = updater.requests_loop(url=f'{stub_server.url}/movie/1', limiter=limiter)
+
+        assert response.status_code == 200
+        assert limiter.holds == [2, 4]
+        assert limiter.max_requests_per_second == 11
+
+    def test_requests_loop_returns_last_throttled_response(self, stub_server):
+        """Test that requests stop after the maximum number of throttled attempts."""
+        stub_server.add_route('/movie/1', (429, {}, {'Retry-After': '0'}))
+        limiter = RecordingLimiter(max_requests_per_second=40)
+
+        response = updater.requests_loop(url=f'{stub_server.url}/movie/1', max_tries=2, limiter=limiter)
+
+        assert response.status_code == 429
+        assert len(stub_server.requests) == 2
+
+    def test_requests_loop_holds_when_quota_is_used_up(self, stub_server):
+        """Test that a healthy response reporting no remaining quota holds off the next request."""
+        stub_server.add_route('/movie/1', (200, {'id': 1}, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '5'}))
+        limiter = RecordingLimiter(max_requests_per_second=40)
+
+        response = updater.requests_loop(url=f'{stub_server.url}/movie/1', limiter=limiter)
+
+        assert response.status_code == 200
+        assert limiter.holds == [5]
+
+    def test_igdb_api_request_retries_throttled_requests(self, monkeypatch):
+        """Test that IGDB requests are retried after IGDB throttles them."""
+        limiter = RecordingLimiter(max_requests_per_second=4)
+        responses = [make_response(status_code=429, headers={'Retry-After': '1'}), b'[]']
+
+        def api_request(endpoint, query):
+            response = responses.pop(0)
+            if isinstance(response, requests.Response):
+                raise requests.exceptions.HTTPError(response=response)
+            return response
+
+        monkeypatch.setattr(updater, 'igdb_limiter', limiter)
+        monkeypatch.setattr(updater, 'wrapper', type('Wrapper', (), {'api_request': staticmethod(api_request)})())
+
+        assert updater._igdb_api_request(endpoint='games', query='fields id;') == b'[]'
+        assert limiter.holds == [1]
+        assert limiter.max_requests_per_second == 3
+
+    @pytest.mark.parametrize('response, max_tries', [
+        (make_response(status_code=400, headers={}), 3),
+        (make_response(status_code=429, headers={}), 1),
+        (None, 3),
+    ])
+    def test_igdb_api_request_raises_other_errors(self, monkeypatch, response, max_tries):
+        """Test that IGDB errors are raised when they are not throttling or retries run out."""
+        def api_request(endpoint, query):
+            raise requests.exceptions.HTTPError(response=response)
+
+        monkeypatch.setattr(updater, 'igdb_limiter', RecordingLimiter(max_requests_per_second=4))
+        monkeypatch.setattr(updater, 'wrapper', type('Wrapper', (), {'api_request': staticmethod(api_request)})())
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            updater._igdb_api_request(endpoint='games', query='fields id;', max_tries=max_tries)
@@ -1,8 +1,12 @@
 # standard imports
-from datetime import datetime as RealDateTime
+from datetime import date, datetime as RealDateTime
+import gzip
+import hashlib
 import json
+import os
 
 # lib imports
+import pytest
 import requests
 
 # local imports
@@ -263,6 +267,7 @@ def test_build_top_contributor_images_uses_default_profile_resolver(tmp_path, mo
 
 def test_queue_daily_update_items_queues_only_database_files(tmp_path, monkeypatch):
     queued = []
+    closed = []
     database_root = tmp_path / 'database'
     tmdb_dir = database_root / 'movies' / 'themoviedb'
     empty_dir = database_root / 'empty' / 'items'
@@ -275,6 +280,9 @@ def test_queue_daily_update_items_queues_only_database_files(tmp_path, monkeypat
         def put(self, item):
             queued.append(item)
 
+        def close(self, item_type):
+            closed.append(item_type)
+
     monkeypatch.setattr(updater, 'queue', RecordingQueue())
     monkeypatch.setattr(updater, 'databases', {
         'movie': {
@@ -294,6 +302,7 @@ def test_queue_daily_update_items_queues_only_database_files(tmp_path, monkeypat
     updater._queue_daily_update_items()
 
     assert queued == [('movie', '710')]
+    assert closed == ['movie', 'missing', 'empty']
 
 
 def test_build_database_plot_values_rolls_up_dates_and_extends_to_today(monkeypatch):
@@ -310,18 +319,65 @@ def test_build_database_plot_values_rolls_up_dates_and_extends_to_today(monkeypa
     assert x_values[-1] == '2999-01-02'
 
 
-def test_write_database_outputs_writes_pages_chunks_and_plot(tmp_path, monkeypatch):
+@pytest.mark.parametrize('start, end, expected', [
+    (date(2024, 1, 1), date(2024, 1, 1), [date(2024, 1, 1)]),
+    (date(2024, 1, 1), date(2024, 1, 8), [date(2024, 1, day) for day in range(1, 9)]),
+    (date(2024, 1, 1), date(2024, 1, 9), [date(2024, 1, day) for day in range(1, 10, 2)]),
+    (date(2024, 1, 1), date(2024, 2, 20), [date(2024, 1, 1) + updater.timedelta(days=7 * x) for x in range(8)]),
+    (date(2024, 1, 15), date(2024, 7, 1), [date(2024, month, 1) for month in range(2, 8)]),
+    (date(2023, 12, 2), date(2026, 12, 31), [date(year, month, 1) for year in range(2024, 2027) for month in (1, 7)]),
+    (date(2023, 12, 2), date(2028, 1, 1), [date(year, 1, 1) for year in range(2024, 2029)]),
+    (date(1900, 1, 1), date(2024, 1, 1), [date(year, 1, 1) for year in range(1900, 2021, 10)]),
+])
+def test_get_plot_date_ticks(start, end, expected):
+    assert updater._get_plot_date_ticks(start=start, end=end) == expected
+
+
+@pytest.mark.parametrize('max_value, expected', [
+    (1, [0, 1]),
+    (6, [0, 1, 2, 3, 4, 5, 6]),
+    (7, [0, 2, 4, 6, 8]),
+    (31, [0, 10, 20, 30, 40]),
+    (12345, [0, 5000, 10000, 15000]),
+])
+def test_get_plot_value_ticks(max_value, expected):
+    assert updater._get_plot_value_ticks(max_value=max_value) == expected
+
+
+def test_render_database_size_svg():
+    svg = updater.render_database_size_svg(
+        title='Movies & Shows',
+        x_values=['2024-01-01', '2024-01-03', '2024-01-05'],
+        y_values=[1, 4, 6],
+    )
+
+    assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg" width="720" height="288"')
+    assert '<title id="title">Movies &amp; Shows</title>' in svg
+    assert '>Themes</text>' in svg
+    assert '>2024-01-03</text>' in svg
+    assert '>6</text>' in svg
+    assert f'stroke:{updater.PLOT_LINE_COLOR}' in svg
+    assert '<polyline class="line" points="72.0,186.7 384.0,98.7 696.0,40.0"/>' in svg
+    assert svg == updater.render_database_size_svg(
+        title='Movies & Shows',
+        x_values=['2024-01-01', '2024-01-03', '2024-01-05'],
+        y_values=[1, 4, 6],
+    )
+
+
+def test_render_database_size_svg_single_day():
+    svg = updater.render_database_size_svg(title='Movies', x_values=['2024-01-01'], y_values=[0])
+
+    assert '<polyline class="line" points="72.0,216.0"/>' in svg
+
+
+def setup_movie_outputs(tmp_path, monkeypatch):
     database_root = tmp_path / 'database'
     movie_dir = database_root / 'movies'
     tmdb_dir = movie_dir / 'themoviedb'
     imdb_dir = movie_dir / 'imdb'
     tmdb_dir.mkdir(parents=True)
     imdb_dir.mkdir()
-    (tmdb_dir / '710.json').write_text(json.dumps({
-        'id': 710,
-        'youtube_theme_added': 1700000000,
-    }), encoding='utf-8')
-    (imdb_dir / 'tt0113189.json').write_text('{}', encoding='utf-8')
 
     monkeypatch.setattr(updater, 'databases', {
         'movie': {
@@ -333,13 +389,21 @@ def test_write_database_outputs_writes_pages_chunks_and_plot(tmp_path, monkeypat
                 },
             ],
             'path': str(tmdb_dir),
+            'theme_timestamps': [1700000000],
             'title': 'Movies',
             'type': 'movie',
         },
     })
     monkeypatch.setattr(updater, 'imdb_path', str(imdb_dir))
 
-    updater._write_database_outputs(db='movie')
+    return movie_dir
+
+
+def test_database_outputs_write_pages_chunks_and_plot(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+
+    updater._write_database_pages(db='movie')
+    updater._write_database_size_plot(db='movie')
 
     assert json.loads((movie_dir / 'all_page_1.json').read_text(encoding='utf-8')) == [{
         'id': 710,
@@ -349,9 +413,475 @@ def test_write_database_outputs_writes_pages_chunks_and_plot(tmp_path, monkeypat
     assert json.loads((movie_dir / 'pages.json').read_text(encoding='utf-8')) == {
         'count': 1,
         'pages': 1,
+        'next_page': 2,
+        'buckets': [{'page': 1, 'count': 1, 'start': ['GoldenEye', '710']}],
+        'index': {'file': 'all_index.json', 'fields': list(updater.INDEX_FIELDS)},
+        'search_index': {'file': 'search_index.json'},
+        'manifest': {'file': 'manifest.json'},
+        'themes': {'file': 'themes.json', 'fields': ['id', 'imdb_id', 'youtube_id', 'edited']},
+        'changes': {'directory': 'changes', 'daily': 'YYYY-MM-DD.jsonl', 'monthly': 'YYYY-MM.jsonl'},
+        'bundle': {
+            'file': 'bundle.ndjson',
+            'index': 'bundle_index.bin',
+            'imdb_index': 'bundle_imdb_index.bin',
+            'record_format': '<QQI',
+        },
         'imdb_count': 1,
     }
     assert (movie_dir / 'movies_plot.svg').is_file()
+    assert not list(movie_dir.glob('*.gz'))  # compressed copies follow the compress setting of the writer
+
+
+def page_items(*titles):
+    return [{'id': index, 'title': title} for index, title in enumerate(titles)]
+
+
+def bucket_titles(buckets, all_items):
+    return [(page_number, [item['title'] for item in all_items[start:end]]) for page_number, start, end in buckets]
+
+
+def test_build_page_buckets_pages_new_databases_evenly():
+    titles = [f'Title {index:02}' for index in range(25)]
+
+    all_items = page_items(*titles)
+
+    buckets = updater._build_page_buckets(all_items=all_items, previous_buckets=[])
+
+    assert buckets == [(1, 0, 8), (2, 8, 16), (3, 16, 25)]
+    assert bucket_titles(buckets, all_items) == [(1, titles[:8]), (2, titles[8:16]), (3, titles[16:])]
+
+
+@pytest.mark.parametrize('titles, expected', [
+    # items are placed in the page whose start precedes them, including titles before the first start
+    (list('ABCDEMNOPQ'), [(3, list('ABCDE')), (7, list('MNOPQ'))]),
+    # small pages are merged into the previous page
+    (list('ABCDEM'), [(3, list('ABCDEM'))]),
+    # a small first page takes in the next page
+    (list('AMNOPQ'), [(3, list('AMNOPQ'))]),
+    # large pages are split, and new pages get unused page numbers
+    ([f'M{index:02}' for index in range(21)] + list('ABCDE'), [
+        (3, list('ABCDE')),
+        (7, [f'M{index:02}' for index in range(7)]),
+        (8, [f'M{index:02}' for index in range(7, 14)]),
+        (9, [f'M{index:02}' for index in range(14, 21)]),
+    ]),
+])
+def test_build_page_buckets_keeps_previous_pages(titles, expected):
+    previous_buckets = [
+        {'page': 3, 'count': 5, 'start': ['B', '0']},
+        {'page': 7, 'count': 5, 'start': ['M', '0']},
+    ]
+    all_items = sorted(page_items(*titles), key=updater._get_page_sort_key)
+
+    buckets = updater._build_page_buckets(all_items=all_items, previous_buckets=previous_buckets)
+
+    assert bucket_titles(buckets, all_items) == expected
+
+
+def test_write_database_pages_does_not_reuse_merged_page_numbers(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    titles = [f'Title {index:02}' for index in range(30)]
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', page_items(*titles))
+    updater._write_database_pages(db='movie')
+    assert json.loads((movie_dir / 'pages.json').read_text(encoding='utf-8'))['next_page'] == 4
+
+    # the last page is merged away, then the first page grows and is split
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', page_items(*titles[:22]))
+    updater._write_database_pages(db='movie')
+    assert json.loads((movie_dir / 'pages.json').read_text(encoding='utf-8'))['next_page'] == 4
+    new_titles = [f'Title 00{letter}' for letter in 'abcdefghijklm']
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', page_items(*titles[:22], *new_titles))
+    updater._write_database_pages(db='movie')
+
+    pages = json.loads((movie_dir / 'pages.json').read_text(encoding='utf-8'))
+    assert [bucket['page'] for bucket in pages['buckets']] == [1, 4, 5, 2]  # page 3 is not reused
+    assert pages['next_page'] == 6
+
+
+@pytest.mark.parametrize('content, expected', [
+    (None, ([], 1)),
+    ('[]', ([], 1)),
+    ('{"buckets": [{"page": 3}]}', ([{'page': 3}], 4)),
+    ('{"buckets": [{"page": 3}], "next_page": 9}', ([{'page': 3}], 9)),
+])
+def test_load_page_buckets(tmp_path, content, expected):
+    pages_file = tmp_path / 'pages.json'
+    if content is not None:
+        pages_file.write_text(content, encoding='utf-8')
+
+    assert updater._load_page_buckets(pages_file=str(pages_file)) == expected
+
+
+def test_write_database_pages_only_rewrites_changed_pages(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    titles = [f'Title {index:03}' for index in range(100)]
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', page_items(*titles))
+    monkeypatch.setitem(updater.databases['movie'], 'theme_timestamps', [])
+    (movie_dir / 'all_page_99.json').write_text('[]', encoding='utf-8')  # page from an older layout
+    updater._write_database_pages(db='movie')
+    assert not (movie_dir / 'all_page_99.json').exists()
+
+    # one new title near the start only rewrites its own page, the page metadata and the indexes
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+    new_item = {'id': 100, 'title': 'Title 000a'}
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', page_items(*titles) + [new_item])
+    updater._write_database_pages(db='movie')
+
+    assert (updater.output_writer.written, updater.output_writer.skipped) == (4, 15)
+    assert json.loads((movie_dir / 'all_page_1.json').read_text(encoding='utf-8'))[1]['title'] == 'Title 000a'
+    assert json.loads((movie_dir / 'all_page_2.json').read_text(encoding='utf-8'))[0]['title'] == 'Title 010'
+
+
+def test_write_database_pages_sorts_and_closes_item_accumulator(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    titles = [f'Title {index:03}' for index in range(30)]
+    expected = page_items(*titles)
+    items = updater.ItemAccumulator(memory_cap=500)
+    for item in reversed(expected):
+        items.append(item)
+    spill_file = items.spill_file
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', items)
+
+    updater._write_database_pages(db='movie')
+
+    pages = [json.loads((movie_dir / f'all_page_{page}.json').read_text(encoding='utf-8')) for page in (1, 2, 3)]
+    assert [item for page in pages for item in page] == expected
+    assert spill_file.closed
+    assert items.spill_file is None
+
+
+def test_write_database_pages_removes_merged_pages_with_siblings(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    manifest_file = tmp_path / 'database' / 'compression_manifest.json'
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter(compress=True, manifest_path=str(manifest_file)))
+    titles = [f'Title {index:03}' for index in range(30)]
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', page_items(*titles))
+    monkeypatch.setitem(updater.databases['movie'], 'theme_timestamps', [])
+    updater._write_database_pages(db='movie')
+    updater.output_writer.save_manifest()
+    (movie_dir / 'all_page_3.json.br').write_bytes(b'from a run with brotli')
+    assert (movie_dir / 'all_page_3.json.gz').is_file()
+    assert 'movies/all_page_3.json' in json.loads(manifest_file.read_text(encoding='utf-8'))
+
+    # the last page becomes too small and is merged into the previous page
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter(compress=True, manifest_path=str(manifest_file)))
+    updater.output_writer.load_manifest()
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', page_items(*titles[:22]))
+    updater._write_database_pages(db='movie')
+    updater.output_writer.save_manifest()
+
+    assert list(movie_dir.glob('all_page_3.json*')) == []
+    assert updater.output_writer.removed == 1
+    manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+    assert 'movies/all_page_3.json' not in manifest
+    assert 'movies/all_page_2.json' in manifest
+
+
+def test_output_writer_remove_without_manifest(tmp_path):
+    writer = updater.OutputWriter()
+    output_file = tmp_path / 'output.json'
+    output_file.write_text('{}', encoding='utf-8')
+    (tmp_path / 'output.json.gz').write_bytes(b'')
+
+    assert writer.remove(path=str(output_file)) is True
+    assert writer.remove(path=str(output_file)) is False
+    assert list(tmp_path.iterdir()) == []
+    assert writer.removed == 1
+
+
+def test_write_database_pages_writes_compressed_index(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter(compress=True))
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', [])
+    updater._append_all_item(item_type='movie', data={
+        'id': 710,
+        'imdb_id': 'tt0113189',
+        'release_date': '1995-11-16',
+        'title': 'GoldenEye',
+        'youtube_theme_url': 'https://www.youtube.com/watch?v=abcdefghijk',
+    })
+    updater._append_all_item(item_type='movie', data={'id': 42, 'title': 'A Movie', 'youtube_theme_url': None})
+
+    updater._write_database_pages(db='movie')
+
+    index = json.loads((movie_dir / 'all_index.json').read_text(encoding='utf-8'))
+    assert index == {
+        'fields': ['id', 'title', 'year', 'imdb_id', 'youtube_id'],
+        'items': [
+            [42, 'A Movie', None, None, None],
+            [710, 'GoldenEye', 1995, 'tt0113189', 'abcdefghijk'],
+        ],
+    }
+    compressed = (movie_dir / 'all_index.json.gz').read_bytes()
+    assert gzip.decompress(compressed) == (movie_dir / 'all_index.json').read_bytes()
+    assert compressed[4:8] == b'\x00\x00\x00\x00'  # no modification time
+    pages = json.loads((movie_dir / 'pages.json').read_text(encoding='utf-8'))
+    assert [pages[key]['gzip'] for key in ('index', 'search_index', 'manifest', 'themes')] == [
+        'all_index.json.gz',
+        'search_index.json.gz',
+        'manifest.json.gz',
+        'themes.json.gz',
+    ]
+
+
+@pytest.mark.parametrize('db, expected', [
+    ('movie', {
+        'fields': ['id', 'imdb_id', 'youtube_id', 'edited'],
+        'items': [[42, None, 'lmnopqrstuv', 1700000000], [710, 'tt0113189', 'abcdefghijk', 1700000100]],
+    }),
+    ('tv_show', {
+        'fields': ['id', 'youtube_id', 'edited'],
+        'items': [[42, 'lmnopqrstuv', 1700000000], [710, 'abcdefghijk', 1700000100]],
+    }),
+])
+def test_write_themes_file(db, expected, tmp_path, monkeypatch):
+    item_dir = tmp_path / 'database' / 'items' / 'themoviedb'
+    monkeypatch.setattr(updater, 'databases', {db: {'all_items': [], 'path': str(item_dir)}})
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter(compress=True))
+    for data in [
+        {'id': 710, 'imdb_id': 'tt0113189', 'youtube_theme_added': 1700000000, 'youtube_theme_edited': 1700000100,
+         'youtube_theme_url': 'https://www.youtube.com/watch?v=abcdefghijk'},
+        {'id': 7, 'youtube_theme_url': None},
+        {'id': 42, 'youtube_theme_added': 1700000000, 'youtube_theme_url': 'https://youtu.be/lmnopqrstuv'},
+    ]:
+        updater._append_all_item(item_type=db, data={**data, 'name': 'Item', 'title': 'Item'})
+
+    updater._write_themes_file(db=db, all_items=updater.databases[db]['all_items'])
+
+    themes_file = item_dir.parent / 'themes.json'
+    assert json.loads(themes_file.read_text(encoding='utf-8')) == expected
+    assert gzip.decompress((item_dir.parent / 'themes.json.gz').read_bytes()) == themes_file.read_bytes()
+
+
+def load_search_normalization_cases():
+    """Load the normalization cases shared with the site tests."""
+    fixture = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'search_normalization.json')
+    with open(file=fixture, mode='r', encoding='utf-8') as fixture_f:
+        return [(case['text'], case['normalized']) for case in json.load(fp=fixture_f)]
+
+
+@pytest.mark.parametrize('text, expected', load_search_normalization_cases())
+def test_normalize_search_text(text, expected):
+    assert updater.normalize_search_text(text=text) == expected
+
+
+def test_get_search_trigrams():
+    assert updater.get_search_trigrams(text='up') == {' up', 'up '}
+    assert updater.get_search_trigrams(text='') == set()
+    assert updater.get_search_trigrams(text='a b') == {' a ', 'a b', ' b '}
+
+
+def test_write_database_pages_writes_search_index(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter(compress=True))
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', [
+        {'id': 2, 'title': 'Amélie'},
+        {'id': 1, 'title': 'Alien'},
+        {'id': 3, 'title': 'Aliens'},
+    ])
+
+    updater._write_database_pages(db='movie')
+
+    search_index = json.loads((movie_dir / 'search_index.json').read_text(encoding='utf-8'))
+    assert search_index['titles'] == ['alien', 'aliens', 'amelie']
+    assert search_index['trigrams'][' al'] == [0, 1]
+    assert search_index['trigrams']['ien'] == [0, 1]
+    assert search_index['trigrams']['lie'] == [0, 1, 1]  # positions 0, 1 and 2, delta encoded
+    assert search_index['trigrams']['ns '] == [1]
+    assert list(search_index['trigrams']) == sorted(search_index['trigrams'])
+    compressed = (movie_dir / 'search_index.json.gz').read_bytes()
+    assert gzip.decompress(compressed) == (movie_dir / 'search_index.json').read_bytes()
+
+
+def test_write_database_pages_writes_content_manifest(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter(compress=True))
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', [])
+    monkeypatch.setattr(updater, 'imdb_path', str(movie_dir / 'imdb'))
+    written = {'id': 710, 'imdb_id': 'tt0113189', 'title': 'GoldenEye', 'youtube_theme_edited': 1700000100}
+    updater._write_item_files(database_path=updater.databases['movie']['path'], item_type='movie', og_data=written)
+    updater._append_all_item(item_type='movie', data=written)
+    local = {'id': 42, 'title': 'A Movie', 'youtube_theme_added': 1700000000}
+    local_file = movie_dir / 'themoviedb' / '42.json'
+    local_file.write_text(json.dumps(local), encoding='utf-8')
+    updater._append_all_item(item_type='movie', data=local)
+    updater._append_all_item(item_type='movie', data={'id': 7, 'title': 'No File'})
+
+    updater._write_database_pages(db='movie')
+
+    manifest_file = movie_dir / 'manifest.json'
+    manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+    written_file = (movie_dir / 'themoviedb' / '710.json').read_bytes()
+    assert manifest == {
+        'algorithm': 'sha256',
+        'count': 2,
+        'items': {
+            '42': {
+                'hash': hashlib.sha256(local_file.read_bytes()).hexdigest(),
+                'size': local_file.stat().st_size,
+                'edited': 1700000000,
+            },
+            '710': {
+                'hash': hashlib.sha256(written_file).hexdigest(),
+                'size': len(written_file),
+                'edited': 1700000100,
+            },
+        },
+    }
+    assert gzip.decompress((movie_dir / 'manifest.json.gz').read_bytes()) == manifest_file.read_bytes()
+
+    # items loaded in this run keep the hash taken while loading them, other items are hashed from disk, so stale
+    # entries of the previous manifest are never carried forward, whatever the file modification times are
+    monkeypatch.setitem(updater.databases['movie'], 'content_hashes', {})
+    assert updater._load_local_item(item_type='movie', item_file=str(local_file)) == local
+    assert updater.databases['movie']['content_hashes'] == {
+        '42': (hashlib.sha256(local_file.read_bytes()).hexdigest(), local_file.stat().st_size),
+    }
+    manifest['items']['42']['hash'] = 'stale'
+    manifest['items']['710']['hash'] = 'stale'
+    manifest_file.write_text(json.dumps(manifest), encoding='utf-8')
+    updater._append_all_item(item_type='movie', data={**written, 'youtube_theme_edited': 1700000200})
+
+    updater._write_database_pages(db='movie')
+
+    items = json.loads(manifest_file.read_text(encoding='utf-8'))['items']
+    assert items['42']['hash'] == hashlib.sha256(local_file.read_bytes()).hexdigest()
+    assert items['710'] == {
+        'hash': hashlib.sha256(written_file).hexdigest(),
+        'size': len(written_file),
+        'edited': 1700000200,
+    }
+
+
+def read_bundle_index(path):
+    return list(updater.BUNDLE_INDEX_RECORD.iter_unpack(path.read_bytes()))
+
+
+def test_write_database_pages_writes_bundle(tmp_path, bundle_directory, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    tmdb_dir = movie_dir / 'themoviedb'
+    bundle_dir = bundle_directory / 'movies'
+    items = [
+        {'id': 710, 'imdb_id': 'tt0113189', 'title': 'GoldenEye'},
+        {'id': 42, 'imdb_id': 'tt9000000', 'title': 'Amélie'},
+        {'id': 8, 'imdb_id': None, 'title': 'No IMDb'},
+    ]
+    for item in items:
+        (tmdb_dir / f'{item["id"]}.json').write_text(json.dumps(item, indent=4), encoding='utf-8')
+    (tmdb_dir / '9.json').write_text('{', encoding='utf-8')
+    (movie_dir / 'bundle.ndjson').write_text('', encoding='utf-8')  # bundle from when it was in the database
+    monkeypatch.setitem(updater.databases['movie'], 'all_items', items + [{'id': 9, 'title': 'Invalid'}])
+
+    updater._write_database_pages(db='movie')
+
+    assert not (movie_dir / 'bundle.ndjson').exists()
+    bundle = (bundle_dir / 'bundle.ndjson').read_bytes()
+    assert bundle.decode('utf-8').splitlines() == [
+        '{"id":8,"imdb_id":null,"title":"No IMDb"}',
+        '{"id":42,"imdb_id":"tt9000000","title":"Am\\u00e9lie"}',
+        '{"id":710,"imdb_id":"tt0113189","title":"GoldenEye"}',
+    ]
+    records = read_bundle_index(bundle_dir / 'bundle_index.bin')
+    assert [key for key, _, _ in records] == [8, 42, 710]
+    for key, offset, length in records:
+        assert json.loads(bundle[offset:offset + length])['id'] == key
+    imdb_records = read_bundle_index(bundle_dir / 'bundle_imdb_index.bin')
+    assert [key for key, _, _ in imdb_records] == [113189, 9000000]
+    assert json.loads(bundle[imdb_records[0][1]:imdb_records[0][1] + imdb_records[0][2]])['id'] == 710
+    manifest_hash = (bundle_dir / 'bundle_manifest.sha256').read_text(encoding='utf-8')
+    assert manifest_hash == hashlib.sha256((movie_dir / 'manifest.json').read_bytes()).hexdigest()
+
+    # lines of items with an unchanged hash are copied from the previous bundle, instead of read again
+    (bundle_dir / 'bundle.ndjson').write_bytes(bundle.replace(b'No IMDb', b'Copied!'))
+    (tmdb_dir / '710.json').write_text(json.dumps({**items[0], 'title': 'Edited'}), encoding='utf-8')
+    monkeypatch.setitem(updater.databases['movie'], 'content_hashes', {'710': ('new', 1)})
+
+    updater._write_database_pages(db='movie')
+
+    lines = (bundle_dir / 'bundle.ndjson').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['title'] for line in lines] == ['Copied!', 'Amélie', 'Edited']
+
+    # a bundle that was not written with the previous manifest, like one restored from an older cache, is not used
+    (bundle_dir / 'bundle_manifest.sha256').write_text(manifest_hash, encoding='utf-8')
+
+    updater._write_database_pages(db='movie')
+
+    lines = (bundle_dir / 'bundle.ndjson').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['title'] for line in lines] == ['No IMDb', 'Amélie', 'Edited']
+
+    # an edit of the same size and edit time is hashed again and picked up
+    edited_file = tmdb_dir / '42.json'
+    edited_file.write_text(json.dumps({**items[1], 'title': 'Bmélie'}, indent=4), encoding='utf-8')
+
+    updater._write_database_pages(db='movie')
+
+    lines = (bundle_dir / 'bundle.ndjson').read_text(encoding='utf-8').splitlines()
+    assert json.loads(lines[1])['title'] == 'Bmélie'
+    manifest_items = json.loads((movie_dir / 'manifest.json').read_text(encoding='utf-8'))['items']
+    assert manifest_items['42']['hash'] == hashlib.sha256(edited_file.read_bytes()).hexdigest()
+
+
+@pytest.mark.parametrize('content', ['{', '[]', '{"items": []}'])
+def test_load_manifest_items_ignores_invalid_manifests(tmp_path, content):
+    manifest_file = tmp_path / 'manifest.json'
+    manifest_file.write_text(content, encoding='utf-8')
+
+    assert updater._load_manifest_items(manifest_file=str(manifest_file)) == ({}, '')
+
+
+@pytest.mark.parametrize('item_type, data, expected', [
+    ('game', {'release_dates': [{'y': 1997}, {}, {'y': 1995}]}, 1995),
+    ('game', {}, None),
+    ('movie', {'release_date': '1995-11-16'}, 1995),
+    ('movie', {'release_date': ''}, None),
+    ('tv_show', {'first_air_date': '1962-09-26'}, 1962),
+    ('movie_collection', {'release_date': '1995-11-16'}, None),
+])
+def test_get_item_year(item_type, data, expected):
+    assert updater._get_item_year(item_type=item_type, data=data) == expected
+
+
+def test_write_database_size_plot_skips_plot_without_timestamps(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    monkeypatch.setitem(updater.databases['movie'], 'theme_timestamps', [])
+
+    updater._write_database_pages(db='movie')
+    updater._write_database_size_plot(db='movie')
+
+    assert (movie_dir / 'pages.json').is_file()
+    assert not (movie_dir / 'movies_plot.svg').exists()
+
+
+def test_database_outputs_skip_unchanged_files(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+    updater._write_database_pages(db='movie')
+    updater._write_database_size_plot(db='movie')
+    plot = (movie_dir / 'movies_plot.svg').read_bytes()
+
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+    updater._write_database_pages(db='movie')
+    updater._write_database_size_plot(db='movie')
+
+    assert (updater.output_writer.written, updater.output_writer.skipped) == (0, 11)
+    assert (movie_dir / 'movies_plot.svg').read_bytes() == plot
+
+
+def test_write_database_size_plot_matplotlib_renderer(tmp_path, monkeypatch):
+    movie_dir = setup_movie_outputs(tmp_path=tmp_path, monkeypatch=monkeypatch)
+    monkeypatch.setattr(updater, 'args', updater.parse_args(['--plot_renderer', 'matplotlib']))
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+    updater._write_database_pages(db='movie')
+    updater._write_database_size_plot(db='movie')
+    plot = (movie_dir / 'movies_plot.svg').read_bytes()
+
+    monkeypatch.setattr(updater, 'output_writer', updater.OutputWriter())
+    updater._write_database_pages(db='movie')
+    updater._write_database_size_plot(db='movie')
+
+    assert b'matplotlib' in plot
+    assert b'<dc:date>' not in plot
+    assert (updater.output_writer.written, updater.output_writer.skipped) == (0, 11)
 
 
 def test_main_daily_update_builds_top_contributor_images(tmp_path, monkeypatch):
@@ -374,15 +904,22 @@ def test_main_daily_update_builds_top_contributor_images(tmp_path, monkeypatch):
     class ImmediateQueue:
         def put(self, item):
             queued.append(item)
-            updater.databases[item[0]]['all_items'].append({
-                'id': item[1],
+            updater._append_all_item(item_type=item[0], data={
+                'id': int(item[1]),  # item files have integer ids
                 'imdb_id': 'tt0113189',
                 'title': 'GoldenEye',
+                'youtube_theme_added': 1700000000,
             })
 
+        def close(self, item_type):
+            return None
+
         def join(self):
             return None
 
+        def pop_failed_ids(self):
+            return {}
+
     args = type('Args', (), {
         'issue_update': False,
         'leaderboard_update': False,
@@ -411,20 +948,38 @@ def test_main_daily_update_builds_top_contributor_images(tmp_path, monkeypatch):
         },
     })
     monkeypatch.setattr(updater, 'imdb_path', str(imdb_dir))
+    monkeypatch.setattr(updater, 'daily_update_state_file', str(database_root / 'daily_update.json'))
+    monkeypatch.setattr(updater, 'response_cache_file', str(tmp_path / '.cache' / 'response_cache.json'))
+    monkeypatch.setattr(updater, 'legacy_response_cache_file', str(database_root / 'response_cache.json'))
     monkeypatch.setattr(updater, 'queue', ImmediateQueue())
+    monkeypatch.setattr(updater, '_ensure_queue_workers', lambda: None)
+    monkeypatch.setattr(updater, '_print_queue_metrics', lambda: None)
     monkeypatch.setattr(updater, 'build_top_contributor_images', lambda: built.append(True))
 
     updater.main()
 
     assert queued == [('movie', '710')]
     assert json.loads((movie_dir / 'all_page_1.json').read_text(encoding='utf-8')) == [{
-        'id': '710',
+        'id': 710,
         'imdb_id': 'tt0113189',
         'title': 'GoldenEye',
     }]
     assert json.loads((movie_dir / 'pages.json').read_text(encoding='utf-8')) == {
         'count': 1,
         'pages': 1,
+        'next_page': 2,
+        'buckets': [{'page': 1, 'count': 1, 'start': ['GoldenEye', '710']}],
+        'index': {'file': 'all_index.json', 'fields': list(updater.INDEX_FIELDS)},
+        'search_index': {'file': 'search_index.json'},
+        'manifest': {'file': 'manifest.json'},
+        'themes': {'file': 'themes.json', 'fields': ['id', 'imdb_id', 'youtube_id', 'edited']},
+        'changes': {'directory': 'changes', 'daily': 'YYYY-MM-DD.jsonl', 'monthly': 'YYYY-MM.jsonl'},
+        'bundle': {
+            'file': 'bundle.ndjson',
+            'index': 'bundle_index.bin',
+            'imdb_index': 'bundle_imdb_index.bin',
+            'record_format': '<QQI',
+        },
         'imdb_count': 1,
     }
     assert (movie_dir / 'movies_plot.svg').is_file()
@@ -0,0 +1,139 @@
+"""
+test_transport.py
+
+This module contains unit tests for the shared HTTP transport in src.updater.
+"""
+# standard imports
+from importlib.metadata import version
+import inspect
+import os
+import re
+import threading
+
+# lib imports
+import igdb.wrapper
+import pytest
+import requests
+
+# local imports
+from src import updater
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Use a fresh shared transport."""
+    transport = updater.HTTPTransport(pool_size=2)
+    monkeypatch.setattr(updater, 'transport', transport)
+    return transport
+
+
+def test_session_is_shared_per_provider_and_settings(transport):
+    tmdb = transport.session(name='tmdb', params={'api_key': 'key'})
+
+    assert transport.session(name='tmdb', params={'api_key': 'key'}) is tmdb
+    assert transport.session(name='tmdb', params={'api_key': 'other'}) is not tmdb
+    assert tmdb.params == {'api_key': 'key'}
+    assert tmdb.get_adapter('https://api.themoviedb.org/3/movie/1') is transport.adapters['api.themoviedb.org']
+    assert tmdb.get_adapter('https://example.com/') is transport.default_adapter
+
+    # every provider shares the connection pool of a host
+    github = transport.session(name='github', headers={'Accept': 'application/json'})
+    assert github.get_adapter('https://api.github.com/user/1') is tmdb.get_adapter('https://api.github.com/user/1')
+
+
+def test_adapters_apply_host_policies(transport, monkeypatch):
+    timeouts = []
+
+    def send(self, request, timeout=None, **kwargs):
+        timeouts.append(timeout)
+
+    monkeypatch.setattr(updater.HTTPAdapter, 'send', send)
+    adapter = transport.adapters['api.github.com']
+    request = requests.Request('GET', 'https://api.github.com/user/1').prepare()
+
+    adapter.send(request)
+    adapter.send(request, timeout=3)
+
+    assert timeouts == [(5, 15), 3]
+    assert adapter.max_retries.connect == 2
+    assert adapter.max_retries.read == 0
+    assert transport.default_adapter.max_retries.connect == 1
+
+
+def test_transport_reports_connection_reuse(transport, stub_server, capsys):
+    stub_server.add_route('/3/movie/1', (200, {'id': 1}, {}))
+    session = transport.session(name='tmdb', params={'api_key': 'key'})
+
+    for _ in range(3):
+        assert session.get(f'{stub_server.url}/3/movie/1').json() == {'id': 1}
+    transport.print_stats()
+
+    assert transport.stats() == {'127.0.0.1': {'connections': 1, 'requests': 3, 'reused': 2}}
+    assert '127.0.0.1: 3 requests on 1 connections (2 reused)' in capsys.readouterr().out
+    assert all(request['query'] == 'api_key=key' for request in stub_server.requests)
+
+
+def test_pooled_igdb_wrapper_uses_transport(transport, stub_server, monkeypatch):
+    stub_server.add_route('/v4/games', (200, [{'id': 1638}], {}), (429, {}, {}))
+    monkeypatch.setattr(igdb.wrapper, 'API_URL', f'{stub_server.url}/v4/')
+    wrapper = updater.PooledIGDBWrapper(client_id='client-id', auth_token='token')
+
+    assert wrapper.api_request(endpoint='games', query='fields id;') == b'[{"id": 1638}]'
+    with pytest.raises(requests.exceptions.HTTPError):
+        wrapper.api_request(endpoint='games', query='fields id;')
+
+    request = stub_server.requests[0]
+    assert (request['method'], request['body']) == ('POST', 'fields id;')
+    assert request['headers']['Client-ID'] == 'client-id'
+    assert request['headers']['Authorization'] == 'Bearer token'
+    assert transport.stats()['127.0.0.1']['reused'] == 1
+
+
+def test_sessions_do_not_store_cookies(transport, stub_server):
+    stub_server.add_route('/3/movie/1', (200, {'id': 1}, {'Set-Cookie': 'session=abc; Path=/'}))
+    session = transport.session(name='tmdb', params={'api_key': 'key'})
+
+    session.get(f'{stub_server.url}/3/movie/1')
+    session.get(f'{stub_server.url}/3/movie/1')
+
+    assert len(session.cookies) == 0
+    assert 'Cookie' not in stub_server.requests[1]['headers']
+
+
+def test_pooled_igdb_wrapper_private_api_is_pinned():
+    """PooledIGDBWrapper relies on private IGDBWrapper methods, so a new igdb-api-v4 version must be reviewed."""
+    pyproject = os.path.join(os.path.dirname(__file__), '..', '..', 'pyproject.toml')
+    with open(pyproject, encoding='utf-8') as pyproject_f:
+        pinned = re.search(r'"igdb-api-v4==([^"]+)"', pyproject_f.read()).group(1)
+
+    assert version('igdb-api-v4') == pinned
+    assert str(inspect.signature(igdb.wrapper.IGDBWrapper._build_url)) == "(endpoint: str = '') -> str"
+    assert str(inspect.signature(igdb.wrapper.IGDBWrapper._compose_request)) == '(self, query: str) -> dict'
+    assert isinstance(inspect.getattr_static(igdb.wrapper.IGDBWrapper, '_build_url'), staticmethod)
+
+    request = igdb.wrapper.IGDBWrapper(client_id='client-id', auth_token='token')._compose_request('fields id;')
+    assert request == {
+        'headers': {'Client-ID': 'client-id', 'Authorization': 'Bearer token'},
+        'data': 'fields id;',
+    }
+
+
+def test_youtube_service_is_built_once_per_thread(monkeypatch):
+    built = []
+
+    def build(service_name, version, developerKey):
+        built.append(developerKey)
+        return object()
+
+    monkeypatch.setattr(updater, 'build', build)
+    monkeypatch.setattr(updater, 'youtube_services', threading.local())
+
+    service = updater._get_youtube_service(api_key='key')
+    assert updater._get_youtube_service(api_key='key') is service
+
+    thread = threading.Thread(target=updater._get_youtube_service, kwargs={'api_key': 'key'})
+    thread.start()
+    thread.join()
+    updater._get_youtube_service(api_key='other-key')
+
+    assert built == ['key', 'key', 'other-key']